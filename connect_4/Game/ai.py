@@ -1,55 +1,188 @@
 """ This module provides a function to get the AI's suggested move in the Connect 4 game. It Sends the current 'gameplay' matrix 
 to both OpenAI's GPT model and DeepSeek's API and - depending on successful connection to anyone of these, returns the AI's suggested move. 
+The requests go through providers.py: one pooled connection per provider, a deadline per move, streamed answers and a
+hedged request to the second provider when the first is slower than usual.
 Both the 'OPENAI_API_KEY' and 'DEEPSEEK_API_KEY' environment variable are set locally on my computer. Any porting of this code to another environment
 will require setting up an OpenAI API key or DeepSeek API key in the environment variables for the code to function correctly.
 The gameplay_matrix is a numpy array representing the Connect 4 board.
                          0 = empty, 1 = Red (player), 2 = Yellow (AI).
-Added lru caching to optimize repeated calls with the same board state. lru decorator caches up to 128 unique board states.
+Answers are cached on disk by move_cache.py (replacing the earlier 128-entry lru_cache), keyed by a compact board encoding
+that folds left-right mirror positions together. Only validated answers are cached, never the random fallback moves.
+Before the backend is asked, the precomputed opening book (opening_book.py) is consulted; it covers the early plies.
+The 'random' baseline never uses the book, so it stays a purely random opponent.
+The backend is pluggable: 'llm' sends the board to the remote API, 'negamax' uses the local engine in solver.py which needs
+no network, 'parallel' runs the same engine split across a process pool (parallel_search.py) and 'mcts' is a Monte Carlo
+tree search with batched NumPy playouts (mcts.py). Set the CONNECT4_AI_BACKEND environment variable (or call set_backend) to choose; without an API key the local
+engine is used.
 """
 import os
-from openai import OpenAI
-from functools import lru_cache
 import numpy as np
+from . import solver
+from . import parallel_search
+from . import mcts
+from .bitboard import BitBoard
+from .move_cache import get_move_cache
+from .opening_book import get_opening_book
+from .providers import create_remote_ai
+from .instrumentation import timed
 # --- Module-level client initialization ---
-# Initialize the client once when the module is imported for efficiency.git
-# This also helps in failing early if the API key is not set.
+# Initialize the remote client once when the module is imported for efficiency: it keeps one pooled connection per provider.
+# This also helps in failing early if no API key is set.
 try:
-    # Check for DeepSeek specific key first, then fall back to the general OpenAI key name.
-    API_KEY = os.environ.get('DEEPSEEK_API_KEY') or os.environ.get('OPENAI_API_KEY')
-    if not API_KEY:
-        print("Warning: DEEPSEEK_API_KEY or OPENAI_API_KEY environment variable not found. AI will not function.")
-        client = None
-    else:
-        client = OpenAI(api_key=API_KEY, base_url="https://api.deepseek.com")
+    client = create_remote_ai()
 except Exception as e:
-    print(f"Error initializing OpenAI client: {e}")
+    print(f"Error initializing the remote AI client: {e}")
     client = None
 
+def cached_move(backend: str, compute, gameplay_matrix: np.ndarray, valid_moves: list):
+    """
+    Looks the board up in the persistent move cache and only calls compute(gameplay_matrix, valid_moves) on a miss.
+    compute returns a column, or None when it could not produce a validated answer; only legal columns are stored.
+    """
+    cache = get_move_cache()
+    if cache is None:
+        return compute(gameplay_matrix, valid_moves)
+    board = BitBoard.from_matrix(gameplay_matrix)
+    col = cache.get(backend, board, valid_moves)
+    if col is None:
+        col = compute(gameplay_matrix, valid_moves)
+        if col is not None and col in valid_moves:
+            cache.put(backend, board, int(col))
+    return col
+
+def get_llm_move(gameplay_matrix: np.ndarray, valid_moves: list) -> int:
+    """
+    Gets the AI's move from the remote LLM, going through the persistent move cache first.
+    Args:
+        gameplay_matrix: The current board state.
+        valid_moves: A list of column indices that are not full.
+    """
+    if client is None:
+        return -1 # Return error if client wasn't initialized
+    col = cached_move("llm", _ask_llm, gameplay_matrix, valid_moves)
+    if col is None and _cancel_event is not None and _cancel_event.is_set():
+        return -1 # Cancelled: nobody is waiting for this move
+    if col is None:
+        # --- Safeguard ---
+        # If the AI's response was invalid or the API call failed, pick a random valid move (which is never cached).
+        print("AI response was invalid. Picking a random valid move as a fallback.")
+        return get_random_move(gameplay_matrix, valid_moves)
+    return col
+
+def get_negamax_move(gameplay_matrix: np.ndarray, valid_moves: list) -> int:
+    """Gets the move from the local negamax engine, going through the persistent move cache first."""
+    col = cached_move("negamax", solver.get_ai_move, gameplay_matrix, valid_moves)
+    return -1 if col is None else col
+
+def get_parallel_move(gameplay_matrix: np.ndarray, valid_moves: list) -> int:
+    """Gets the move from the multi-core engine. It shares the cache entries of the negamax engine it parallelises."""
+    col = cached_move(cache_namespace("parallel"), parallel_search.get_ai_move, gameplay_matrix, valid_moves)
+    return -1 if col is None else col
+
+def get_mcts_move(gameplay_matrix: np.ndarray, valid_moves: list) -> int:
+    """Gets the move from the Monte Carlo tree search engine, going through the persistent move cache first."""
+    col = cached_move("mcts", mcts.get_ai_move, gameplay_matrix, valid_moves)
+    return -1 if col is None else col
+
+def get_random_move(gameplay_matrix: np.ndarray, valid_moves: list) -> int:
+    """Baseline backend: picks a random valid column. Useful as an opponent when evaluating the other backends."""
+    if not valid_moves:
+        return -1
+    return int(np.random.choice(list(valid_moves)))
+
+# --- Backend selection ---
+# Every backend takes (gameplay_matrix, valid_moves) and returns a column index, or -1 if it cannot move.
+BACKENDS = {
+    "llm": get_llm_move,
+    "negamax": get_negamax_move,
+    "parallel": get_parallel_move,
+    "mcts": get_mcts_move,
+    "random": get_random_move,
+}
+DEFAULT_BACKEND = "llm" if client is not None else "negamax"
+AI_BACKEND = DEFAULT_BACKEND
+
+def set_backend(name: str):
+    """Selects the backend used by get_ai_move."""
+    global AI_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown AI backend '{name}'. Available backends: {', '.join(BACKENDS)}")
+    AI_BACKEND = name
+
+# Checked at import, so a mistyped CONNECT4_AI_BACKEND is reported at startup rather than on the AI's first turn
+try:
+    set_backend(os.environ.get('CONNECT4_AI_BACKEND') or DEFAULT_BACKEND)
+except ValueError as e:
+    print(f"Warning: {e}. Using the '{DEFAULT_BACKEND}' backend.")
+
+# Backends that store their answers under another backend's cache entries because they compute the same thing
+CACHE_NAMESPACES = {"parallel": "negamax"}
+
+def cache_namespace(backend: str) -> str:
+    return CACHE_NAMESPACES.get(backend, backend)
+
+# Backends that play their own moves from the first ply: a book move would change what they measure
+NO_BOOK_BACKENDS = {"random"}
+
+def uses_book(backend: str) -> bool:
+    return backend not in NO_BOOK_BACKENDS
+
+@timed("ai.get_ai_move")
 def get_ai_move(gameplay_matrix: np.ndarray, valid_moves: list) -> int:
     """
-    Public-facing function to get the AI's move.
-    It converts the NumPy array to a hashable tuple before calling the cached function.
+    Public-facing function to get the AI's move from the selected backend.
     Args:
         gameplay_matrix: The current board state.
         valid_moves: A list of column indices that are not full.
     """
-    # Convert the numpy array to a tuple of tuples to make it hashable for the cache.
-    board_tuple = tuple(map(tuple, gameplay_matrix))
-    # Also convert the list of valid moves to a tuple to make it hashable.
-    valid_moves_tuple = tuple(valid_moves)
-    return _get_ai_move_cached(board_tuple, valid_moves_tuple)
-
-@lru_cache(maxsize=128)
-def _get_ai_move_cached(board_tuple: tuple, valid_moves: tuple) -> int:
+    book = get_opening_book() if uses_book(AI_BACKEND) else None
+    if book is not None:
+        col = book.lookup(BitBoard.from_matrix(gameplay_matrix), valid_moves)
+        if col is not None:
+            return col
+    return BACKENDS[AI_BACKEND](gameplay_matrix, valid_moves)
+
+# Set by the caller when the move being computed is cancelled; the LLM requests of that move stop when it is set
+_cancel_event = None
+
+def cancel_pending():
     """
-    Internal cached function that gets a move from the AI.
-    Accepts a hashable tuple representation of the board.
+    Asks a backend that is computing a move on another thread to stop early. The cancelled search returns None, so its
+    cut-short answer is never cached. The stop stays in force until clear_cancel().
+    The LLM backend is stopped through the cancel_event given to clear_cancel instead.
+    """
+    if AI_BACKEND == "negamax":
+        solver.get_solver().stop()
+    elif AI_BACKEND == "parallel":
+        parallel_search.get_parallel_solver().stop()
+    elif AI_BACKEND == "mcts":
+        mcts.get_engine().stop()
+
+def clear_cancel(cancel_event=None):
+    """
+    Lifts a cancel_pending() before a new move is computed. cancel_event (an object with is_set(), set when that move
+    is cancelled) is checked by its LLM requests, which then return at once.
+    """
+    global _cancel_event
+    _cancel_event = cancel_event
+    if AI_BACKEND == "negamax":
+        solver.get_solver().clear_stop()
+    elif AI_BACKEND == "parallel":
+        parallel_search.get_parallel_solver().clear_stop()
+    elif AI_BACKEND == "mcts":
+        mcts.get_engine().clear_stop()
+
+def _ask_llm(gameplay_matrix: np.ndarray, valid_moves: list, stop_event=None):
+    """
+    Internal function that asks the LLM for a move.
+    Returns the chosen column if the answer is a valid move, otherwise None (also when stop_event is set meanwhile).
+    stop_event defaults to the cancel_event of the move being computed (see clear_cancel).
     """
     if client is None:
-        return -1 # Return error if client wasn't initialized
+        return None
     try:
-        # Convert the board tuple to a simple string format for the prompt.
-        board_string = "\n".join([" ".join(map(str, row)) for row in board_tuple])
+        # Convert the board to a simple string format for the prompt.
+        board_string = "\n".join([" ".join(map(str, row)) for row in gameplay_matrix])
 
         prompt = f"""
         You are an expert Connect 4 player. It is your turn to play as Yellow (2).
@@ -62,33 +195,20 @@ def _get_ai_move_cached(board_tuple: tuple, valid_moves: tuple) -> int:
         The available columns are: {valid_moves}.
         Which column do you choose? Your answer must be only a single number from the list of available columns.
         """
-        response = client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[
-                {"role": "system", "content": "You are a Connect 4 expert that only responds with a single number."},
-                {"role": "user", "content": prompt},
-            ],
-            stream=False
-        )
-        response_content = response.choices[0].message.content
-        
-        # --- Robustness Check ---
-        # 1. Try to convert the AI's response to an integer.
-        # 2. Check if the chosen column is in the list of valid moves.
-        try:
-            chosen_col = int(response_content.strip())
-            if chosen_col in valid_moves:
-                return chosen_col
-        except ValueError:
-            # The AI returned non-numeric text.
-            print(f"AI returned an invalid (non-numeric) response: '{response_content}'")
-
-        # --- Safeguard ---
-        # If the AI's response was invalid or not in the valid_moves list, pick a random valid move.
-        print("AI response was invalid. Picking a random valid move as a fallback.")
-        return np.random.choice(list(valid_moves))
+        # The provider layer streams the answer and only returns a column that is in valid_moves.
+        if stop_event is None:
+            stop_event = _cancel_event
+        return client.get_move(prompt, list(valid_moves), stop_event=stop_event)
 
     except Exception as e:
         print(f"An error occurred while getting the AI move: {e}")
-        # If the API call fails entirely, fall back to a random valid move.
-        return np.random.choice(list(valid_moves))
+        # If the API call fails entirely, the caller falls back to a random valid move.
+        return None
+
+# Uncached move computations of the backends that go through the move cache. Each returns a validated column or None.
+# speculation.py uses them to compute replies ahead of time and stores the answers in the cache itself.
+CACHEABLE_BACKENDS = {
+    "llm": _ask_llm,
+    "negamax": solver.get_ai_move,
+    "mcts": mcts.get_ai_move,
+}
@@ -0,0 +1,81 @@
+"""
+This module runs the AI move computation on a background thread, so the pygame frame loop keeps pumping events
+and redrawing while a move is being computed (a remote AI call can take seconds).
+The main loop submits a request, polls for the result each frame and cancels the request when the game is reset,
+so a stale move computed for an old board is never applied to a new one.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from .ai import get_ai_move, cancel_pending, clear_cancel
+from .instrumentation import metrics
+
+
+class AIWorker:
+
+    def __init__(self, move_provider=get_ai_move, on_ready=None):
+        self.move_provider = move_provider
+        self.on_ready = on_ready # Optional callback run on the worker thread when a move is ready
+        # A single worker thread: there is never more than one AI move in flight
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-move")
+        self._future = None
+        self._cancelled = None # threading.Event of the pending request, set when it is cancelled
+        self._requested = 0.0 # perf_counter time of the pending request
+
+    @property
+    def pending(self):
+        """True while a requested move has not been collected or cancelled."""
+        return self._future is not None
+
+    def request(self, gameplay_matrix, valid_moves):
+        """Starts computing a move for a snapshot of the given board. Any earlier pending request is cancelled."""
+        self.cancel()
+        self._requested = time.perf_counter()
+        self._cancelled = threading.Event()
+        # Copy the inputs: the worker must not see the board change under it
+        self._future = self._executor.submit(self._compute, self._cancelled, gameplay_matrix.copy(), list(valid_moves))
+        if self.on_ready is not None:
+            self._future.add_done_callback(self._notify)
+
+    def _compute(self, cancelled, gameplay_matrix, valid_moves):
+        # Runs on the worker thread once the previous (possibly cancelled) request has finished. The backend's stop flag
+        # is lifted here rather than in the search, and checked again afterwards, so a cancel() that races with the
+        # start of this request is never lost. The request's Event also stops its LLM calls when it is cancelled.
+        clear_cancel(cancelled)
+        if cancelled.is_set():
+            return None
+        return self.move_provider(gameplay_matrix, valid_moves)
+
+    def _notify(self, future):
+        if not future.cancelled():
+            self.on_ready()
+
+    def poll(self):
+        """
+        Returns the computed column once it is ready, otherwise None. Never blocks.
+        Returns -1 if the backend failed.
+        """
+        if self._future is None or not self._future.done():
+            return None
+        future, self._future = self._future, None
+        metrics.record("ai.reply", time.perf_counter() - self._requested) # Latency as seen by the player
+        try:
+            return future.result()
+        except CancelledError:
+            return None
+        except Exception as e:
+            print(f"An error occurred while computing the AI move: {e}")
+            return -1
+
+    def cancel(self):
+        """Drops the pending request. A computation already running is asked to stop and its result is ignored."""
+        if self._future is None:
+            return
+        self._cancelled.set()
+        if not self._future.cancel():
+            cancel_pending() # Already running: ask the backend to stop early
+        self._future = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -28,3 +28,23 @@ def create_tracking_matrices() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     yellow_scorecard = np.zeros((ROWS, COLS), dtype=np.int8)
     
     return gameplay, red_scorecard, yellow_scorecard
+
+
+# Bit index of every (row, col) cell in the bitboard layout used by bitboard.py (row 0 = top row).
+_BIT_INDEX = np.array([[c * (ROWS + 1) + (ROWS - 1 - r) for c in range(COLS)] for r in range(ROWS)], dtype=np.uint64)
+
+
+def scorecard_from_bitboard(bits: int) -> np.ndarray:
+    """
+    Builds a scorecard matrix (1 wherever the player has a piece) from a player bitboard.
+    The matrix is computed on demand, so it is a read-only view of the state rather than a second copy to keep in sync.
+    """
+    return ((np.uint64(bits) >> _BIT_INDEX) & np.uint64(1)).astype(np.int8)
+
+
+def tracking_matrices_from_bitboards(red_bits: int, yellow_bits: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the (gameplay, red_scorecard, yellow_scorecard) matrices for the given pair of bitboards."""
+    red_scorecard = scorecard_from_bitboard(red_bits)
+    yellow_scorecard = scorecard_from_bitboard(yellow_bits)
+    gameplay = red_scorecard + 2 * yellow_scorecard
+    return gameplay, red_scorecard, yellow_scorecard
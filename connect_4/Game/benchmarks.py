@@ -0,0 +1,609 @@
+"""
+This module provides a reproducible benchmark suite for the hot paths of the game, so every optimisation claim can be
+backed by numbers. It is driven by benchmark.py.
+
+    - Board corpora are generated from fixed seeds: empty, mid-game, near-full, and boards won in each direction
+      (horizontal, vertical, diagonal, anti-diagonal). The same seed always gives the same boards.
+    - Each benchmark is a setup function registered in BENCHMARKS. It builds its inputs once and returns (run, ops):
+      run() is the timed call and ops the number of operations it performs, so results are reported per operation.
+    - Timing is timeit-style: the loop count is calibrated so one repeat takes at least MIN_REPEAT_TIME (FAST_REPEAT_TIME
+      for sub-microsecond operations, whose repeats are otherwise short enough for one scheduler hiccup to swing them),
+      and the median and minimum over several repeats are kept. The repeats run in rounds over all the benchmarks. Results are saved as JSON and compared against a
+      baseline on the minimum, which is the least noisy estimate (interference from other processes only ever adds
+      time). A slowdown only counts as a regression if it is also larger than NOISE_FLOOR_US per operation.
+"""
+import atexit
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from .constants import ROWS, COLS, PLAYER_RED, PLAYER_YELLOW
+from .bitboard import BitBoard, DIRECTIONS
+
+DEFAULT_SEED = 20251120
+CORPUS_SIZE = 200
+MIN_REPEAT_TIME = 0.05 # seconds
+FAST_OP_US = 1.0 # Benchmarks faster than this per operation get longer repeats...
+FAST_REPEAT_TIME = 0.25 # ...of at least this many seconds
+DEFAULT_REPEATS = 7
+DEFAULT_THRESHOLD = 0.25 # A benchmark more than 25% slower than its baseline is a regression...
+NOISE_FLOOR_US = 0.2 # ...unless it is slower by less than this per operation, which is within timing noise
+
+# Win direction names, in the order of bitboard.DIRECTIONS (vertical, horizontal, diagonal /, anti-diagonal \)
+WIN_DIRECTION_NAMES = ("vertical", "horizontal", "diagonal", "anti_diagonal")
+
+
+# --- Seeded board corpora ---
+
+class Position:
+    """One corpus entry: the move sequence, the resulting bitboard and the last move played."""
+
+    __slots__ = ("moves", "board", "last_row", "last_col")
+
+    def __init__(self, moves):
+        self.moves = tuple(moves)
+        self.board = BitBoard.from_moves(self.moves)
+        self.last_row = self.last_col = None
+        if self.moves:
+            self.last_col = self.moves[-1]
+            self.last_row = ROWS - self.board.heights[self.last_col]
+
+    @property
+    def gameplay(self):
+        from .b_algorithm import tracking_matrices_from_bitboards
+        return tracking_matrices_from_bitboards(self.board.pieces[PLAYER_RED], self.board.pieces[PLAYER_YELLOW])[0]
+
+    def last_player(self):
+        return PLAYER_RED if len(self.moves) % 2 else PLAYER_YELLOW
+
+
+def _win_direction(bits: int):
+    """Index into WIN_DIRECTION_NAMES of the first direction in which bits has four in a row, or None."""
+    for index, shift in enumerate(DIRECTIONS):
+        pairs = bits & (bits >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return index
+    return None
+
+
+def _random_game(rng: random.Random, max_plies: int):
+    """Plays random moves until max_plies or the game ends. Returns (moves, winning direction index or None)."""
+    board = BitBoard()
+    moves = []
+    while len(moves) < max_plies:
+        valid = board.valid_moves()
+        if not valid:
+            break
+        col = rng.choice(valid)
+        player = board.player_to_move()
+        board.play(col, player)
+        moves.append(col)
+        direction = _win_direction(board.pieces[player])
+        if direction is not None:
+            return moves, direction
+    return moves, None
+
+
+def build_corpora(seed: int = DEFAULT_SEED, size: int = CORPUS_SIZE) -> dict:
+    """
+    Returns {corpus name: [Position, ...]} with size positions per corpus, all generated from seed.
+    Mid-game and near-full boards have no winner; won_<direction> boards end on the move that completed four in a row.
+    """
+    rng = random.Random(seed)
+    corpora = {"empty": [Position(()) for _ in range(size)], "midgame": [], "near_full": []}
+    for name in WIN_DIRECTION_NAMES:
+        corpora["won_" + name] = []
+    targets = {"midgame": (14, 22), "near_full": (34, 40)}
+    while any(len(positions) < size for positions in corpora.values()):
+        for name, (low, high) in targets.items():
+            if len(corpora[name]) < size:
+                moves, direction = _random_game(rng, rng.randint(low, high))
+                if direction is None and len(moves) >= low:
+                    corpora[name].append(Position(moves))
+        moves, direction = _random_game(rng, ROWS * COLS)
+        if direction is not None:
+            won = corpora["won_" + WIN_DIRECTION_NAMES[direction]]
+            if len(won) < size:
+                won.append(Position(moves))
+    return corpora
+
+
+# --- Benchmarks ---
+
+BENCHMARKS = {}
+
+def benchmark(name: str):
+    """Registers a setup function under name. The setup receives the corpora and returns (run, ops)."""
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+_scratch = None
+
+def _scratch_dir() -> str:
+    """Temporary directory for the files benchmarks work on, removed when the process exits."""
+    global _scratch
+    if _scratch is None:
+        _scratch = tempfile.mkdtemp(prefix="c4bench")
+        atexit.register(shutil.rmtree, _scratch, True)
+    return _scratch
+
+
+def _check_win_vectorized(corpus):
+    def setup(corpora):
+        from .test import check_win_vectorized
+        cases = []
+        for p in corpora[corpus]:
+            row, col = (p.last_row, p.last_col) if p.moves else (ROWS - 1, COLS // 2)
+            player = p.last_player() if p.moves else PLAYER_RED
+            cases.append(((p.gameplay == player).astype(np.int8), row, col))
+        def run():
+            for scorecard, row, col in cases:
+                check_win_vectorized(scorecard, row, col)
+        return run, len(cases)
+    return setup
+
+def _check_win(corpus):
+    def setup(corpora):
+        from .game_state import GameState
+        cases = []
+        for p in corpora[corpus]:
+            state = GameState.from_moves(p.moves)
+            cases.append((state, p.last_row if p.moves else ROWS - 1, p.last_col if p.moves else COLS // 2))
+        def run():
+            for state, row, col in cases:
+                state.check_win(row, col)
+        return run, len(cases)
+    return setup
+
+for _corpus in ("empty", "midgame", "near_full") + tuple("won_" + name for name in WIN_DIRECTION_NAMES):
+    benchmark(f"check_win_vectorized.{_corpus}")(_check_win_vectorized(_corpus))
+    benchmark(f"game_state.check_win.{_corpus}")(_check_win(_corpus))
+
+
+@benchmark("check_win_batch.near_full")
+def _bench_check_win_batch(corpora):
+    from .test import winners_batch
+    stack = np.stack([p.gameplay for p in corpora["near_full"]])
+    return (lambda: winners_batch(stack)), len(stack)
+
+
+@benchmark("game_state.drop_piece.replay")
+def _bench_drop_piece(corpora):
+    from .game_state import GameState, PLAYER_COLORS
+    games = [p.moves for p in corpora["near_full"]]
+    colors = [PLAYER_COLORS[PLAYER_RED], PLAYER_COLORS[PLAYER_YELLOW]]
+    def run():
+        for moves in games:
+            state = GameState()
+            for ply, col in enumerate(moves):
+                state.drop_piece(col, colors[ply & 1])
+    return run, sum(len(moves) for moves in games)
+
+
+@benchmark("game_state.make_unmake.replay")
+def _bench_make_unmake(corpora):
+    # Look-ahead pattern: play a whole game forward on one state, then take every move back
+    from .game_state import GameState, PLAYER_COLORS
+    games = [p.moves for p in corpora["near_full"]]
+    colors = [PLAYER_COLORS[PLAYER_RED], PLAYER_COLORS[PLAYER_YELLOW]]
+    state = GameState()
+    def run():
+        for moves in games:
+            for ply, col in enumerate(moves):
+                state.drop_piece(col, colors[ply & 1])
+            for _ in moves:
+                state.undo_move()
+    return run, sum(len(moves) for moves in games)
+
+
+@benchmark("game_state.copy.midgame")
+def _bench_copy(corpora):
+    from .game_state import GameState
+    states = [GameState.from_moves(p.moves) for p in corpora["midgame"]]
+    def run():
+        for state in states:
+            state.copy()
+    return run, len(states)
+
+
+@benchmark("solver.evaluate.midgame")
+def _bench_solver_evaluate(corpora):
+    # Static evaluation at the leaves of the negamax search
+    from .solver import evaluate
+    cases = [p.board.position_and_mask() for p in corpora["midgame"]]
+    def run():
+        for position, mask in cases:
+            evaluate(position, mask)
+    return run, len(cases)
+
+
+def _mcts_rollouts(guided):
+    def setup(corpora):
+        from .mcts import rollout_batch
+        boards = [p.board for p in corpora["midgame"]] * 5 # 1000 games per batch
+        red = np.array([b.pieces[PLAYER_RED] for b in boards], dtype=np.uint64)
+        yellow = np.array([b.pieces[PLAYER_YELLOW] for b in boards], dtype=np.uint64)
+        heights = np.array([b.heights for b in boards], dtype=np.int64)
+        to_move = np.array([b.player_to_move() for b in boards], dtype=np.int8)
+        rng = np.random.default_rng(DEFAULT_SEED)
+        return (lambda: rollout_batch(red, yellow, heights, to_move, rng, guided)), len(boards)
+    return setup
+
+benchmark("mcts.rollout.random.midgame")(_mcts_rollouts(False))
+benchmark("mcts.rollout.guided.midgame")(_mcts_rollouts(True))
+
+
+@benchmark("mcts.flat_batch.midgame")
+def _bench_flat_batch(corpora):
+    # One vectorised call answering 50 positions, as the game server does for a batch of AI requests
+    from .mcts import flat_batch_moves
+    boards = [p.board for p in corpora["midgame"][:50]]
+    rng = np.random.default_rng(DEFAULT_SEED)
+    return (lambda: flat_batch_moves(boards, rng=rng)), len(boards)
+
+
+@benchmark("create_tracking_matrices")
+def _bench_create_tracking_matrices(corpora):
+    from .b_algorithm import create_tracking_matrices
+    return create_tracking_matrices, 1
+
+
+@benchmark("game_state.gameplay.midgame")
+def _bench_gameplay_view(corpora):
+    from .game_state import GameState
+    states = []
+    for p in corpora["midgame"]:
+        states.append(GameState.from_moves(p.moves))
+    def run():
+        for state in states:
+            state.gameplay
+    return run, len(states)
+
+
+@benchmark("ai.board_conversion.midgame")
+def _bench_board_conversion(corpora):
+    # The gameplay matrix the AI receives is converted to a BitBoard (this replaced the old tuple-of-tuples cache key)
+    matrices = [p.gameplay for p in corpora["midgame"]]
+    def run():
+        for matrix in matrices:
+            BitBoard.from_matrix(matrix).canonical_key()
+    return run, len(matrices)
+
+
+@benchmark("ai.cache_hit.midgame")
+def _bench_cache_hit(corpora):
+    from .move_cache import MoveCache
+    from .ai import cached_move
+    from . import move_cache
+    cases = [(p.gameplay, p.board.valid_moves()) for p in corpora["midgame"]]
+    cache = MoveCache(os.path.join(_scratch_dir(), "cache.sqlite3"), policy="lru")
+    for p, (_, valid_moves) in zip(corpora["midgame"], cases):
+        cache.put("bench", p.board, valid_moves[0])
+    def miss(gameplay_matrix, valid_moves):
+        raise AssertionError("benchmark cache miss")
+    def run():
+        previous = move_cache._cache, move_cache._cache_disabled
+        move_cache.set_move_cache(cache)
+        try:
+            for matrix, valid_moves in cases:
+                cached_move("bench", miss, matrix, valid_moves)
+        finally:
+            move_cache._cache, move_cache._cache_disabled = previous
+    return run, len(cases)
+
+
+@benchmark("ai.book_lookup.opening")
+def _bench_book_lookup(corpora):
+    from .opening_book import get_opening_book
+    book = get_opening_book()
+    rng = random.Random(DEFAULT_SEED)
+    boards = [BitBoard.from_moves(_random_game(rng, rng.randint(0, 4))[0]) for _ in range(CORPUS_SIZE)]
+    if book is None:
+        return None
+    def run():
+        for board in boards:
+            book.lookup(board)
+    return run, len(boards)
+
+
+@benchmark("solver.depth8.midgame")
+def _bench_solver(corpora):
+    from .solver import NegamaxSolver
+    boards = [p.board for p in corpora["midgame"][:4]]
+    solver = NegamaxSolver(time_budget=None)
+    def run():
+        for board in boards:
+            solver.table.clear()
+            solver.best_move(board.copy(), max_depth=8)
+    return run, len(boards)
+
+
+def _init_headless_display():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from .constants import WIDTH, HEIGHT
+    pygame.init()
+    return pygame, pygame.display.set_mode((WIDTH, HEIGHT))
+
+
+@benchmark("render.draw_board.near_full")
+def _bench_draw_board(corpora):
+    pygame, win = _init_headless_display()
+    from .board import Board
+    boards = []
+    for p in corpora["near_full"][:20]:
+        boards.append(Board.from_moves(p.moves))
+    def run():
+        for board in boards:
+            board.draw_board(win)
+    return run, len(boards)
+
+
+@benchmark("render.drop_and_redraw.replay")
+def _bench_incremental_render(corpora):
+    pygame, win = _init_headless_display()
+    from .board import Board
+    from .buttons import draw_matrix_info
+    from .game_state import PLAYER_COLORS
+    font = pygame.font.Font(None, 15)
+    games = [p.moves for p in corpora["near_full"][:5]]
+    colors = [PLAYER_COLORS[PLAYER_RED], PLAYER_COLORS[PLAYER_YELLOW]]
+    def run():
+        for moves in games:
+            board = Board()
+            board.draw_board(win)
+            rows = {}
+            draw_matrix_info(win, board, font, rows)
+            for ply, col in enumerate(moves):
+                board.drop_piece(col, colors[ply & 1])
+                board.draw_dirty_cells(win)
+                draw_matrix_info(win, board, font, rows)
+    return run, sum(len(moves) for moves in games)
+
+
+@benchmark("game_records.encode.near_full")
+def _bench_record_encode(corpora):
+    from .game_records import encode_record
+    games = [p.moves for p in corpora["near_full"]]
+    def run():
+        for moves in games:
+            encode_record("human", "negamax", moves, [0.1] * len(moves), 0, 0.0)
+    return run, len(games)
+
+
+@benchmark("game_records.load_boards.near_full")
+def _bench_record_load(corpora):
+    # Map a log of 100x the corpus and replay every game into gameplay matrices
+    from .game_records import encode_record, load_records, to_boards
+    log = b"".join(encode_record("human", "negamax", p.moves, [0.1] * len(p.moves), 0, 0.0)
+                   for p in corpora["near_full"]) * 100
+    path = os.path.join(_scratch_dir(), "games.c4rec")
+    with open(path, "wb") as f:
+        f.write(log)
+    def run():
+        to_boards(load_records(path))
+    return run, 100 * len(corpora["near_full"])
+
+
+def _connect_k_replay(rows, cols, k):
+    # Games played near the centre of the board, so the cost per move can be compared across board sizes
+    def setup(corpora):
+        from .connect_k import ConnectKState
+        from .game_state import PLAYER_COLORS
+        rng = random.Random(DEFAULT_SEED)
+        games = []
+        for _ in range(20):
+            state, moves = ConnectKState(rows, cols, k), []
+            while len(moves) < 200:
+                col = cols // 2 + rng.randrange(-4, 5)
+                move = state.drop_piece(col, PLAYER_COLORS[state.current_player()])
+                if move is None:
+                    continue
+                moves.append(col)
+                if state.check_win(*move):
+                    break
+            games.append(moves)
+        colors = [PLAYER_COLORS[PLAYER_RED], PLAYER_COLORS[PLAYER_YELLOW]]
+        def run():
+            for moves in games:
+                state = ConnectKState(rows, cols, k)
+                for ply, col in enumerate(moves):
+                    state.check_win(*state.drop_piece(col, colors[ply & 1]))
+        return run, sum(len(moves) for moves in games)
+    return setup
+
+for _rows, _cols, _k in ((6, 7, 4), (60, 70, 5), (600, 700, 5)):
+    benchmark(f"connect_k.drop_check.{_rows}x{_cols}")(_connect_k_replay(_rows, _cols, _k))
+
+
+@benchmark("render.connect_k_view.600x700")
+def _bench_connect_k_view(corpora):
+    pygame, win = _init_headless_display()
+    from .connect_k import ConnectKState
+    from .connect_k_view import ConnectKView
+    from .game_state import PLAYER_COLORS
+    state = ConnectKState(600, 700, 5)
+    rng = random.Random(DEFAULT_SEED)
+    for _ in range(5000):
+        state.drop_piece(rng.randrange(state.cols), PLAYER_COLORS[state.current_player()])
+    view = ConnectKView(state, pygame.Rect(0, 0, 600, 700))
+    def run():
+        for _ in range(10):
+            view.scroll(1, 0)
+            view.draw(win)
+    return run, 10
+
+
+@benchmark("game.random_vs_random")
+def _bench_whole_game(corpora):
+    # Macro benchmark: whole games through the rules with the AI backend stubbed by the random mover (which never
+    # touches the move cache, so nothing has to be swapped out)
+    from .game_state import GameState, PLAYER_COLORS
+    from .ai import get_random_move
+    def run():
+        random.seed(DEFAULT_SEED)
+        for _ in range(20):
+            game = GameState()
+            while True:
+                valid_moves = game.valid_moves()
+                if not valid_moves:
+                    break
+                player = game.current_player()
+                row, col = game.drop_piece(get_random_move(game.gameplay, valid_moves), PLAYER_COLORS[player])
+                if game.check_win(row, col):
+                    break
+    return run, 20
+
+
+# --- Parallel search scaling ---
+
+def measure_scaling(worker_counts, time_budget: float = 1.0, fixed_depth: int = 10, positions: int = 6,
+                    seed: int = DEFAULT_SEED, progress=None) -> list:
+    """
+    Speedup curve of the parallel search on seeded early-game positions (6 to 10 plies, where the result is not yet
+    decided, so searches are not cut short by proven scores). For each worker count it reports:
+        - mean depth reached at a fixed move time (time_budget),
+        - mean wall time to finish a fixed depth (fixed_depth) and the speedup over the first worker count,
+        - nodes searched per second.
+    Every worker count gets a fresh pool, so transposition tables start cold for all of them. Worker counts for which
+    ParallelSolver falls back to serial search (1 worker, or a single-CPU machine) are reported with "serial": True,
+    and their speedup can only come from the serial engine; run the curve on a multi-core machine to measure scaling.
+    """
+    from .parallel_search import ParallelSolver
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < positions:
+        moves, direction = _random_game(rng, rng.randint(6, 10))
+        if direction is None:
+            boards.append(BitBoard.from_moves(moves))
+    rows = []
+    for workers in worker_counts:
+        # A fresh pool for each measurement, so no transposition table is warmed up by an earlier search
+        solver = ParallelSolver(workers=workers)
+        try:
+            solver.best_move(BitBoard.from_moves((0, 6)), max_depth=1, time_budget=None) # Start the pool before timing
+            nodes, start = 0, time.perf_counter()
+            for board in boards:
+                solver.best_move(board.copy(), max_depth=fixed_depth, time_budget=None)
+                nodes += solver.nodes
+            elapsed = time.perf_counter() - start
+        finally:
+            solver.shutdown()
+        solver = ParallelSolver(workers=workers)
+        try:
+            solver.best_move(BitBoard.from_moves((0, 6)), max_depth=1, time_budget=None)
+            depths = []
+            for board in boards:
+                solver.best_move(board.copy(), time_budget=time_budget)
+                depths.append(solver.last_depth)
+        finally:
+            solver.shutdown()
+        row = {"workers": workers, "serial": solver.serial, "mean_depth": statistics.mean(depths),
+               "seconds_to_depth": elapsed / len(boards), "nodes_per_sec": nodes / elapsed if elapsed else 0.0}
+        row["speedup"] = rows[0]["seconds_to_depth"] / row["seconds_to_depth"] if rows else 1.0
+        rows.append(row)
+        if progress is not None:
+            progress(row)
+    return rows
+
+
+# --- Runner ---
+
+def calibrate(run, ops: int) -> int:
+    """Returns the number of calls of run() per repeat: enough for MIN_REPEAT_TIME, or FAST_REPEAT_TIME if fast."""
+    loops = 1
+    while True:
+        elapsed = time_loops(run, loops)
+        if elapsed >= MIN_REPEAT_TIME:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(MIN_REPEAT_TIME / elapsed) + 1))
+    if 1e6 * elapsed / (loops * ops) < FAST_OP_US and elapsed < FAST_REPEAT_TIME:
+        loops = int(loops * FAST_REPEAT_TIME / elapsed) + 1
+    return loops
+
+
+def time_loops(run, loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        run()
+    return time.perf_counter() - start
+
+
+def summarize(samples, loops: int, ops: int) -> dict:
+    """The median and minimum time per operation in microseconds of the repeats (seconds per repeat) in samples."""
+    per_op = [1e6 * sample / (loops * ops) for sample in samples]
+    return {"median_us": statistics.median(per_op), "min_us": min(per_op), "ops": ops * loops}
+
+
+def time_benchmark(run, ops: int, repeats: int = DEFAULT_REPEATS) -> dict:
+    """Times run() and returns the median and minimum time per operation in microseconds."""
+    loops = calibrate(run, ops)
+    return summarize([time_loops(run, loops) for _ in range(repeats)], loops, ops)
+
+
+def environment() -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_benchmarks(names=None, seed: int = DEFAULT_SEED, repeats: int = DEFAULT_REPEATS, progress=None) -> dict:
+    """
+    Runs the selected benchmarks (all by default; names may be prefixes such as 'render.') and returns the result
+    document: {"environment": ..., "seed": ..., "results": {name: {"median_us", "min_us", "ops"}}}.
+    """
+    selected = [name for name in BENCHMARKS if not names or any(name.startswith(prefix) for prefix in names)]
+    corpora = build_corpora(seed)
+    timed = {}
+    for name in selected:
+        setup = BENCHMARKS[name](corpora)
+        if setup is None:
+            continue # Not available here (e.g. no opening book file)
+        run, ops = setup
+        timed[name] = (run, ops, calibrate(run, ops), [])
+    # The repeats are taken in rounds over all the benchmarks rather than back to back, so a slow spell of the machine
+    # (another process, frequency scaling) costs every benchmark one repeat instead of costing one benchmark all of them.
+    for _ in range(repeats):
+        for run, ops, loops, samples in timed.values():
+            samples.append(time_loops(run, loops))
+    results = {}
+    for name, (run, ops, loops, samples) in timed.items():
+        results[name] = summarize(samples, loops, ops)
+        if progress is not None:
+            progress(name, results[name])
+    return {"environment": environment(), "seed": seed, "results": results}
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD, noise_floor: float = NOISE_FLOOR_US):
+    """
+    Compares two result documents on the minimum time per operation.
+    Returns (rows, regressions, missing): rows are (name, baseline_us, current_us, ratio) for every benchmark in both,
+    regressions the names whose ratio exceeds 1 + threshold and whose slowdown exceeds noise_floor microseconds,
+    missing the baseline benchmarks absent from current (a benchmark that stopped running cannot be checked).
+    """
+    rows, regressions = [], []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["min_us"] / base["min_us"] if base["min_us"] else float("inf")
+        rows.append((name, base["min_us"], result["min_us"], ratio))
+        if ratio > 1 + threshold and result["min_us"] - base["min_us"] > noise_floor:
+            regressions.append(name)
+    missing = [name for name in baseline["results"] if name not in current["results"]]
+    return rows, regressions, missing
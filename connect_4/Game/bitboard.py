@@ -0,0 +1,206 @@
+"""
+This module provides a compact bitboard representation of the Connect 4 game state.
+Each player's pieces are stored in a single integer (fitting in 64 bits) and every column keeps a height counter,
+so dropping a piece is O(1) and a win is detected with a handful of shift-and-mask operations instead of NumPy slicing.
+
+Bit layout: each column uses ROWS + 1 bits (one spare sentinel bit on top so shifts never wrap into the next column).
+Bit index = col * (ROWS + 1) + height, where height 0 is the bottom row of the board.
+
+    col:   0  1  2  3  4  5  6
+          6 13 20 27 34 41 48   <- sentinel bits (always 0)
+          5 12 19 26 33 40 47   <- top row    (gameplay row 0)
+          4 11 18 25 32 39 46
+          3 10 17 24 31 38 45
+          2  9 16 23 30 37 44
+          1  8 15 22 29 36 43
+          0  7 14 21 28 35 42   <- bottom row (gameplay row ROWS - 1)
+"""
+from .constants import ROWS, COLS, PLAYER_RED, PLAYER_YELLOW
+
+COLUMN_BITS = ROWS + 1
+# Shift distances for the four line directions: vertical, horizontal, diagonal (/) and anti-diagonal (\)
+DIRECTIONS = (1, COLUMN_BITS, COLUMN_BITS + 1, COLUMN_BITS - 1)
+
+# Per-column masks used by the search code, which plays moves on (position, mask) pairs rather than BitBoard objects.
+BOTTOM_MASKS = tuple(1 << (col * COLUMN_BITS) for col in range(COLS))
+TOP_MASKS = tuple(1 << (col * COLUMN_BITS + ROWS - 1) for col in range(COLS))
+COLUMN_MASKS = tuple(((1 << ROWS) - 1) << (col * COLUMN_BITS) for col in range(COLS))
+BOARD_MASK = sum(COLUMN_MASKS)
+ALL_BOTTOMS = sum(BOTTOM_MASKS)
+
+
+def bit_index(row: int, col: int) -> int:
+    """Converts a (row, col) position of the gameplay matrix (row 0 = top) into a bit index."""
+    return col * COLUMN_BITS + (ROWS - 1 - row)
+
+
+def has_four(bits: int) -> bool:
+    """Returns True if the given player bitboard contains four connected pieces in any direction."""
+    for shift in DIRECTIONS:
+        pairs = bits & (bits >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def winning_cells(position: int, mask: int) -> int:
+    """
+    Returns a bitmask of the empty cells that would complete four-in-a-row for the player owning position.
+    mask is the bitmask of all occupied cells. Used by the search to find immediate wins and to score threats.
+    """
+    # vertical: three pieces directly below the empty cell
+    result = (position << 1) & (position << 2) & (position << 3)
+    for shift in DIRECTIONS[1:]:
+        pair = (position << shift) & (position << (2 * shift))
+        result |= pair & (position << (3 * shift))
+        result |= pair & (position >> shift)
+        pair = (position >> shift) & (position >> (2 * shift))
+        result |= pair & (position << shift)
+        result |= pair & (position >> (3 * shift))
+    return result & (BOARD_MASK ^ mask)
+
+
+def mirror(bits: int) -> int:
+    """Returns the left-right mirror image of a bitboard (column c becomes column COLS - 1 - c)."""
+    mirrored = 0
+    for col in range(COLS):
+        column = (bits >> (col * COLUMN_BITS)) & COLUMN_MASKS[0]
+        mirrored |= column << ((COLS - 1 - col) * COLUMN_BITS)
+    return mirrored
+
+
+def position_key(position: int, mask: int) -> int:
+    """
+    Compact unique key of a position (fits in COLS * COLUMN_BITS = 49 bits).
+    position holds the pieces of the side to move and mask all occupied cells; the extra bottom bit per column
+    marks the first empty cell, so two different positions can never share a key.
+    """
+    return position + mask + ALL_BOTTOMS
+
+
+class BitBoard:
+    """
+    Game state made of two player bitboards plus per-column height counters.
+    pieces[PLAYER_RED] and pieces[PLAYER_YELLOW] hold the bitboards; index 0 is unused so player ids can index directly.
+    stack holds the column of every piece played, so undo() can take pieces back in reverse order. A board built with
+    from_matrix starts with an empty stack: the order its pieces were played in is unknown, so they cannot be undone.
+    """
+
+    __slots__ = ("pieces", "heights", "moves", "stack")
+
+    def __init__(self):
+        self.pieces = [0, 0, 0]
+        self.heights = [0] * COLS
+        self.moves = 0
+        self.stack = []
+
+    @classmethod
+    def from_matrix(cls, gameplay) -> "BitBoard":
+        """
+        Builds a BitBoard from a gameplay matrix (0 = empty, 1 = Red, 2 = Yellow, row 0 = top).
+        The matrix does not say in which order the pieces were played, so the move stack is left empty and undo()
+        raises ValueError until a move is played on the new board.
+        """
+        board = cls()
+        for col in range(COLS):
+            for row in range(ROWS - 1, -1, -1):
+                player = int(gameplay[row][col])
+                if player == 0:
+                    break
+                board.pieces[player] |= 1 << (col * COLUMN_BITS + ROWS - 1 - row)
+                board.heights[col] += 1
+                board.moves += 1
+        return board
+
+    @classmethod
+    def from_moves(cls, moves) -> "BitBoard":
+        """Builds a BitBoard by playing a sequence of columns, alternating Red and Yellow starting with Red."""
+        board = cls()
+        for col in moves:
+            board.play(col, board.player_to_move())
+        return board
+
+    def copy(self) -> "BitBoard":
+        """Independent copy: the lists are copied, nothing mutable is shared."""
+        board = BitBoard.__new__(BitBoard) # Skips __init__, whose lists would be replaced straight away
+        board.pieces = self.pieces[:]
+        board.heights = self.heights[:]
+        board.moves = self.moves
+        board.stack = self.stack[:]
+        return board
+
+    def player_to_move(self) -> int:
+        """Red always opens the game, so the side to move follows from the number of pieces played."""
+        return PLAYER_RED if self.moves % 2 == 0 else PLAYER_YELLOW
+
+    def position_and_mask(self):
+        """Returns (pieces of the side to move, all occupied cells), the encoding used by the search code."""
+        return self.pieces[self.player_to_move()], self.pieces[PLAYER_RED] | self.pieces[PLAYER_YELLOW]
+
+    def canonical_key(self):
+        """
+        Returns (key, mirrored) where key is the smaller of the position key and the key of its mirror image,
+        so left-right mirror positions share one key. mirrored is True when the key belongs to the mirror image,
+        in which case a column stored under it must be flipped back with COLS - 1 - col.
+        """
+        position, mask = self.position_and_mask()
+        key = position_key(position, mask)
+        mirror_key = position_key(mirror(position), mirror(mask))
+        if mirror_key < key:
+            return mirror_key, True
+        return key, False
+
+    def can_play(self, col: int) -> bool:
+        return 0 <= col < COLS and self.heights[col] < ROWS
+
+    def valid_moves(self) -> list:
+        """Returns the list of column indices that are not full."""
+        return [c for c in range(COLS) if self.heights[c] < ROWS]
+
+    def is_full(self) -> bool:
+        return self.moves == ROWS * COLS
+
+    def play(self, col: int, player: int):
+        """
+        Drops a piece for player (PLAYER_RED or PLAYER_YELLOW) into col.
+        Returns the gameplay-matrix row the piece landed on, or None if the column is full.
+        """
+        height = self.heights[col]
+        if height >= ROWS:
+            return None
+        self.pieces[player] |= 1 << (col * COLUMN_BITS + height)
+        self.heights[col] = height + 1
+        self.moves += 1
+        self.stack.append(col)
+        return ROWS - 1 - height
+
+    def undo(self):
+        """
+        Takes back the last piece played and returns (row, col, player) of it, restoring the state exactly.
+        Returns None if no piece has been played. Raises ValueError for the pieces of a board built with from_matrix.
+        """
+        if not self.stack:
+            if self.moves:
+                raise ValueError("The order of the pieces is unknown (the board was built from a matrix), "
+                                 "so they cannot be undone")
+            return None
+        col = self.stack.pop()
+        height = self.heights[col] - 1
+        bit = 1 << (col * COLUMN_BITS + height)
+        player = PLAYER_RED if self.pieces[PLAYER_RED] & bit else PLAYER_YELLOW # The stack only needs the column
+        self.pieces[player] ^= bit
+        self.heights[col] = height
+        self.moves -= 1
+        return ROWS - 1 - height, col, player
+
+    def cell(self, row: int, col: int) -> int:
+        """Returns 0 for an empty cell, otherwise the id of the player occupying it."""
+        bit = 1 << bit_index(row, col)
+        if self.pieces[PLAYER_RED] & bit:
+            return PLAYER_RED
+        if self.pieces[PLAYER_YELLOW] & bit:
+            return PLAYER_YELLOW
+        return 0
+
+    def is_win(self, player: int) -> bool:
+        return has_four(self.pieces[player])
@@ -1,61 +1,73 @@
 ﻿"""
-This module defines the Board class for the Connect 4 game, it handles the drawing of the game board and the placement of pieces. 
-It also initializes the tracking matrices used for gameplay and scorecard tracking.
+This module defines the Board class for the Connect 4 game, it handles the drawing of the game board and the placement of pieces.
+The game rules and state live in GameState (game_state.py), which has no pygame dependency; Board adds the drawing on top.
+Drawing is incremental: after the first full paint only the cells changed by drop_piece are redrawn, and the
+drawing methods return the rects they touched so the caller can pass them to pygame.display.update.
 """
 
 import pygame
-from .constants import BLUE, WHITE, SKY_BLUE, ROWS, COLS, COLUMN_SIZE, ROW_SIZE, HEIGHT, TOKEN_RADIUS, WIDTH, CIRCLE_SIZE, RED, YELLOW
-from .pieces import Piece
-from .test import check_win_vectorized # Import the new function
-from .b_algorithm import create_tracking_matrices
+from .constants import BLUE, WHITE, SKY_BLUE, ROWS, COLS, COLUMN_SIZE, ROW_SIZE, HEIGHT, TOKEN_RADIUS, WIDTH, CIRCLE_SIZE, RED, YELLOW, PLAYER_RED, PLAYER_YELLOW
+from .pieces import Piece, RedPiece, YellowPiece
+from .game_state import GameState
+from .instrumentation import timed
 
-class Board:
+# One piece object per player is enough to draw every token of that colour.
+PIECES = {PLAYER_RED: RedPiece(RED), PLAYER_YELLOW: YellowPiece(YELLOW)}
+EMPTY_SLOT = Piece(WHITE)
+
+class Board(GameState):
+
+    __slots__ = ("chk", "dirty_cells")
 
     def __init__(self):
-        # initialize an empty board 
-        self.board = [[None for _ in range(COLS)] for _ in range(ROWS)]
-        
-        # Initialize the tracking matrices from b_algorithm file
-        self.chk = True # Flag to indicate if the board needs redrawing
-        self.gameplay, self.red_scorecard, self.yellow_scorecard = create_tracking_matrices() 
+        super().__init__()
+        self.chk = True # Flag to indicate if the whole board needs redrawing
+        self.dirty_cells = [] # Cells changed since the last draw, redrawn by draw_dirty_cells
 
+    @timed("board.drop_piece")
     def drop_piece(self, col, piece_color):
         """
-        Drops a piece of a given color into the specified column.
+        Drops a piece of a given color into the specified column and marks its cell for redrawing.
         Returns the (row, col) of the move if successful, otherwise None.
         """
-        for r in range(ROWS - 1, -1, -1):  # Iterate from the bottom row up
-            if self.board[r][col] is None:
-                self.board[r][col] = Piece(piece_color)
-                # Assign 
-                # Update the tracking matrices
-                if piece_color == RED:
-                    self.gameplay[r][col] = 1
-                    self.red_scorecard[r][col] = 1 
-                    # If a red piece is played, record 1 at that position in the red_scorecard matrix and 1 in the gameplay matrix
-                else: # Yellow piece
-                    self.gameplay[r][col] = 2
-                    self.yellow_scorecard[r][col] = 1
-                    # If a yellow piece is played, record 1 at that position in the yellow_scorecard matrix and 2 in the gameplay matrix
-                self.chk = True # The board has changed, so it needs to be redrawn
-                return r, col  # Return the position of the new piece
-        return None  # Indicates the column is full
+        move = super().drop_piece(col, piece_color)
+        if move:
+            self.dirty_cells.append(move) # Only this cell needs to be redrawn
+        return move
+
+    check_win = timed("board.check_win")(GameState.check_win)
+
+    def undo_move(self):
+        """Takes back the last move and marks its cell for redrawing. Returns the (row, col) emptied, or None."""
+        move = super().undo_move()
+        if move:
+            self.dirty_cells.append(move)
+        return move
+
+    def copy(self):
+        """Independent copy of the board. The copy has not been drawn yet, so it starts with a full redraw pending."""
+        board = super().copy()
+        board.chk = True
+        board.dirty_cells = []
+        return board
+
+    def draw_cell(self, win, row, col):
+        """Draws the piece (or empty slot) of one cell and returns the rect that changed."""
+        # Calculate the center of the circle dynamically
+        x = int(col * COLUMN_SIZE + COLUMN_SIZE / 2)
+        y = int(row * ROW_SIZE + ROW_SIZE / 2)
+        player_id = self.state.cell(row, col)
+        piece = PIECES[player_id] if player_id else EMPTY_SLOT
+        piece.draw(win, x, y)
+        return pygame.Rect(x - TOKEN_RADIUS, y - TOKEN_RADIUS, 2 * TOKEN_RADIUS, 2 * TOKEN_RADIUS)
 
-    def check_win(self, row, col):
-        """Checks for a win from the last piece dropped."""
-        player_id = self.gameplay[row][col]
-        if player_id == 0:
-            return None
-        
-        # Select the correct scorecard based on the player
-        scorecard = self.red_scorecard if player_id == 1 else self.yellow_scorecard
-        
-        # Use the new vectorized win check algorithm
-        if check_win_vectorized(scorecard, row, col):
-            return player_id # Return the winning player's ID
-        
-        return None # No winner
+    def draw_dirty_cells(self, win):
+        """Redraws only the cells changed since the last draw. Returns the list of changed rects."""
+        rects = [self.draw_cell(win, row, col) for row, col in self.dirty_cells]
+        self.dirty_cells.clear()
+        return rects
 
+    @timed("draw_board")
     def draw_board(self, win):
         # Board is divided into two regions. One containing the game section, the other containing an info section that contains information from tracking Matrices as well as operational buttons
         # Draw the first section (game board area)
@@ -68,13 +80,7 @@ class Board:
 
         for row in range(ROWS):
             for col in range(COLS):
-                # Calculate the center of the circle dynamically
-                x = int(col * COLUMN_SIZE + COLUMN_SIZE / 2)
-                y = int(row * ROW_SIZE + ROW_SIZE / 2)
-                
-                piece = self.board[row][col]
-                if piece is not None:
-                    piece.draw(win, x, y)
-                else:
-                    # Draw an empty slot
-                    pygame.draw.circle(win, WHITE, (x, y), TOKEN_RADIUS)
+                self.draw_cell(win, row, col)
+        self.dirty_cells.clear()
+        self.chk = False
+        return [game_section, info_section]
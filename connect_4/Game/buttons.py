@@ -1,10 +1,27 @@
 """ This module defines a Button class for creating interactive buttons in the Connect 4 game using Pygame.
 It also includes a function to draw the gameplay and scorecard matrices on the game window.
+Text is rendered through a small surface cache, and the drawing functions return the rects they changed so that
+only those regions are passed to pygame.display.update.
 """
 import pygame
-from .constants import BUTTON_WIDTH, BUTTON_HEIGHT, BUTTON_COLOR, BUTTON_HOVER_COLOR, BUTTON_TEXT_COLOR 
+from .constants import BUTTON_WIDTH, BUTTON_HEIGHT, BUTTON_COLOR, BUTTON_HOVER_COLOR, BUTTON_TEXT_COLOR, SKY_BLUE
 from .board import Board 
+from .instrumentation import timed
 
+# Rendered text surfaces keyed by (font, text, colour). Matrix rows repeat a lot, so most renders become lookups.
+_text_cache = {}
+TEXT_CACHE_SIZE = 1024
+
+def render_text(font, text, color):
+    """Returns a rendered text surface, re-using a cached one when the same text was rendered before."""
+    key = (font, text, color)
+    surface = _text_cache.get(key)
+    if surface is None:
+        if len(_text_cache) >= TEXT_CACHE_SIZE:
+            _text_cache.clear()
+        surface = font.render(text, True, color)
+        _text_cache[key] = surface
+    return surface
 
 
 class Button:
@@ -12,17 +29,23 @@ class Button:
         self.rect = pygame.Rect(x, y,BUTTON_WIDTH, BUTTON_HEIGHT)# Define a button class for future use
         self.text = text
         self.is_hovered = False
+        self.needs_redraw = True # Set when the hover state changes
     
     
     def draw(self, win, font):
      current_color = BUTTON_HOVER_COLOR if self.is_hovered else BUTTON_COLOR
      pygame.draw.rect(win, current_color, self.rect, border_radius=12)
-     text_surface = font.render(self.text, True, BUTTON_TEXT_COLOR)
+     text_surface = render_text(font, self.text, BUTTON_TEXT_COLOR)
      text_rect = text_surface.get_rect(center=self.rect.center)
      win.blit(text_surface, text_rect)
+     self.needs_redraw = False
+     return self.rect
      
     def check_hover(self, mouse_pos):
-         self.is_hovered = self.rect.collidepoint(mouse_pos)
+         is_hovered = bool(self.rect.collidepoint(mouse_pos))
+         if is_hovered != self.is_hovered:
+             self.is_hovered = is_hovered
+             self.needs_redraw = True
          
          
     def is_clicked(self, event):
@@ -30,12 +53,20 @@ class Button:
     
 
 
-def draw_matrix_info(win, board, font): 
+@timed("draw_matrix_info")
+def draw_matrix_info(win, board, font, drawn_rows=None): 
 #Draws the gameplay and scorecard matrices on the game_section and info section of the window respectively.
+#drawn_rows is an optional dict kept by the caller between frames: it remembers the text of every row drawn, so that only
+#rows whose text changed are redrawn. Pass an empty dict after a full repaint. Returns the list of rects that changed.
     start_x = 610 
     start_y = 20
     line_height = 18
+    row_width = 190
     black = (0, 0, 0)
+    if drawn_rows is None:
+        drawn_rows = {}
+    full = not drawn_rows
+    rects = []
 
     matrices = {
     "Gameplay": board.gameplay,
@@ -46,13 +77,43 @@ def draw_matrix_info(win, board, font):
     y_offset = start_y # y_offset sets the starting vertical position for drawing text
     for title, matrix in matrices.items():
         # Draw title
-        title_surface = font.render(title + ":", True, black)
-        win.blit(title_surface, (start_x, y_offset))
+        if full:
+            title_surface = render_text(font, title + ":", black)
+            rects.append(win.blit(title_surface, (start_x, y_offset)))
         y_offset += line_height
 
         # Draw matrix rows
         for row in matrix:
             row_text = " ".join(map(str, row))
-            text_surface = font.render(row_text, True, black)
-            win.blit(text_surface, (start_x, y_offset))
-            y_offset += line_height
\ No newline at end of file
+            if drawn_rows.get(y_offset) != row_text:
+                drawn_rows[y_offset] = row_text
+                row_rect = pygame.Rect(start_x, y_offset, row_width, line_height)
+                if not full:
+                    pygame.draw.rect(win, SKY_BLUE, row_rect) # Clear the previous text of this row
+                win.blit(render_text(font, row_text, black), (start_x, y_offset))
+                rects.append(row_rect)
+            y_offset += line_height
+    return rects
+
+
+def draw_status(win, font, text):
+# Draws a one-line status message (e.g. "AI is thinking...") below the matrices in the info section. An empty text clears it.
+    status_rect = pygame.Rect(600, 420, 200, 30)
+    pygame.draw.rect(win, SKY_BLUE, status_rect)
+    if text:
+        text_surface = render_text(font, text, (0, 0, 0))
+        win.blit(text_surface, (610, status_rect.y + 6))
+    return status_rect
+
+
+def draw_metrics_overlay(win, font, lines):
+# Draws the performance overlay (p50/p95/p99 per timer, in ms) in the free strip below the grid. Returns the rect drawn.
+# The overlay is opaque, so hiding it needs a full repaint of the board.
+    line_height = 16
+    header = f"{'timer':<18} {'p50':>7} {'p95':>7} {'p99':>7}"
+    height = (len(lines) + 1) * line_height + 8
+    overlay_rect = pygame.Rect(0, win.get_height() - height, 600, height)
+    pygame.draw.rect(win, (0, 0, 0), overlay_rect)
+    for i, line in enumerate([header] + lines):
+        win.blit(font.render(line, True, (255, 255, 255)), (6, overlay_rect.y + 4 + i * line_height)) # Not cached: the numbers keep changing
+    return overlay_rect
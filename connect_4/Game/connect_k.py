@@ -0,0 +1,132 @@
+"""
+This module provides the rules of Connect-K on a configurable rows x cols board, for stress and research workloads on
+boards far larger than 6x7 (hundreds of columns). It has the same interface as GameState (drop_piece, check_win,
+valid_moves, current_player, undo_move, copy) but no bitboards, so there is no limit on the board size.
+
+    - The state is sparse: only columns that hold pieces are stored, each as a bytearray of player ids from the bottom up.
+      Memory grows with the number of pieces played, not with the board area.
+    - check_win only looks at the cells near the last drop: up to K - 1 cells each way along the four lines through it.
+      Together with the O(1) drop, the cost of a move does not depend on the size of the board.
+
+Rows are numbered from the top (row 0 = top row) like the gameplay matrix of the standard game.
+"""
+from .constants import RED, PLAYER_RED, PLAYER_YELLOW
+
+# (height step, column step) of the four line directions: vertical, horizontal, diagonal (/) and anti-diagonal (\)
+LINE_DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+
+class ConnectKState:
+
+    __slots__ = ("rows", "cols", "k", "columns", "stack", "full_columns")
+
+    def __init__(self, rows: int = 6, cols: int = 7, k: int = 4):
+        if rows < 1 or cols < 1 or k < 2:
+            raise ValueError(f"Invalid Connect-K board: {rows} rows, {cols} columns, K = {k}")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.columns = {} # col -> bytearray of player ids from the bottom up, only for columns holding pieces
+        self.stack = [] # Column of every piece played, for undo_move
+        self.full_columns = 0
+
+    @property
+    def moves(self) -> int:
+        return len(self.stack)
+
+    def height(self, col: int) -> int:
+        column = self.columns.get(col)
+        return len(column) if column else 0
+
+    def cell(self, row: int, col: int) -> int:
+        """Returns 0 for an empty (or off-board) cell, otherwise the id of the player occupying it."""
+        column = self.columns.get(col)
+        height = self.rows - 1 - row
+        if column is None or not 0 <= height < len(column):
+            return 0
+        return column[height]
+
+    def can_play(self, col: int) -> bool:
+        return 0 <= col < self.cols and self.height(col) < self.rows
+
+    def valid_moves(self) -> list:
+        """Returns the list of columns that are not full. O(cols): prefer can_play for a single column."""
+        return [c for c in range(self.cols) if self.height(c) < self.rows]
+
+    def current_player(self) -> int:
+        """Returns the id of the player to move (Red always opens)."""
+        return PLAYER_RED if len(self.stack) % 2 == 0 else PLAYER_YELLOW
+
+    def is_full(self) -> bool:
+        return self.full_columns == self.cols
+
+    def drop_piece(self, col: int, piece_color):
+        """
+        Drops a piece of a given color into the specified column in O(1).
+        Returns the (row, col) of the move if successful, otherwise None.
+        """
+        if not 0 <= col < self.cols:
+            return None
+        column = self.columns.get(col)
+        if column is None:
+            column = self.columns[col] = bytearray()
+        elif len(column) >= self.rows:
+            return None # Column is full
+        column.append(PLAYER_RED if piece_color == RED else PLAYER_YELLOW)
+        if len(column) == self.rows:
+            self.full_columns += 1
+        self.stack.append(col)
+        return self.rows - len(column), col
+
+    def undo_move(self):
+        """Takes back the last move. Returns the (row, col) that was emptied, or None if no move has been played."""
+        if not self.stack:
+            return None
+        col = self.stack.pop()
+        column = self.columns[col]
+        if len(column) == self.rows:
+            self.full_columns -= 1
+        column.pop()
+        if not column:
+            del self.columns[col]
+        return self.rows - 1 - len(column), col
+
+    def check_win(self, row: int, col: int):
+        """
+        Checks for K in a row through the piece at (row, col), normally the last piece dropped.
+        Returns the winning player's id, otherwise None. Looks at no more than 4 * 2 * (K - 1) neighbouring cells.
+        """
+        player = self.cell(row, col)
+        if player == 0:
+            return None
+        columns, k = self.columns, self.k
+        height = self.rows - 1 - row
+        for d_height, d_col in LINE_DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                h, c = height + sign * d_height, col + sign * d_col
+                while count < k:
+                    column = columns.get(c)
+                    if column is None or not 0 <= h < len(column) or column[h] != player:
+                        break
+                    count += 1
+                    h += sign * d_height
+                    c += sign * d_col
+            if count >= k:
+                return player
+        return None
+
+    def copy(self) -> "ConnectKState":
+        """Independent copy: only the occupied columns are copied, nothing mutable is shared."""
+        state = ConnectKState.__new__(ConnectKState)
+        state.rows, state.cols, state.k = self.rows, self.cols, self.k
+        state.columns = {col: column[:] for col, column in self.columns.items()}
+        state.stack = self.stack[:]
+        state.full_columns = self.full_columns
+        return state
+
+    def pieces(self):
+        """Yields (row, col, player) for every piece on the board, in no particular order."""
+        for col, column in self.columns.items():
+            for height, player in enumerate(column):
+                yield self.rows - 1 - height, col, player
@@ -0,0 +1,84 @@
+"""
+This module draws a scrollable viewport onto a ConnectKState (connect_k.py), so boards with hundreds of columns are
+shown at the normal piece size instead of being shrunk to fit the window.
+
+Only the cells inside the viewport are drawn, read straight from the sparse state, so the cost of a frame depends on
+the window size and not on the size of the board. The view can be scrolled by whole cells and follows the last move.
+"""
+import pygame
+from .constants import BLUE, TOKEN_RADIUS
+from .board import PIECES, EMPTY_SLOT
+
+CELL_SIZE = 2 * TOKEN_RADIUS + 20 # Pieces keep their normal size, with a margin around each
+
+
+class ConnectKView:
+
+    def __init__(self, state, rect: pygame.Rect, cell_size: int = CELL_SIZE):
+        self.state = state
+        self.rect = pygame.Rect(rect)
+        self.cell_size = cell_size
+        self.visible_cols = max(1, min(state.cols, self.rect.width // cell_size))
+        self.visible_rows = max(1, min(state.rows, self.rect.height // cell_size))
+        self.first_col = max(0, (state.cols - self.visible_cols) // 2) # Start centred horizontally
+        self.first_row = state.rows - self.visible_rows # and on the bottom rows, where play starts
+
+    def scroll(self, d_cols: int = 0, d_rows: int = 0) -> bool:
+        """Moves the viewport by whole cells, clamped to the board. Returns True if it moved."""
+        first_col = min(max(0, self.first_col + d_cols), self.state.cols - self.visible_cols)
+        first_row = min(max(0, self.first_row + d_rows), self.state.rows - self.visible_rows)
+        moved = (first_col, first_row) != (self.first_col, self.first_row)
+        self.first_col, self.first_row = first_col, first_row
+        return moved
+
+    def follow(self, row: int, col: int) -> bool:
+        """Scrolls just enough to make (row, col) visible. Returns True if the viewport moved."""
+        d_cols = d_rows = 0
+        if col < self.first_col:
+            d_cols = col - self.first_col
+        elif col >= self.first_col + self.visible_cols:
+            d_cols = col - (self.first_col + self.visible_cols - 1)
+        if row < self.first_row:
+            d_rows = row - self.first_row
+        elif row >= self.first_row + self.visible_rows:
+            d_rows = row - (self.first_row + self.visible_rows - 1)
+        return self.scroll(d_cols, d_rows)
+
+    def column_at(self, x: int):
+        """Returns the board column under window x coordinate x, or None if it is outside the viewport."""
+        offset = x - self.rect.x
+        if not 0 <= offset < self.visible_cols * self.cell_size:
+            return None
+        return self.first_col + offset // self.cell_size
+
+    def cell_rect(self, row: int, col: int):
+        """Window rect of a board cell, or None if the cell is outside the viewport."""
+        view_col, view_row = col - self.first_col, row - self.first_row
+        if not (0 <= view_col < self.visible_cols and 0 <= view_row < self.visible_rows):
+            return None
+        return pygame.Rect(self.rect.x + view_col * self.cell_size, self.rect.y + view_row * self.cell_size,
+                           self.cell_size, self.cell_size)
+
+    def draw_cell(self, win, row: int, col: int):
+        """Draws one cell if it is visible and returns its rect (None when it is scrolled out of view)."""
+        rect = self.cell_rect(row, col)
+        if rect is None:
+            return None
+        pygame.draw.rect(win, BLUE, rect)
+        player = self.state.cell(row, col)
+        piece = PIECES[player] if player else EMPTY_SLOT
+        piece.draw(win, rect.centerx, rect.centery)
+        return rect
+
+    def draw(self, win) -> pygame.Rect:
+        """Draws every visible cell and returns the viewport rect."""
+        pygame.draw.rect(win, BLUE, self.rect)
+        for row in range(self.first_row, self.first_row + self.visible_rows):
+            for col in range(self.first_col, self.first_col + self.visible_cols):
+                self.draw_cell(win, row, col)
+        return self.rect
+
+    def describe(self) -> str:
+        """Short text of the visible range, for the info panel."""
+        return (f"cols {self.first_col}-{self.first_col + self.visible_cols - 1}, "
+                f"rows {self.first_row}-{self.first_row + self.visible_rows - 1}")
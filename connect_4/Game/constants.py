@@ -1,8 +1,7 @@
 """
 This module defines constants used in the Connect 4 game, including dimensions, colors, and frame rate. 
 """
-import pygame
- 
+
 WIDTH, HEIGHT = 800, 700
  # rows and columns are set to the standard Connect 4 dimensions and the requirements for the assessment
 ROWS, COLS = 6, 7
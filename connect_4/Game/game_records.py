@@ -0,0 +1,256 @@
+"""
+This module records every game played (human or AI) in a compact binary log, and loads directories of logs back into
+NumPy arrays for building opening books, evaluation datasets and latency reports.
+
+Record layout (fixed size, RECORD_DTYPE, little-endian, 142 bytes per game):
+    magic b"C4", format version, red player, yellow player, result, number of moves, flags,
+    start time (float64 Unix time), moves (42 x uint8 columns, padded with 255) and per-move latency (42 x uint16 ms).
+    A player is 0 for a human, otherwise 1 + its index in PLAYER_BACKENDS (the AI backend that played that side).
+    flags is a bit set: FORFEIT marks a win awarded because the loser made an illegal move (records written before
+    flags existed have 0 there, so they read as ordinary results).
+
+Every record has the same size, so a log file is a plain array of records: the loader memory-maps it and views it with
+np.frombuffer, with no per-game Python work. A record cut short by a crash only loses that game (the tail is ignored).
+
+    - GameRecorder collects the moves of the game in progress and hands the finished record to a RecordWriter.
+    - RecordWriter appends records from a background thread, in buffered writes, so the frame loop never waits on disk.
+    - load_records / to_boards / move_sequences turn any number of logs into (N,) records, (N, 6, 7) boards and
+      (N, 42) move arrays, replaying all the games together one ply at a time.
+
+Logs go to CONNECT4_RECORDS_DIR (default ~/.connect4_games), one file per process: games-<date>-<pid>.c4rec.
+"""
+import glob
+import mmap
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .constants import ROWS, COLS, PLAYER_RED, PLAYER_YELLOW
+
+RECORD_MAGIC = b"C4"
+RECORD_VERSION = 1
+MAX_MOVES = ROWS * COLS
+NO_MOVE = 255 # Padding after the last move
+RECORD_DTYPE = np.dtype([
+    ("magic", "S2"),
+    ("version", "u1"),
+    ("red", "u1"),
+    ("yellow", "u1"),
+    ("result", "u1"),
+    ("length", "u1"),
+    ("flags", "u1"),
+    ("started", "<f8"),
+    ("moves", "u1", (MAX_MOVES,)),
+    ("latency_ms", "<u2", (MAX_MOVES,)),
+])
+RECORD_EXTENSION = ".c4rec"
+
+# Player codes. Only append to PLAYER_BACKENDS: the index of a name is stored in the logs.
+HUMAN = 0
+PLAYER_BACKENDS = ("llm", "negamax", "parallel", "mcts", "random")
+UNKNOWN_PLAYER = 255
+
+# Results (the winner's player id, or one of these)
+DRAW = 0
+ABANDONED = 3 # Reset or closed before the end
+
+# Flag bits
+FORFEIT = 1 # The winner won because the other player made an illegal move (not on the board)
+
+DEFAULT_RECORDS_DIR = os.path.join(os.path.expanduser("~"), ".connect4_games")
+FLUSH_INTERVAL = 1.0 # Seconds a record may wait in the writer's buffer
+BUFFER_SIZE = 64 * 1024 # Bytes buffered before a write
+
+
+def player_code(name: str) -> int:
+    """Code of a player name: 'human' or an AI backend name."""
+    if name == "human":
+        return HUMAN
+    return PLAYER_BACKENDS.index(name) + 1 if name in PLAYER_BACKENDS else UNKNOWN_PLAYER
+
+
+def player_name(code: int) -> str:
+    if code == HUMAN:
+        return "human"
+    return PLAYER_BACKENDS[code - 1] if 0 < code <= len(PLAYER_BACKENDS) else "unknown"
+
+
+def encode_record(red: str, yellow: str, moves: list, latencies: list, result: int, started: float,
+                  flags: int = 0) -> bytes:
+    """Packs one game into a RECORD_DTYPE record. latencies are in seconds, one per move."""
+    record = np.zeros((), dtype=RECORD_DTYPE)
+    record["magic"], record["version"] = RECORD_MAGIC, RECORD_VERSION
+    record["red"], record["yellow"] = player_code(red), player_code(yellow)
+    record["result"], record["length"], record["flags"], record["started"] = result, len(moves), flags, started
+    record["moves"] = NO_MOVE
+    record["moves"][:len(moves)] = moves
+    record["latency_ms"][:len(moves)] = np.minimum(np.round(np.asarray(latencies, dtype=np.float64) * 1000), 65535)
+    return record.tobytes()
+
+
+class RecordWriter:
+    """Appends encoded records to a log file from a background thread. write() only queues the bytes."""
+
+    def __init__(self, directory: str = None, flush_interval: float = FLUSH_INTERVAL, buffer_size: int = BUFFER_SIZE):
+        self.directory = directory or os.environ.get('CONNECT4_RECORDS_DIR') or DEFAULT_RECORDS_DIR
+        self.path = os.path.join(self.directory, f"games-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}{RECORD_EXTENSION}")
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.records_written = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="record-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, record: bytes):
+        self._queue.put(record)
+
+    def _run(self):
+        buffer, file = bytearray(), None
+        deadline = None # When the oldest buffered record must be written
+        closing = False
+        while not closing:
+            try:
+                record = self._queue.get(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                record = b""
+            if record is None:
+                closing = True
+            elif record:
+                buffer += record
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if buffer and (closing or len(buffer) >= self.buffer_size or time.monotonic() >= deadline):
+                try:
+                    if file is None:
+                        os.makedirs(self.directory, exist_ok=True)
+                        file = open(self.path, "ab")
+                    file.write(buffer)
+                    file.flush()
+                    self.records_written += len(buffer) // RECORD_DTYPE.itemsize
+                except OSError as e:
+                    print(f"Could not write game records to {self.path}: {e}")
+                buffer.clear()
+                deadline = None
+        if file is not None:
+            file.close()
+
+    def close(self):
+        """Writes out everything queued and stops the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+class GameRecorder:
+    """Collects the moves of the game in progress. Per-move latency is the time since the previous move by default."""
+
+    def __init__(self, writer: RecordWriter):
+        self.writer = writer
+        self.red = self.yellow = "human"
+        self.moves = []
+        self.latencies = []
+        self.started = 0.0
+        self._last_move = 0.0
+
+    def start(self, red: str = "human", yellow: str = "human"):
+        """Starts a new game. A game in progress is recorded as abandoned."""
+        self.abandon()
+        self.red, self.yellow = red, yellow
+        self.moves, self.latencies = [], []
+        self.started = time.time()
+        self._last_move = time.perf_counter()
+
+    def record_move(self, col: int, latency: float = None):
+        now = time.perf_counter()
+        self.moves.append(col)
+        self.latencies.append(now - self._last_move if latency is None else latency)
+        self._last_move = now
+
+    def finish(self, result: int):
+        """Ends the game with result (the winner's player id, DRAW or ABANDONED) and queues its record."""
+        if self.moves:
+            self.writer.write(encode_record(self.red, self.yellow, self.moves, self.latencies, result, self.started))
+        self.moves, self.latencies = [], []
+
+    def abandon(self):
+        self.finish(ABANDONED)
+
+
+# --- Loading ---
+
+def _map_file(path: str) -> np.ndarray:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < RECORD_DTYPE.itemsize:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # The array keeps the mapping alive; a partial record at the end is left out
+    return np.frombuffer(mm, dtype=RECORD_DTYPE, count=size // RECORD_DTYPE.itemsize)
+
+
+def load_records(path: str = None) -> np.ndarray:
+    """
+    Loads a log file, or every log in a directory (default: the records directory), as one (N,) RECORD_DTYPE array.
+    A single file is returned as a read-only view of the mapped file; several files are concatenated.
+    A path that does not exist (e.g. no game has been recorded yet) gives an empty array.
+    """
+    path = path or os.environ.get('CONNECT4_RECORDS_DIR') or DEFAULT_RECORDS_DIR
+    if not os.path.exists(path):
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    files = sorted(glob.glob(os.path.join(path, "*" + RECORD_EXTENSION))) if os.path.isdir(path) else [path]
+    arrays = [_map_file(file) for file in files]
+    records = arrays[0] if len(arrays) == 1 else np.concatenate(arrays or [np.zeros(0, dtype=RECORD_DTYPE)])
+    played = np.arange(MAX_MOVES) < records["length"][:, None]
+    valid = ((records["magic"] == RECORD_MAGIC) & (records["length"] <= MAX_MOVES)
+             & ((records["moves"] < COLS) | ~played).all(axis=1))
+    return records if valid.all() else records[valid]
+
+
+def move_sequences(records: np.ndarray) -> np.ndarray:
+    """(N, 42) int8 array of the columns played, -1 after the last move. Row i of .tolist() is a move list."""
+    moves = records["moves"].astype(np.int8)
+    moves[np.arange(MAX_MOVES) >= records["length"][:, None]] = -1
+    return moves
+
+
+def to_boards(records: np.ndarray, plies=None) -> np.ndarray:
+    """
+    Replays the games into (N, 6, 7) int8 gameplay matrices (row 0 = top row, 1 = Red, 2 = Yellow).
+    plies (an int or an (N,) array) stops each game after that many moves; by default games are replayed to the end.
+    All games advance together, one vectorised step per ply.
+    """
+    n = len(records)
+    moves = records["moves"].astype(np.intp)
+    lengths = records["length"].astype(np.intp)
+    if plies is not None:
+        lengths = np.minimum(lengths, plies)
+    boards = np.zeros((n, ROWS, COLS), dtype=np.int8)
+    heights = np.zeros((n, COLS), dtype=np.intp)
+    games = np.arange(n)
+    for ply in range(int(lengths.max(initial=0))):
+        playing = games[lengths > ply]
+        cols = moves[playing, ply]
+        boards[playing, ROWS - 1 - heights[playing, cols], cols] = PLAYER_RED if ply % 2 == 0 else PLAYER_YELLOW
+        heights[playing, cols] += 1
+    return boards
+
+
+def latency_summary(records: np.ndarray) -> dict:
+    """Per-move latency percentiles (ms) for every player type found in the records: {name: {count, p50, p95, p99}}."""
+    summary = {}
+    played = np.arange(MAX_MOVES) < records["length"][:, None]
+    red_moves = played & (np.arange(MAX_MOVES) % 2 == 0)
+    for side, side_moves in (("red", red_moves), ("yellow", played & ~red_moves)):
+        for code in np.unique(records[side]):
+            latencies = records["latency_ms"][(records[side] == code)[:, None] & side_moves]
+            if len(latencies):
+                entry = summary.setdefault(player_name(int(code)), [])
+                entry.append(latencies)
+    for name, parts in summary.items():
+        latencies = np.concatenate(parts)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        summary[name] = {"count": len(latencies), "p50": float(p50), "p95": float(p95), "p99": float(p99)}
+    return summary
@@ -0,0 +1,343 @@
+"""
+This module provides a headless asyncio game server: many concurrent games in one process, played over a line protocol
+on a local TCP port or Unix socket, with the AI moves of all games computed together in batches.
+
+    - Each game uses the pure GameState rules (the rules the pygame Board is built on), so no window is needed.
+    - AI requests for the 'batch' backend (flat Monte Carlo) from every game go into one MoveBatcher. It waits a few
+      milliseconds (BATCH_WINDOW) for requests to collect, then answers the whole batch in one call on a worker thread:
+      opening book first, identical positions computed once, the rest in a single vectorised rollout_batch call.
+      Its answers are not put in the move cache: a few dozen random playouts are too noisy to keep for good.
+    - While a batch is being computed new requests queue up, so batches grow with the load.
+    - The other backends never wait behind a batch: 'llm' requests are sent concurrently from a thread pool, and the
+      local engines (which share one search object each) run one at a time on their own thread.
+    - Sessions, games, queue depth and per-batch latency are available with the STATS command and printed periodically.
+
+Protocol: one ASCII command per line, one reply line per command (ERR <reason> on a bad command, including a line that
+is not ASCII or longer than the stream limit of 64 KiB; the connection stays usable).
+    NEW [opponent] [first|second]   -> GAME <id> [ai column]    opponent: an AI backend (default) or 'human', in which
+                                                                 case the client plays both colours. 'second' lets the
+                                                                 AI open; its first move is in the reply.
+    PLAY <id> <column>              -> MOVE <id> <row> <column> <ai row> <ai column> <status>   (ai row/column are -
+                                       when the AI did not move). status: ONGOING, RED, YELLOW (the winner) or DRAW.
+    BOARD <id>                      -> BOARD <id> <status> <42 digits, top row first>
+    END <id>                        -> ENDED <id>
+    STATS                           -> STATS key=value ...
+    QUIT                            -> BYE, then the connection is closed
+"""
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .constants import PLAYER_RED, PLAYER_YELLOW
+from .game_state import GameState, PLAYER_COLORS
+from .bitboard import BitBoard, position_key
+from . import ai
+from .mcts import flat_batch_moves
+from .opening_book import get_opening_book
+from .instrumentation import metrics
+
+BATCH_WINDOW = 0.005 # Seconds to wait for more requests before computing a batch
+MAX_BATCH = 512
+BACKLOG = 4096 # Pending connections, so a burst of thousands of clients is not refused
+REMOTE_CONCURRENCY = 16 # Remote requests in flight at the same time
+DEFAULT_BACKEND = "batch"
+SERVER_BACKENDS = (DEFAULT_BACKEND,) + tuple(ai.BACKENDS)
+STATUS_NAMES = {PLAYER_RED: "RED", PLAYER_YELLOW: "YELLOW"}
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class MoveBatcher:
+    """
+    Collects 'batch' backend move requests from all games and answers them in batches on one worker thread.
+    Requests for the other backends are computed on their own executors as they arrive.
+    """
+
+    def __init__(self, window: float = BATCH_WINDOW, max_batch: int = MAX_BATCH, seed: int = None):
+        self.window = window
+        self.max_batch = max_batch
+        self.rng = np.random.default_rng(seed)
+        self.pending = [] # (backend, gameplay matrix, valid moves, future)
+        self.batches = 0
+        self.requests = 0
+        self.computed = 0 # Batched positions actually computed (after the book and de-duplication)
+        self.largest_batch = 0
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="move-batch")
+        self._remote = ThreadPoolExecutor(max_workers=REMOTE_CONCURRENCY, thread_name_prefix="remote-move")
+        # One thread: the local engines keep their search state (transposition table, tree) in one shared object
+        self._local = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-move")
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.pending)
+
+    async def get_move(self, backend: str, state: GameState) -> int:
+        start = time.perf_counter()
+        if backend == DEFAULT_BACKEND:
+            future = asyncio.get_running_loop().create_future()
+            self.pending.append((backend, state.gameplay.copy(), state.valid_moves(), future))
+            self._wakeup.set()
+            col = await future
+        else:
+            executor = self._remote if backend == "llm" else self._local
+            try:
+                col = await asyncio.get_running_loop().run_in_executor(
+                    executor, self._compute_one, backend, state.gameplay.copy(), state.valid_moves())
+            except Exception as e:
+                print(f"An error occurred while computing an AI move: {e}")
+                col = -1
+        metrics.record("server.ai_reply", time.perf_counter() - start)
+        return col
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            if len(self.pending) < self.max_batch:
+                await asyncio.sleep(self.window) # Let requests from other games join the batch
+            batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+            if not self.pending:
+                self._wakeup.clear()
+            start = time.perf_counter()
+            try:
+                moves = await loop.run_in_executor(self._executor, self._compute, [request[:3] for request in batch])
+            except Exception as e:
+                print(f"An error occurred while computing a batch of AI moves: {e}")
+                moves = [-1] * len(batch)
+            metrics.record("server.batch", time.perf_counter() - start)
+            self.batches += 1
+            self.requests += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for (_, _, _, future), col in zip(batch, moves):
+                if not future.done():
+                    future.set_result(col)
+
+    def _compute(self, requests: list) -> list:
+        """Runs on the worker thread. requests: (backend, gameplay matrix, valid moves). Returns one column each."""
+        moves = [-1] * len(requests)
+        book = get_opening_book()
+        unique = {} # position key -> indices of the requests for that position
+        boards = {}
+        for i, (_, gameplay, valid_moves) in enumerate(requests):
+            board = BitBoard.from_matrix(gameplay)
+            col = book.lookup(board, valid_moves) if book is not None else None
+            if col is not None:
+                moves[i] = col
+                continue
+            key = position_key(*board.position_and_mask())
+            unique.setdefault(key, []).append(i)
+            boards[key] = board
+        self.computed += len(unique)
+        # One vectorised call for every position of the batch
+        answers = flat_batch_moves([boards[key] for key in unique], rng=self.rng)
+        for indices, col in zip(unique.values(), answers):
+            for i in indices:
+                moves[i] = col
+        return moves
+
+    @staticmethod
+    def _compute_one(backend: str, gameplay, valid_moves: list) -> int:
+        """Runs on the remote or local executor. The backends go through the move cache themselves."""
+        book = get_opening_book() if ai.uses_book(backend) else None
+        col = book.lookup(BitBoard.from_matrix(gameplay), valid_moves) if book is not None else None
+        return ai.BACKENDS[backend](gameplay, valid_moves) if col is None else col
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._remote.shutdown(wait=False, cancel_futures=True)
+        self._local.shutdown(wait=False, cancel_futures=True)
+
+
+async def read_line(reader: asyncio.StreamReader):
+    """
+    Returns the next line (b"" at the end of the stream), or None for a line longer than the reader's limit, which is
+    read and thrown away up to its newline so the next command starts cleanly.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as e:
+        return e.partial # Last line without a newline, or b"" at the end
+    except asyncio.LimitOverrunError as e:
+        consumed = e.consumed
+    while True:
+        await reader.readexactly(consumed) # Bytes before the newline (or all of them if it has not arrived yet)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+
+
+class ServerGame:
+
+    __slots__ = ("id", "state", "opponent", "ai_player", "status")
+
+    def __init__(self, game_id: int, opponent: str, ai_player: int):
+        self.id = game_id
+        self.state = GameState()
+        self.opponent = opponent # AI backend name, or 'human'
+        self.ai_player = ai_player # Player id the AI plays, 0 when the client plays both colours
+        self.status = "ONGOING"
+
+    def play(self, col: int):
+        """Drops a piece for the player to move and updates the status. Returns (row, col)."""
+        player = self.state.current_player()
+        row, col = self.state.drop_piece(col, PLAYER_COLORS[player])
+        if self.state.check_win(row, col):
+            self.status = STATUS_NAMES[player]
+        elif self.state.is_draw():
+            self.status = "DRAW"
+        return row, col
+
+
+class GameServer:
+
+    def __init__(self, backend: str = DEFAULT_BACKEND, batcher: MoveBatcher = None):
+        if backend not in SERVER_BACKENDS:
+            raise ValueError(f"Unknown AI backend '{backend}'. Available backends: {', '.join(SERVER_BACKENDS)}")
+        self.backend = backend
+        self.batcher = batcher or MoveBatcher()
+        self.games = {}
+        self.sessions = 0
+        self.total_sessions = 0
+        self.finished_games = 0
+        self.moves = 0
+        self.started = time.perf_counter()
+        self._ids = itertools.count(1)
+        self._batch_task = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, unix_path: str = None):
+        """Starts listening (on unix_path if given, otherwise host:port) and returns the asyncio server."""
+        self._batch_task = asyncio.ensure_future(self.batcher.run())
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle, path=unix_path, backlog=BACKLOG)
+        return await asyncio.start_server(self.handle, host, port, backlog=BACKLOG)
+
+    def stop(self):
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+        self.batcher.shutdown()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves one connection. Its games are dropped when it closes."""
+        self.sessions += 1
+        self.total_sessions += 1
+        owned = set()
+        try:
+            while True:
+                line = await read_line(reader)
+                if line == b"":
+                    break
+                try:
+                    if line is None:
+                        raise ProtocolError("line too long")
+                    try:
+                        words = line.decode("ascii").split()
+                    except UnicodeDecodeError:
+                        raise ProtocolError("commands must be ASCII") from None
+                    if not words:
+                        continue
+                    if words[0].upper() == "QUIT":
+                        writer.write(b"BYE\n")
+                        break
+                    reply = await self.command(words, owned)
+                except ProtocolError as e:
+                    reply = f"ERR {e}"
+                except (ValueError, UnicodeError) as e:
+                    reply = f"ERR bad request ({e})"
+                # Replies echo parts of the command, so anything unexpected becomes '?' rather than an error
+                writer.write(reply.encode("ascii", "replace") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.sessions -= 1
+            for game_id in owned:
+                self.games.pop(game_id, None)
+            writer.close()
+
+    async def command(self, words: list, owned: set) -> str:
+        name, args = words[0].upper(), words[1:]
+        if name == "NEW":
+            opponent = args[0] if args else self.backend
+            if opponent != "human" and opponent not in SERVER_BACKENDS:
+                raise ProtocolError(f"unknown opponent '{opponent}'")
+            order = args[1].lower() if len(args) > 1 else "first"
+            if order not in ("first", "second"):
+                raise ProtocolError("order must be 'first' or 'second'")
+            ai_player = 0 if opponent == "human" else (PLAYER_YELLOW if order == "first" else PLAYER_RED)
+            game = ServerGame(next(self._ids), opponent, ai_player)
+            self.games[game.id] = game
+            owned.add(game.id)
+            if ai_player == PLAYER_RED:
+                _, col = await self._ai_move(game)
+                return f"GAME {game.id} {col}"
+            return f"GAME {game.id}"
+        if name == "STATS":
+            return "STATS " + " ".join(f"{key}={value}" for key, value in self.stats().items())
+        if name not in ("PLAY", "BOARD", "END") or not args:
+            raise ProtocolError(f"unknown command '{' '.join(words)}'")
+        game = self.games.get(int(args[0])) if args[0].isdigit() else None
+        if game is None or game.id not in owned:
+            raise ProtocolError(f"no game {args[0]}")
+        if name == "BOARD":
+            cells = "".join(str(int(cell)) for cell in game.state.gameplay.flat)
+            return f"BOARD {game.id} {game.status} {cells}"
+        if name == "END":
+            owned.discard(game.id)
+            del self.games[game.id]
+            return f"ENDED {game.id}"
+
+        # PLAY
+        if game.status != "ONGOING":
+            raise ProtocolError("game is over")
+        if game.state.current_player() == game.ai_player:
+            raise ProtocolError("not your turn")
+        if len(args) < 2 or not args[1].isdigit() or int(args[1]) not in game.state.valid_moves():
+            raise ProtocolError("invalid column")
+        row, col = game.play(int(args[1]))
+        self.moves += 1
+        ai_row, ai_col = "-", "-"
+        if game.status == "ONGOING" and game.ai_player:
+            ai_row, ai_col = await self._ai_move(game)
+        if game.status != "ONGOING":
+            self.finished_games += 1
+        return f"MOVE {game.id} {row} {col} {ai_row} {ai_col} {game.status}"
+
+    async def _ai_move(self, game: ServerGame):
+        valid_moves = game.state.valid_moves()
+        col = await self.batcher.get_move(game.opponent, game.state)
+        if col not in valid_moves:
+            # --- Safeguard --- like ai.get_llm_move, a failed backend never stalls the game
+            col = int(np.random.choice(valid_moves))
+        self.moves += 1
+        return game.play(col)
+
+    def stats(self) -> dict:
+        batcher = self.batcher
+        batch, reply = metrics.histogram("server.batch"), metrics.histogram("server.ai_reply")
+        elapsed = time.perf_counter() - self.started
+        return {
+            "sessions": self.sessions,
+            "total_sessions": self.total_sessions,
+            "games": len(self.games),
+            "finished_games": self.finished_games,
+            "moves": self.moves,
+            "moves_per_sec": round(self.moves / elapsed, 1) if elapsed else 0.0,
+            "queue": batcher.queue_depth,
+            "batches": batcher.batches,
+            "avg_batch": round(batcher.requests / batcher.batches, 1) if batcher.batches else 0.0,
+            "max_batch": batcher.largest_batch,
+            "computed": batcher.computed,
+            "batch_p50_ms": round(1000 * batch.percentile(50), 2),
+            "batch_p95_ms": round(1000 * batch.percentile(95), 2),
+            "reply_p50_ms": round(1000 * reply.percentile(50), 2),
+            "reply_p95_ms": round(1000 * reply.percentile(95), 2),
+            "reply_p99_ms": round(1000 * reply.percentile(99), 2),
+        }
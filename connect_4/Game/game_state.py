@@ -0,0 +1,94 @@
+"""
+This module defines the GameState class: the Connect 4 rules (dropping pieces, checking for a win, computing the valid moves)
+without any pygame dependency. It is shared by the pygame Board, the headless self-play runner and any search code.
+The state is held in a compact bitboard (see bitboard.py); the gameplay and scorecard tracking matrices
+are computed on demand from it, so existing consumers such as draw_matrix_info and get_ai_move keep working unchanged.
+The bitboard keeps a move stack, so undo_move takes a move back exactly and look-ahead code can make/unmake moves on
+one state instead of deep-copying it; copy() is cheap and shares nothing mutable.
+"""
+from .constants import RED, YELLOW, PLAYER_RED, PLAYER_YELLOW
+from .bitboard import BitBoard
+from .b_algorithm import scorecard_from_bitboard, tracking_matrices_from_bitboards
+
+# Maps gameplay matrix player ids to piece colours
+PLAYER_COLORS = {PLAYER_RED: RED, PLAYER_YELLOW: YELLOW}
+
+class GameState:
+
+    __slots__ = ("state",)
+
+    def __init__(self):
+        # initialize an empty board: two player bitboards plus per-column heights
+        self.state = BitBoard()
+
+    # The tracking matrices are views computed from the bitboards whenever they are requested.
+    @property
+    def gameplay(self):
+        return tracking_matrices_from_bitboards(self.state.pieces[PLAYER_RED], self.state.pieces[PLAYER_YELLOW])[0]
+
+    @property
+    def red_scorecard(self):
+        return scorecard_from_bitboard(self.state.pieces[PLAYER_RED])
+
+    @property
+    def yellow_scorecard(self):
+        return scorecard_from_bitboard(self.state.pieces[PLAYER_YELLOW])
+
+    def valid_moves(self):
+        """Returns the list of columns that are not full."""
+        return self.state.valid_moves()
+
+    def drop_piece(self, col, piece_color):
+        """
+        Drops a piece of a given color into the specified column.
+        Returns the (row, col) of the move if successful, otherwise None.
+        """
+        player_id = PLAYER_RED if piece_color == RED else PLAYER_YELLOW
+        row = self.state.play(col, player_id) # O(1): uses the column height counter instead of scanning the column
+        if row is None:
+            return None  # Indicates the column is full
+        return row, col  # Return the position of the new piece
+
+    def undo_move(self):
+        """
+        Takes back the last move, restoring the state exactly.
+        Returns the (row, col) that was emptied, or None if no move has been played.
+        """
+        move = self.state.undo()
+        if move is None:
+            return None
+        return move[0], move[1]
+
+    def copy(self):
+        """Independent copy of the state, for look-ahead that wants to keep the original untouched."""
+        game = object.__new__(type(self))
+        game.state = self.state.copy()
+        return game
+
+    def check_win(self, row, col):
+        """Checks for a win from the last piece dropped."""
+        player_id = self.state.cell(row, col)
+        if player_id == 0:
+            return None
+
+        # Shift-and-mask check on the player's bitboard
+        if self.state.is_win(player_id):
+            return player_id # Return the winning player's ID
+
+        return None # No winner
+
+    def current_player(self):
+        """Returns the id of the player to move (Red always opens)."""
+        return self.state.player_to_move()
+
+    def is_draw(self):
+        """The board is full and nobody has won."""
+        return self.state.is_full() and not (self.state.is_win(PLAYER_RED) or self.state.is_win(PLAYER_YELLOW))
+
+    @classmethod
+    def from_moves(cls, moves):
+        """Builds a state by dropping a sequence of columns, alternating Red and Yellow starting with Red."""
+        game = cls()
+        for col in moves:
+            game.drop_piece(col, PLAYER_COLORS[game.current_player()])
+        return game
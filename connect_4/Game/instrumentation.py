@@ -0,0 +1,178 @@
+"""
+This module provides lightweight, always-available performance instrumentation, replacing ad-hoc cProfile dumps.
+
+    - timed(name) wraps a function and records its wall time.
+    - Samples go into fixed-size log-scale histograms (constant memory, O(1) per sample), from which
+      p50/p95/p99 are read at any time. This is cheap enough to leave on in production.
+    - FrameTimer splits each frame of the main loop into phases (events, update, draw, present).
+    - metrics.export(path) writes every histogram as JSON or CSV (chosen by the file extension).
+
+Set CONNECT4_METRICS=0 to disable collection: functions decorated while disabled are returned unwrapped, so they cost
+nothing at all, and the frame timer returns straight away.
+"""
+import csv
+import json
+import math
+import os
+import threading
+import time
+from functools import wraps
+
+# Log-scale buckets: BUCKETS_PER_DECADE buckets per power of ten from MIN_SECONDS, about 12% resolution
+BUCKETS_PER_DECADE = 20
+MIN_SECONDS = 1e-7
+DECADES = 9 # 100 ns .. 100 s
+NUM_BUCKETS = BUCKETS_PER_DECADE * DECADES + 1
+PERCENTILES = (50, 95, 99)
+METRICS_ENABLED = os.environ.get('CONNECT4_METRICS', '1') != '0'
+
+
+class Histogram:
+    """Latency histogram with log-scale buckets. Percentiles are accurate to one bucket (about 12%)."""
+
+    __slots__ = ("name", "counts", "count", "total", "max")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        if seconds > MIN_SECONDS:
+            index = min(NUM_BUCKETS - 1, int(math.log10(seconds / MIN_SECONDS) * BUCKETS_PER_DECADE) + 1)
+        else:
+            index = 0
+        # Not locked: under the GIL a sample recorded from two threads at once can at worst be lost, never corrupt the state
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile sample, in seconds (capped at the observed maximum)."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.max, MIN_SECONDS * 10 ** (index / BUCKETS_PER_DECADE))
+        return self.max
+
+    def summary(self) -> dict:
+        """Count, mean, percentiles and max of the samples, times in milliseconds."""
+        result = {"count": self.count, "mean_ms": 1000 * self.total / self.count if self.count else 0.0}
+        for p in PERCENTILES:
+            result[f"p{p}_ms"] = 1000 * self.percentile(p)
+        result["max_ms"] = 1000 * self.max
+        return result
+
+    def reset(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class Metrics:
+    """Registry of named histograms."""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> Histogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(name))
+        return histogram
+
+    def record(self, name: str, seconds: float):
+        if self.enabled:
+            self.histogram(name).record(seconds)
+
+    def summary(self) -> dict:
+        """Summary of every histogram that has samples, keyed by name."""
+        return {name: h.summary() for name, h in sorted(self._histograms.items()) if h.count}
+
+    def reset(self):
+        for histogram in self._histograms.values():
+            histogram.reset()
+
+    def export(self, path: str):
+        """Writes the summary to path: CSV if it ends in .csv, JSON otherwise."""
+        summary = self.summary()
+        if path.lower().endswith(".csv"):
+            fields = ["count", "mean_ms"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"]
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["name"] + fields)
+                for name, row in summary.items():
+                    writer.writerow([name] + [row[field] for field in fields])
+        else:
+            with open(path, "w") as f:
+                json.dump(summary, f, indent=2)
+
+    def report_lines(self, names=None) -> list:
+        """One formatted line per histogram (for the on-screen overlay and console reports)."""
+        summary = self.summary()
+        lines = []
+        for name in names or summary:
+            row = summary.get(name)
+            if row is not None:
+                lines.append(f"{name:<18} {row['p50_ms']:7.2f} {row['p95_ms']:7.2f} {row['p99_ms']:7.2f}")
+        return lines
+
+
+# Shared registry used by every timer in the game
+metrics = Metrics()
+
+
+def timed(name: str):
+    """Decorator recording the wall time of every call of the function under name."""
+    def decorator(func):
+        if not metrics.enabled:
+            return func # Zero cost when instrumentation is off
+        histogram = metrics.histogram(name)
+        clock = time.perf_counter
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if metrics.enabled:
+                    histogram.record(clock() - start)
+        return wrapper
+    return decorator
+
+
+class FrameTimer:
+    """
+    Per-frame time breakdown for the main loop: call start() when a frame begins, mark(phase) at the end of each phase,
+    then end(). Every phase is recorded as frame.<phase> and the whole frame as frame.total.
+    """
+
+    def __init__(self):
+        self._start = self._last = 0.0
+
+    def start(self):
+        if metrics.enabled:
+            self._start = self._last = time.perf_counter()
+
+    def mark(self, phase: str):
+        if metrics.enabled:
+            now = time.perf_counter()
+            metrics.histogram("frame." + phase).record(now - self._last)
+            self._last = now
+
+    def end(self):
+        if metrics.enabled:
+            metrics.histogram("frame.total").record(time.perf_counter() - self._start)
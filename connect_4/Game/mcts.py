@@ -0,0 +1,299 @@
+"""
+This module provides a Monte Carlo tree search (UCT) engine whose playouts run in batches on stacked NumPy arrays.
+
+    - Selection and expansion walk a normal UCT tree, but several leaves are selected per iteration (virtual visits keep
+      them apart) and all their playouts are advanced together: thousands of games live in uint64 bitboard and height
+      arrays, legal moves are a vectorised mask, and wins are detected with the same shift-and-mask test as bitboard.py,
+      applied to the whole batch at once. There is no Python loop over individual games.
+    - Playouts are random or lightly guided (take an immediate win, otherwise block the opponent's immediate win).
+    - The search runs to a playout budget and/or a time budget. The engine keeps running totals of its rollouts and
+      search time, from which selfplay.py reports the rollouts per second.
+    - The tree is kept between turns: when the next position is the reply to an expanded child, that subtree becomes
+      the new root and its statistics are reused.
+    - flat_batch_moves answers many positions with one rollout_batch call (flat Monte Carlo, no tree), for servers
+      that collect AI requests from many games.
+
+Set CONNECT4_MCTS_TIME (seconds per move) and CONNECT4_MCTS_PLAYOUTS to configure the 'mcts' AI backend.
+"""
+import math
+import os
+import time
+
+import numpy as np
+
+from .constants import ROWS, COLS, PLAYER_RED, PLAYER_YELLOW
+from .bitboard import BitBoard, COLUMN_BITS, DIRECTIONS, position_key
+from .solver import root_candidates, immediate_win
+
+DEFAULT_TIME_BUDGET = 0.5 # seconds per move
+LEAVES_PER_BATCH = 16 # Leaves selected per iteration
+ROLLOUTS_PER_LEAF = 64 # Playouts run from each selected leaf
+FLAT_ROLLOUTS = 32 # Playouts per candidate move in flat_batch_moves
+EXPLORATION = 1.4
+
+_SHIFTS = tuple(np.uint64(shift) for shift in DIRECTIONS)
+_SHIFTS2 = tuple(np.uint64(2 * shift) for shift in DIRECTIONS)
+_COLUMN_BASE = np.arange(COLS, dtype=np.uint64) * np.uint64(COLUMN_BITS)
+_ONE = np.uint64(1)
+_ZERO = np.uint64(0)
+
+
+def has_four_batch(bits: np.ndarray) -> np.ndarray:
+    """Vectorised bitboard.has_four: True wherever the uint64 bitboard holds four connected pieces."""
+    won = np.zeros(bits.shape, dtype=bool)
+    for shift, shift2 in zip(_SHIFTS, _SHIFTS2):
+        pairs = bits & (bits >> shift)
+        won |= (pairs & (pairs >> shift2)) != _ZERO
+    return won
+
+
+def rollout_batch(red: np.ndarray, yellow: np.ndarray, heights: np.ndarray, to_move: np.ndarray,
+                  rng: np.random.Generator, guided: bool = True) -> np.ndarray:
+    """
+    Plays N games to the end at once and returns their winners (int8: 1 = Red, 2 = Yellow, 0 = draw).
+    red, yellow: (N,) uint64 player bitboards; heights: (N, COLS) pieces per column; to_move: (N,) player to move.
+    The inputs are not modified.
+    """
+    n = len(red)
+    red, yellow, heights, to_move = red.copy(), yellow.copy(), heights.astype(np.int64), to_move.astype(np.int8)
+    winners = np.zeros(n, dtype=np.int8)
+    active = np.ones(n, dtype=bool)
+    games = np.arange(n)
+    while True:
+        legal = (heights < ROWS) & active[:, None]
+        active &= legal.any(axis=1) # Full boards are draws
+        if not active.any():
+            return winners
+        scores = rng.random((n, COLS))
+        scores[~legal] = -1.0
+        move_bits = np.where(legal, _ONE << (_COLUMN_BASE + heights.astype(np.uint64)), _ZERO)
+        red_to_move = to_move == PLAYER_RED
+        own = np.where(red_to_move, red, yellow)
+        if guided:
+            # Prefer an immediate win, otherwise block the opponent's immediate win
+            opponent = np.where(red_to_move, yellow, red)
+            scores += 2.0 * (has_four_batch(opponent[:, None] | move_bits) & legal)
+            scores += 4.0 * (has_four_batch(own[:, None] | move_bits) & legal)
+        cols = scores.argmax(axis=1)
+        bit = np.where(active, move_bits[games, cols], _ZERO)
+        own |= bit
+        red = np.where(red_to_move, own, red)
+        yellow = np.where(red_to_move, yellow, own)
+        heights[games, cols] += active
+        won = active & has_four_batch(own)
+        winners[won] = to_move[won]
+        active &= ~won
+        to_move = np.where(red_to_move, PLAYER_YELLOW, PLAYER_RED).astype(np.int8)
+
+
+def flat_batch_moves(boards: list, rollouts: int = FLAT_ROLLOUTS, rng: np.random.Generator = None,
+                     guided: bool = True) -> list:
+    """
+    Flat Monte Carlo over many positions at once: every legal move of every board gets `rollouts` playouts, all run in
+    a single rollout_batch call, and each board gets the move with the best average result (-1 if it has none).
+    Used to answer a batch of AI requests from many games with one vectorised call.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    moves = [-1] * len(boards)
+    children, owners = [], [] # Position after each candidate move, and (board index, move) it belongs to
+    for i, board in enumerate(boards):
+        candidates = root_candidates(board)
+        col = immediate_win(board, candidates) if candidates else None
+        if col is not None or len(candidates) == 1:
+            moves[i] = candidates[0] if col is None else col
+            continue
+        for col in candidates:
+            child = board.copy()
+            child.play(col, child.player_to_move())
+            children.append(child)
+            owners.append((i, col))
+    if not children:
+        return moves
+
+    red = np.repeat(np.array([b.pieces[PLAYER_RED] for b in children], dtype=np.uint64), rollouts)
+    yellow = np.repeat(np.array([b.pieces[PLAYER_YELLOW] for b in children], dtype=np.uint64), rollouts)
+    heights = np.repeat(np.array([b.heights for b in children], dtype=np.int64), rollouts, axis=0)
+    to_move = np.repeat(np.array([b.player_to_move() for b in children], dtype=np.int8), rollouts)
+    winners = rollout_batch(red, yellow, heights, to_move, rng, guided).reshape(len(children), rollouts)
+    # Score for the player who made the candidate move (the opponent of the child's player to move)
+    movers = np.where(to_move[::rollouts] == PLAYER_RED, PLAYER_YELLOW, PLAYER_RED)
+    scores = (winners == movers[:, None]).sum(axis=1) + 0.5 * (winners == 0).sum(axis=1)
+    best = [-1.0] * len(boards)
+    for (i, col), score in zip(owners, scores.tolist()):
+        if score > best[i]:
+            best[i], moves[i] = score, col
+    return moves
+
+
+class Node:
+    """A tree node: the position after move was played by player."""
+
+    __slots__ = ("board", "move", "player", "parent", "children", "untried", "visits", "value", "terminal")
+
+    def __init__(self, board: BitBoard, move: int = -1, player: int = 0, parent=None):
+        self.board = board
+        self.move = move
+        self.player = player # Player who played move, i.e. whose point of view value is counted from
+        self.parent = parent
+        self.children = []
+        self.visits = 0
+        self.value = 0.0 # Sum of playout results for player: 1 win, 0.5 draw, 0 loss
+        # Terminal result for player (1.0 win, 0.5 draw) or None if the game goes on
+        if player and board.is_win(player):
+            self.terminal = 1.0
+        elif board.is_full():
+            self.terminal = 0.5
+        else:
+            self.terminal = None
+        self.untried = [] if self.terminal is not None else root_candidates(board)[::-1] # Centre columns expanded first
+
+    def uct_child(self):
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda c: c.value / c.visits + EXPLORATION * math.sqrt(log_visits / c.visits))
+
+
+class MCTSEngine:
+
+    def __init__(self, time_budget: float = DEFAULT_TIME_BUDGET, playouts: int = None, guided: bool = True,
+                 seed: int = None, stop_event=None):
+        self.time_budget = time_budget
+        self.playouts = playouts
+        self.guided = guided
+        self.rng = np.random.default_rng(seed)
+        self.root = None
+        # Optional object with is_set() (e.g. a multiprocessing.Event): when it is set the search ends at the next batch
+        self.stop_event = stop_event
+        self.stop_requested = False
+        # Statistics of the last call to best_move
+        self.last_rollouts = 0
+        self.last_reused = 0 # visits inherited from the previous search
+        # Running totals over every search, for throughput reports
+        self.total_rollouts = 0
+        self.search_seconds = 0.0
+
+    def _reuse_root(self, board: BitBoard):
+        """Returns the node of the previous tree for board (searching up to two plies down), or a fresh root."""
+        key = position_key(*board.position_and_mask())
+        if self.root is not None:
+            for child in [self.root] + self.root.children:
+                for node in [child] + child.children:
+                    if node.board.moves == board.moves and position_key(*node.board.position_and_mask()) == key:
+                        node.parent = None
+                        return node
+        return Node(board.copy())
+
+    def best_move(self, board: BitBoard, valid_moves=None, playouts=None, time_budget=None) -> int:
+        """
+        Returns the most visited root move after the search, -1 if no move is possible, or None if the search was
+        cancelled with stop() (like NegamaxSolver, a stop stays in force until clear_stop()).
+        """
+        playouts = self.playouts if playouts is None else playouts
+        time_budget = self.time_budget if time_budget is None else time_budget
+        candidates = root_candidates(board, valid_moves)
+        if not candidates:
+            return -1
+        col = immediate_win(board, candidates)
+        if col is not None or len(candidates) == 1:
+            return candidates[0] if col is None else col
+
+        if self.stop_requested:
+            return None
+        root = self.root = self._reuse_root(board)
+        self.last_reused = root.visits
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        if playouts is None and deadline is None:
+            playouts = LEAVES_PER_BATCH * ROLLOUTS_PER_LEAF
+        start, rollouts = time.perf_counter(), 0
+        while (playouts is None or rollouts < playouts) and (deadline is None or time.perf_counter() < deadline):
+            if self.stop_requested or (self.stop_event is not None and self.stop_event.is_set()):
+                break
+            rollouts += self._iterate(root)
+        elapsed = time.perf_counter() - start
+        self.last_rollouts = rollouts
+        self.total_rollouts += rollouts
+        self.search_seconds += elapsed
+        if self.stop_requested:
+            return None
+
+        allowed = [c for c in root.children if c.move in candidates]
+        if not allowed:
+            return candidates[0]
+        return max(allowed, key=lambda c: c.visits).move
+
+    def _select(self, root: Node):
+        """Walks down by UCT to a node with untried moves (expanding one) or a terminal node."""
+        node = root
+        while not node.untried and node.terminal is None:
+            node = node.uct_child()
+        if node.untried:
+            col = node.untried.pop()
+            board = node.board.copy()
+            player = board.player_to_move()
+            board.play(col, player)
+            child = Node(board, col, player, node)
+            node.children.append(child)
+            node = child
+        return node
+
+    def _iterate(self, root: Node) -> int:
+        """One batch: selects up to LEAVES_PER_BATCH leaves, plays all their rollouts together, backs the results up."""
+        leaves = []
+        for _ in range(LEAVES_PER_BATCH):
+            leaf = self._select(root)
+            # Virtual visits: count the pending rollouts now so the next selections spread to other leaves
+            node = leaf
+            while node is not None:
+                node.visits += ROLLOUTS_PER_LEAF
+                node = node.parent
+            leaves.append(leaf)
+
+        playing = [leaf for leaf in leaves if leaf.terminal is None]
+        results = {}
+        if playing:
+            boards = [leaf.board for leaf in playing]
+            red = np.repeat(np.array([b.pieces[PLAYER_RED] for b in boards], dtype=np.uint64), ROLLOUTS_PER_LEAF)
+            yellow = np.repeat(np.array([b.pieces[PLAYER_YELLOW] for b in boards], dtype=np.uint64), ROLLOUTS_PER_LEAF)
+            heights = np.repeat(np.array([b.heights for b in boards], dtype=np.int64), ROLLOUTS_PER_LEAF, axis=0)
+            to_move = np.repeat(np.array([b.player_to_move() for b in boards], dtype=np.int8), ROLLOUTS_PER_LEAF)
+            winners = rollout_batch(red, yellow, heights, to_move, self.rng, self.guided).reshape(len(playing), -1)
+            for leaf, games in zip(playing, winners):
+                # Score for the player who moved into the leaf: wins + half the draws
+                results[id(leaf)] = float(np.count_nonzero(games == leaf.player)) + 0.5 * np.count_nonzero(games == 0)
+
+        for leaf in leaves:
+            score = leaf.terminal * ROLLOUTS_PER_LEAF if leaf.terminal is not None else results[id(leaf)]
+            node = leaf
+            while node is not None:
+                node.value += score
+                score = ROLLOUTS_PER_LEAF - score # The parent's player sees the opposite result
+                node = node.parent
+        return len(leaves) * ROLLOUTS_PER_LEAF # A terminal leaf counts as its (exact) rollouts
+
+    def stop(self):
+        """Asks a search running on another thread to return None (checked between batches of playouts)."""
+        self.stop_requested = True
+
+    def clear_stop(self):
+        """Re-enables searching after stop(). Called when a new move is requested."""
+        self.stop_requested = False
+
+    def reset(self):
+        self.root = None
+
+
+_engine = None
+
+def get_engine() -> MCTSEngine:
+    """Returns the shared MCTS engine configured from the environment, created on first use."""
+    global _engine
+    if _engine is None:
+        playouts = os.environ.get('CONNECT4_MCTS_PLAYOUTS')
+        _engine = MCTSEngine(float(os.environ.get('CONNECT4_MCTS_TIME') or DEFAULT_TIME_BUDGET),
+                             int(playouts) if playouts else None)
+    return _engine
+
+
+def get_ai_move(gameplay_matrix, valid_moves: list, playouts=None, time_budget=None) -> int:
+    """MCTS counterpart of solver.get_ai_move."""
+    board = BitBoard.from_matrix(gameplay_matrix)
+    return get_engine().best_move(board, valid_moves, playouts, time_budget)
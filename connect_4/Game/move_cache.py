@@ -0,0 +1,139 @@
+"""
+This module provides a persistent, symmetry-aware cache of AI moves stored in SQLite, replacing the in-process
+128-entry lru_cache. Answers survive restarts, so repeat openings that were already paid for once are free.
+
+    - Positions are keyed by BitBoard.canonical_key(): a compact 49-bit integer in which left-right mirror images
+      are folded together. A move cached for one position is returned (mirrored) for its mirror image.
+    - Entries are kept per backend, since the LLM and the local engine can disagree.
+    - Only validated answers should be stored: callers put() a move only when the backend produced a legal column itself,
+      never a random fallback.
+    - Eviction is configurable: 'lru' (least recently used), 'fifo' (oldest insert) or 'none' (grow without limit).
+
+Configuration (environment variables): CONNECT4_CACHE_PATH, CONNECT4_CACHE_SIZE, CONNECT4_CACHE_POLICY.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from .constants import COLS
+from .bitboard import BitBoard
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".connect4_move_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 1_000_000
+EVICTION_POLICIES = ("lru", "fifo", "none")
+# Fraction of max_entries removed in one go when the cache is full, so eviction is not paid on every insert
+EVICTION_BATCH = 0.05
+
+
+class MoveCache:
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES, policy: str = "lru"):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}'. Available policies: {', '.join(EVICTION_POLICIES)}")
+        self.path = path
+        self.max_entries = max_entries
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        # The AI worker thread and the main thread share one connection, guarded by a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS moves ("
+            " backend TEXT NOT NULL, key INTEGER NOT NULL, col INTEGER NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL,"
+            " PRIMARY KEY (backend, key)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS moves_last_used ON moves (last_used)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS moves_created ON moves (created)")
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM moves").fetchone()[0]
+
+    def get(self, backend: str, board: BitBoard, valid_moves=None):
+        """Returns the cached column for board (mapped back through the mirror if needed), or None on a miss."""
+        key, mirrored = board.canonical_key()
+        with self._lock:
+            row = self._conn.execute("SELECT col FROM moves WHERE backend = ? AND key = ?", (backend, key)).fetchone()
+            if row is not None and self.policy == "lru":
+                self._conn.execute("UPDATE moves SET last_used = ? WHERE backend = ? AND key = ?", (time.time(), backend, key))
+                self._conn.commit()
+            col = None
+            if row is not None:
+                col = COLS - 1 - row[0] if mirrored else row[0]
+                if not board.can_play(col) or (valid_moves is not None and col not in valid_moves):
+                    col = None # Never hand back an illegal move, even from a damaged cache file
+            if col is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return col
+
+    def put(self, backend: str, board: BitBoard, col: int):
+        """Stores a validated move for board."""
+        key, mirrored = board.canonical_key()
+        stored = COLS - 1 - col if mirrored else col
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO moves (backend, key, col, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (backend, key, stored, now, now))
+            self._entries += 1 # Upper bound: a replaced entry is counted again until the next recount
+            if self.policy != "none" and self._entries > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM moves").fetchone()[0]
+        if self._entries <= self.max_entries:
+            return
+        order = "last_used" if self.policy == "lru" else "created"
+        count = max(1, int(self.max_entries * EVICTION_BATCH)) + self._entries - self.max_entries
+        self._conn.execute(
+            f"DELETE FROM moves WHERE (backend, key) IN (SELECT backend, key FROM moves ORDER BY {order} LIMIT ?)", (count,))
+        self._entries -= self._conn.execute("SELECT changes()").fetchone()[0]
+
+    def __len__(self):
+        return self._entries
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM moves")
+            self._conn.commit()
+            self._entries = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_disabled = False
+
+def get_move_cache():
+    """
+    Returns the shared cache configured from the environment (opened on first use), or None if disabled.
+    If the cache file cannot be opened (e.g. a read-only home directory) caching is turned off with a warning, so the
+    AI keeps working without it.
+    """
+    global _cache, _cache_disabled
+    if _cache is None and not _cache_disabled:
+        path = os.environ.get('CONNECT4_CACHE_PATH') or DEFAULT_CACHE_PATH
+        try:
+            _cache = MoveCache(
+                path,
+                int(os.environ.get('CONNECT4_CACHE_SIZE') or DEFAULT_MAX_ENTRIES),
+                os.environ.get('CONNECT4_CACHE_POLICY') or "lru",
+            )
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: could not open the move cache at {path} ({e}). Moves will not be cached.")
+            _cache_disabled = True
+    return _cache
+
+def set_move_cache(cache):
+    """Replaces the shared cache. Passing None disables caching (e.g. when evaluating engine changes)."""
+    global _cache, _cache_disabled
+    _cache = cache
+    _cache_disabled = cache is None
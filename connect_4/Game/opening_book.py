@@ -0,0 +1,155 @@
+"""
+This module provides a precomputed opening book: the best move for every position up to a configurable number of plies,
+computed once by the local solver and stored in a compact sorted binary file. The file is memory-mapped at startup and
+searched with a binary search on the packed board key, so a lookup takes microseconds and the book adds almost nothing
+to startup time or resident memory (pages are only read when touched).
+
+File layout (little-endian):
+    header  : magic b"C4BOOK01", uint32 entry count, uint32 max ply, uint32 search depth, uint32 reserved
+    keys    : count x uint64, sorted ascending, BitBoard.canonical_key() of each position (mirror images folded together)
+    moves   : count x uint8, the best column for the position with the matching key
+
+The book is built with build_opening_book.py.
+"""
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from .constants import COLS
+from .bitboard import BitBoard
+
+BOOK_MAGIC = b"C4BOOK01"
+HEADER = struct.Struct("<8sIIII")
+KEY = struct.Struct("<Q")
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+
+class OpeningBook:
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.max_ply, self.depth, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != BOOK_MAGIC or len(self._mm) != HEADER.size + 9 * self.count:
+            self._mm.close()
+            raise ValueError(f"{path} is not a valid opening book file")
+        self._moves_offset = HEADER.size + 8 * self.count
+
+    def _find(self, key: int) -> int:
+        """Binary search over the mapped key array. Returns the entry index, or -1 if the key is not in the book."""
+        mm, unpack, base = self._mm, KEY.unpack_from, HEADER.size
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if unpack(mm, base + 8 * mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and unpack(mm, base + 8 * lo)[0] == key:
+            return lo
+        return -1
+
+    def lookup(self, board: BitBoard, valid_moves=None):
+        """Returns the book move for board, or None if the position is not in the book."""
+        if board.moves > self.max_ply:
+            return None
+        key, mirrored = board.canonical_key()
+        index = self._find(key)
+        if index < 0:
+            return None
+        col = self._mm[self._moves_offset + index]
+        if mirrored:
+            col = COLS - 1 - col
+        if not board.can_play(col) or (valid_moves is not None and col not in valid_moves):
+            return None
+        return col
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._mm.close()
+
+
+def enumerate_positions(max_ply: int) -> list:
+    """
+    Returns one move sequence for every distinct position (mirror images folded together) reachable in at most
+    max_ply plies, excluding positions where the game is already over.
+    """
+    seen = {BitBoard().canonical_key()[0]}
+    frontier = [()]
+    positions = [()]
+    for _ in range(max_ply):
+        next_frontier = []
+        for moves in frontier:
+            board = BitBoard.from_moves(moves)
+            for col in board.valid_moves():
+                child = board.copy()
+                player = child.player_to_move()
+                child.play(col, player)
+                key = child.canonical_key()[0]
+                if key in seen or child.is_win(player) or child.is_full():
+                    continue
+                seen.add(key)
+                next_frontier.append(moves + (col,))
+        positions.extend(next_frontier)
+        frontier = next_frontier
+    return positions
+
+
+_book_solver = None
+
+def _solve_position(task):
+    moves, depth = task
+    global _book_solver
+    if _book_solver is None:
+        from .solver import NegamaxSolver
+        _book_solver = NegamaxSolver(time_budget=None)
+    board = BitBoard.from_moves(moves)
+    return board.canonical_key(), _book_solver.best_move(board, max_depth=depth)
+
+
+def build_book(path: str, max_ply: int, depth: int, workers: int = 1, progress=None) -> int:
+    """
+    Solves every position up to max_ply plies with a depth-limited negamax search and writes the book file.
+    Returns the number of entries written.
+    """
+    tasks = [(moves, depth) for moves in enumerate_positions(max_ply)]
+    entries = {}
+    if workers <= 1:
+        results = map(_solve_position, tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_solve_position, tasks, chunksize=16)
+    for done, ((key, mirrored), col) in enumerate(results, 1):
+        entries[key] = COLS - 1 - col if mirrored else col
+        if progress is not None:
+            progress(done, len(tasks))
+    if workers > 1:
+        pool.shutdown()
+
+    keys = sorted(entries)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(BOOK_MAGIC, len(keys), max_ply, depth, 0))
+        f.write(b"".join(KEY.pack(key) for key in keys))
+        f.write(bytes(entries[key] for key in keys))
+    return len(keys)
+
+
+_book = None
+_book_loaded = False
+
+def get_opening_book():
+    """Returns the shared book (memory-mapped on first use from CONNECT4_BOOK_PATH or the default path), or None."""
+    global _book, _book_loaded
+    if not _book_loaded:
+        _book_loaded = True
+        path = os.environ.get('CONNECT4_BOOK_PATH') or DEFAULT_BOOK_PATH
+        if os.path.exists(path):
+            try:
+                _book = OpeningBook(path)
+            except (OSError, ValueError) as e:
+                print(f"Could not load the opening book: {e}")
+    return _book
@@ -0,0 +1,242 @@
+"""
+This module provides a multi-core version of the local engine in solver.py, using root splitting over a process pool.
+
+    - The legal root moves (at most COLS) are dealt round-robin into one group per worker, centre-first.
+    - Every worker runs iterative-deepening alpha-beta over its own group with its own transposition table, kept warm
+      between moves in the worker process, and reports the best (score, move) of each depth it completed.
+    - When the wall-clock budget runs out, the groups are compared at the deepest depth all of them completed, in group
+      order so ties go to the more central move. A group whose result is already proven (a forced win or loss) counts
+      as complete at every depth.
+    - Every search has its own id, and the workers stop as soon as a shared counter moves past it: a proven win, stop()
+      and a timed-out search all end that search's tasks without touching the tasks of the next one.
+
+Scores below the mate range are only comparable within one search. Like the serial solver's, they come from
+transposition tables kept warm between moves (one per worker here), so entries left by deeper earlier searches can
+change the score of a position at a given nominal depth; the same position may therefore get a different score from
+the serial and the parallel search, or from one search to the next, although the move choice is made consistently.
+
+With n workers each worker searches about 1/n of the root moves, so at a fixed move time the search gets deeper as
+cores are added. Where a pool cannot help, the search runs serially in-process with the same interface: with one worker,
+on a single-CPU machine, and inside a worker process of another pool (e.g. self-play with --workers), where nesting
+pools would only oversubscribe the cores.
+Set CONNECT4_SEARCH_WORKERS and CONNECT4_SEARCH_TIME to configure the 'parallel' AI backend.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, as_completed
+
+from .constants import ROWS, COLS
+from .bitboard import BitBoard
+from .solver import (NegamaxSolver, SearchTimeout, DEFAULT_MAX_DEPTH, DEFAULT_TIME_BUDGET, MATE_THRESHOLD, WIN_SCORE,
+                     root_candidates, immediate_win, zobrist_key)
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+# Extra time allowed for the workers to notice the deadline and send their results back
+RESULT_GRACE = 0.5
+
+
+# --- Worker process side ---
+
+_worker_solver = None
+_search_counter = None
+
+
+class _SearchToken:
+    """Stop event of one search (the solver's stop_event interface): set once the shared counter has moved past it."""
+
+    __slots__ = ("search",)
+
+    def __init__(self, search):
+        self.search = search
+
+    def is_set(self):
+        return _search_counter.value != self.search
+
+
+def _init_worker(search_counter):
+    global _worker_solver, _search_counter
+    _search_counter = search_counter
+    _worker_solver = NegamaxSolver(time_budget=None)
+
+
+def _search_group(task):
+    """
+    Iterative deepening over one group of root moves. deadline is a time.time() value, converted to the worker's
+    perf_counter clock. Returns ([(depth, score, move), ...] for every completed depth, nodes searched).
+    """
+    board, group, max_depth, deadline, search = task
+    solver = _worker_solver
+    solver.nodes = 0
+    solver.stop_requested = False
+    solver.stop_event = _SearchToken(search)
+    solver.deadline = None if deadline is None else time.perf_counter() + (deadline - time.time())
+    position, mask = board.position_and_mask()
+    key = zobrist_key(board)
+    side = board.moves % 2
+    best = group[0]
+    results = []
+    for depth in range(1, min(max_depth, ROWS * COLS - board.moves) + 1):
+        try:
+            score, move = solver._search_root(position, mask, key, side, depth, group, best)
+        except SearchTimeout:
+            break
+        best = move
+        results.append((depth, score, move))
+        if abs(score) > MATE_THRESHOLD:
+            break # Proven: deeper iterations cannot change it
+    return results, solver.nodes
+
+
+# --- Coordinator side ---
+
+def serial_fallback(workers: int) -> bool:
+    """True when a pool of workers would not speed the search up: one worker, one CPU, or already in a child process."""
+    return workers <= 1 or (os.cpu_count() or 1) == 1 or multiprocessing.parent_process() is not None
+
+
+class ParallelSolver:
+    """
+    Root-splitting parallel search with the same best_move interface and statistics as NegamaxSolver.
+    The worker pool is created on first use and reused between moves. When serial_fallback(workers) holds, every search
+    runs on an in-process NegamaxSolver instead and no pool is created.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_depth: int = DEFAULT_MAX_DEPTH,
+                 time_budget: float = DEFAULT_TIME_BUDGET):
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        # Id of the current search, shared with the workers: incrementing it stops every task of the current search
+        self._search_counter = multiprocessing.RawValue('q', 0)
+        self.stop_requested = False # Set by stop(); a finished search is also ended early by _end_search
+        self._pool = None
+        self.serial = serial_fallback(self.workers)
+        self._serial_solver = NegamaxSolver(max_depth=max_depth, time_budget=None) if self.serial else None
+        self.nodes = 0
+        # Statistics of the last call to best_move
+        self.last_depth = 0
+        self.last_score = 0
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self._search_counter,))
+        return self._pool
+
+    def best_move(self, board: BitBoard, valid_moves=None, max_depth=None, time_budget=None) -> int:
+        """
+        Returns the best column for the side to move, -1 if no move is possible, or None if stop() (or a newer search on
+        another thread) cancelled the search.
+        max_depth limits the search depth in plies and time_budget the wall-clock time in seconds (None = no limit).
+        """
+        max_depth = self.max_depth if max_depth is None else max_depth
+        time_budget = self.time_budget if time_budget is None else time_budget
+        candidates = root_candidates(board, valid_moves)
+        if not candidates:
+            return -1
+        col = immediate_win(board, candidates)
+        if col is not None:
+            self.last_depth, self.last_score = 1, WIN_SCORE - 1
+            return col
+        if len(candidates) == 1:
+            self.last_depth, self.last_score = 0, 0
+            return candidates[0]
+
+        if self.stop_requested:
+            return None
+        if self.serial:
+            best = self._serial_solver.best_move(board, candidates, max_depth, time_budget)
+            self.nodes = self._serial_solver.nodes
+            self.last_depth, self.last_score = self._serial_solver.last_depth, self._serial_solver.last_score
+            return best
+        self._search_counter.value += 1
+        search = self._search_counter.value
+        deadline = None if time_budget is None else time.time() + time_budget
+        groups = [candidates[i::self.workers] for i in range(min(self.workers, len(candidates)))]
+        pool = self._executor()
+        futures = {pool.submit(_search_group, (board, group, max_depth, deadline, search)): index
+                   for index, group in enumerate(groups)}
+        reports = {}
+        ended = False # Whether this search stopped its own remaining tasks
+        self.nodes = 0
+        try:
+            for future in as_completed(futures, timeout=None if time_budget is None else time_budget + RESULT_GRACE):
+                results, nodes = future.result()
+                self.nodes += nodes
+                reports[futures[future]] = results
+                if results and results[-1][1] > MATE_THRESHOLD:
+                    ended = self._end_search(search) # A forced win was found: no need to wait for the other groups
+        except TimeoutError:
+            ended = self._end_search(search)
+            print("Parallel search: some workers did not report back in time")
+        # stop() or a newer search moved the counter on, so the groups were cut short: even if stop() has already been
+        # cleared, their results are not a validated answer
+        if self.stop_requested or self._search_counter.value != (search + 1 if ended else search):
+            return None
+        return self._choose([reports[index] for index in sorted(reports)], candidates[0])
+
+    def _end_search(self, search) -> bool:
+        """Stops the remaining tasks of search, unless something else already has. Returns True if it did."""
+        if self._search_counter.value != search:
+            return False
+        self._search_counter.value += 1
+        return True
+
+    def _choose(self, reports: list, fallback: int) -> int:
+        """
+        Picks the best move at the deepest depth completed by every group (proven groups count as complete).
+        reports are in group order, so of two equal scores the first (more central) group's move wins.
+        """
+        reports = [results for results in reports if results]
+        if not reports:
+            self.last_depth, self.last_score = 0, 0
+            return fallback
+        open_depths = [results[-1][0] for results in reports if abs(results[-1][1]) <= MATE_THRESHOLD]
+        common = min(open_depths) if open_depths else max(results[-1][0] for results in reports)
+        best_depth, best_score, best_move = common, -WIN_SCORE - 1, fallback
+        for results in reports:
+            proven = abs(results[-1][1]) > MATE_THRESHOLD
+            depth, score, move = results[-1] if proven else results[common - 1]
+            if score > best_score:
+                best_depth, best_score, best_move = depth, score, move
+        # Like the serial search, a forced win is reported at the depth that proved it
+        self.last_depth, self.last_score = best_depth if best_score > MATE_THRESHOLD else common, best_score
+        return best_move
+
+    def stop(self):
+        """Asks a running search to return None as soon as possible (the workers check every 1024 nodes)."""
+        self.stop_requested = True
+        self._search_counter.value += 1
+        if self._serial_solver is not None:
+            self._serial_solver.stop()
+
+    def clear_stop(self):
+        """Re-enables searching after stop(). Called when a new move is requested."""
+        self.stop_requested = False
+        if self._serial_solver is not None:
+            self._serial_solver.clear_stop()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._search_counter.value += 1
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+_parallel_solver = None
+
+def get_parallel_solver() -> ParallelSolver:
+    """Returns the shared parallel solver configured from the environment, created on first use."""
+    global _parallel_solver
+    if _parallel_solver is None:
+        _parallel_solver = ParallelSolver(
+            int(os.environ.get('CONNECT4_SEARCH_WORKERS') or DEFAULT_WORKERS),
+            time_budget=float(os.environ.get('CONNECT4_SEARCH_TIME') or DEFAULT_TIME_BUDGET))
+    return _parallel_solver
+
+
+def get_ai_move(gameplay_matrix, valid_moves: list, max_depth=None, time_budget=None) -> int:
+    """Parallel counterpart of solver.get_ai_move."""
+    board = BitBoard.from_matrix(gameplay_matrix)
+    return get_parallel_solver().best_move(board, valid_moves, max_depth, time_budget)
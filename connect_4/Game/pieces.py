@@ -1,19 +1,33 @@
 """
 This module defines the Piece class for the Connect 4 game. It handles the color and drawing of a game piece.
+Each colour is rendered once into a small sprite surface; drawing a piece is then a single blit.
 """
 
 import pygame
 from .constants import TOKEN_RADIUS
 
 class Piece:
+    # Pre-rendered piece sprites shared by all pieces of the same colour
+    _sprites = {}
+    __slots__ = ("color",)
+
     def __init__(self, color):
         self.color = color
 
+    def sprite(self):
+        """Returns the pre-rendered sprite for this piece's colour, creating it on first use."""
+        sprite = Piece._sprites.get(self.color)
+        if sprite is None:
+            sprite = pygame.Surface((2 * TOKEN_RADIUS, 2 * TOKEN_RADIUS), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, self.color, (TOKEN_RADIUS, TOKEN_RADIUS), TOKEN_RADIUS)
+            Piece._sprites[self.color] = sprite
+        return sprite
+
     def draw(self, win, x, y):
-        """Draws the piece on the window."""
-        pygame.draw.circle(win, self.color, (x, y), TOKEN_RADIUS)
+        """Draws the piece on the window, centred on (x, y)."""
+        win.blit(self.sprite(), (x - TOKEN_RADIUS, y - TOKEN_RADIUS))
         
 class RedPiece(Piece):
-    pass
+    __slots__ = ()
 class YellowPiece(Piece):
-    pass
\ No newline at end of file
+    __slots__ = ()
@@ -0,0 +1,216 @@
+"""
+This module provides the remote AI provider layer used by the LLM backend in ai.py.
+
+    - Each provider (DeepSeek, OpenAI or any OpenAI-compatible endpoint) is reached through one shared pooled httpx.Client,
+      so TLS connections are kept alive and re-used between moves.
+    - Every move has a deadline; connect and read timeouts are bounded by it, and a request that misses it returns None.
+    - Responses are streamed and parsed as they arrive: the first integer token that can only be a valid column is
+      accepted at once, without waiting for the rest of the completion.
+    - Requests are hedged: if the primary provider has not answered within its recent p90 latency, the same request is sent
+      to the next provider. The first valid answer wins and the other request is cancelled (its stream is closed).
+
+Configuration (environment variables):
+    DEEPSEEK_API_KEY, CONNECT4_DEEPSEEK_BASE_URL (or CONNECT4_AI_BASE_URL), CONNECT4_DEEPSEEK_MODEL
+    OPENAI_API_KEY, CONNECT4_OPENAI_BASE_URL, CONNECT4_OPENAI_MODEL
+    CONNECT4_AI_DEADLINE (seconds per move)
+The base URLs can point at local mock servers to test latency and failure handling.
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    import httpx
+except ImportError: # Installed together with the openai package
+    httpx = None
+
+DEFAULT_DEADLINE = 8.0 # seconds per move, across all providers
+CONNECT_TIMEOUT = 3.0
+# Hedge delay used until a provider has enough latency samples to estimate its p90
+DEFAULT_HEDGE_DELAY = 2.0
+MIN_LATENCY_SAMPLES = 5
+LATENCY_WINDOW = 50
+MAX_CONNECTIONS = 20
+STOP_POLL_INTERVAL = 0.05 # seconds between checks of a get_move stop_event
+SYSTEM_PROMPT = "You are a Connect 4 expert that only responds with a single number."
+
+_INTEGER = re.compile(r"\d+")
+
+
+class Provider:
+    """One OpenAI-compatible chat completions endpoint, with a rolling window of its observed latencies."""
+
+    def __init__(self, name: str, base_url: str, api_key: str, model: str):
+        self.name = name
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.api_key = api_key
+        self.model = model
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.failures = 0
+
+    def hedge_delay(self) -> float:
+        """p90 of the recent latencies: waiting longer than this for an answer is unusual, so it is time to hedge."""
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return DEFAULT_HEDGE_DELAY
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(0.9 * len(ordered)))]
+
+    def request_move(self, client, prompt: str, valid_moves: list, deadline: float, cancelled: threading.Event, responses: list):
+        """
+        Streams one completion and returns the first valid column in it, or None (invalid answer, error, deadline, cancel).
+        The open response is appended to responses so a racing request can close it.
+        """
+        start = time.perf_counter()
+        timeout = max(0.01, deadline - start)
+        body = {
+            "model": self.model,
+            "messages": [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": prompt}],
+            "stream": True,
+        }
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        text = ""
+        try:
+            with client.stream("POST", self.url, json=body, headers=headers,
+                               timeout=httpx.Timeout(timeout, connect=min(CONNECT_TIMEOUT, timeout))) as response:
+                responses.append(response)
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if cancelled.is_set() or time.perf_counter() > deadline:
+                        return None
+                    if not line.startswith("data:"):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == "[DONE]":
+                        break
+                    choices = json.loads(payload).get("choices") or [{}]
+                    text += (choices[0].get("delta") or {}).get("content") or ""
+                    col = first_column(text, valid_moves, finished=False)
+                    if col is not None:
+                        self.latencies.append(time.perf_counter() - start)
+                        return col
+            col = first_column(text, valid_moves, finished=True)
+            if col is not None:
+                self.latencies.append(time.perf_counter() - start)
+            else:
+                print(f"AI provider {self.name} returned an invalid response: '{text.strip()}'")
+            return col
+        except Exception as e:
+            if not cancelled.is_set():
+                self.failures += 1
+                print(f"AI provider {self.name} failed: {e}")
+            return None
+
+
+def first_column(text: str, valid_moves: list, finished: bool):
+    """
+    Returns the first integer in text if it is a valid move. While the stream is still running, an integer at the very end
+    of the text is only accepted if appending more digits could not turn it into another valid column.
+    Returns None if there is no usable integer (yet).
+    """
+    match = _INTEGER.search(text)
+    if match is None:
+        return None
+    value = int(match.group())
+    if not finished and match.end() == len(text) and value * 10 <= max(valid_moves):
+        return None # e.g. "1" could still become "12" on a wide board
+    return value if value in valid_moves else None
+
+
+class RemoteAI:
+    """Races the configured providers for each move over one shared connection pool."""
+
+    def __init__(self, providers: list, deadline: float = DEFAULT_DEADLINE, hedge: bool = True):
+        self.providers = providers
+        self.deadline = deadline
+        self.hedge = hedge
+        self.client = httpx.Client(limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS))
+        self._executor = ThreadPoolExecutor(max_workers=MAX_CONNECTIONS, thread_name_prefix="ai-provider")
+        self.hedged = 0 # Moves for which a second provider was asked
+
+    def get_move(self, prompt: str, valid_moves: list, deadline: float = None, stop_event=None):
+        """
+        Returns the first valid column from any provider, or None if none answered validly before the deadline.
+        stop_event (any object with is_set()) abandons the move early: the requests are cancelled and None is returned.
+        """
+        end = time.perf_counter() + (self.deadline if deadline is None else deadline)
+        cancelled = threading.Event()
+        responses = []
+        waiting = {}
+        queue = list(self.providers)
+
+        def launch():
+            provider = queue.pop(0)
+            waiting[self._executor.submit(provider.request_move, self.client, prompt, valid_moves, end, cancelled, responses)] = provider
+            return provider
+
+        newest = launch()
+        hedge_at = time.perf_counter() + newest.hedge_delay()
+        try:
+            while waiting:
+                now = time.perf_counter()
+                remaining = end - now
+                if remaining <= 0 or (stop_event is not None and stop_event.is_set()):
+                    return None
+                # While another provider is left, only wait up to the p90 latency of the newest request before hedging
+                timeout = min(remaining, hedge_at - now) if queue and self.hedge else remaining
+                if stop_event is not None:
+                    timeout = min(timeout, STOP_POLL_INTERVAL)
+                done, _ = wait(waiting, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+                for future in done:
+                    del waiting[future]
+                    col = future.result()
+                    if col is not None:
+                        return col
+                # Hedge when the newest request is slower than usual, fail over when every request so far has failed
+                if queue and (not waiting or (self.hedge and time.perf_counter() >= hedge_at)):
+                    newest = launch()
+                    hedge_at = time.perf_counter() + newest.hedge_delay()
+                    if len(waiting) > 1:
+                        self.hedged += 1
+            return None
+        finally:
+            # Cancel the losing requests: their reader threads stop at the next chunk, closing the streams stops them now
+            cancelled.set()
+            for response in responses:
+                try:
+                    response.close()
+                except Exception:
+                    pass
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.client.close()
+
+
+def providers_from_env() -> list:
+    """Builds the provider list from the environment. DeepSeek is preferred when both keys are set."""
+    providers = []
+    if os.environ.get('DEEPSEEK_API_KEY'):
+        providers.append(Provider(
+            "deepseek",
+            os.environ.get('CONNECT4_DEEPSEEK_BASE_URL') or os.environ.get('CONNECT4_AI_BASE_URL') or "https://api.deepseek.com",
+            os.environ['DEEPSEEK_API_KEY'],
+            os.environ.get('CONNECT4_DEEPSEEK_MODEL') or "deepseek-chat"))
+    if os.environ.get('OPENAI_API_KEY'):
+        providers.append(Provider(
+            "openai",
+            os.environ.get('CONNECT4_OPENAI_BASE_URL') or "https://api.openai.com/v1",
+            os.environ['OPENAI_API_KEY'],
+            os.environ.get('CONNECT4_OPENAI_MODEL') or "gpt-4o-mini"))
+    return providers
+
+
+def create_remote_ai():
+    """Returns a RemoteAI for the providers configured in the environment, or None if there are none."""
+    if httpx is None:
+        print("Warning: the httpx package is not installed. The LLM backend will not function.")
+        return None
+    providers = providers_from_env()
+    if not providers:
+        print("Warning: DEEPSEEK_API_KEY or OPENAI_API_KEY environment variable not found. AI will not function.")
+        return None
+    return RemoteAI(providers, float(os.environ.get('CONNECT4_AI_DEADLINE') or DEFAULT_DEADLINE))
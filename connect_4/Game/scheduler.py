@@ -0,0 +1,50 @@
+"""
+This module provides an idle-aware frame scheduler for the pygame main loop.
+Instead of spinning at a fixed FPS forever, the loop blocks on pygame.event.wait while nothing on screen needs to change
+and only runs at the full frame rate while something is animating (e.g. a hover transition). A pending AI move wakes the
+loop through a custom event posted by the AI worker, so the result is applied as soon as it is ready.
+"""
+import pygame
+from .constants import FPS
+
+# Posted by the AI worker thread when a move has been computed
+AI_MOVE_READY = pygame.USEREVENT + 1
+# Upper bound on how long the loop sleeps while idle, in milliseconds
+IDLE_TIMEOUT_MS = 1000
+# While an AI move is pending, wake up at least this often in case the ready event is missed
+PENDING_TIMEOUT_MS = 100
+# After something on screen changes, keep running at the full frame rate for this many frames before going idle,
+# so bursts of interaction (hovering across buttons, a move followed by the AI reply) stay smooth
+ACTIVE_FRAMES = 6
+
+
+def post_ai_move_ready():
+    """Wakes the main loop when an AI move is ready. Safe to call from the AI worker thread."""
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(AI_MOVE_READY))
+
+
+class FrameScheduler:
+
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.active_frames = 0 # Frames run at full rate since the loop last went idle
+        self.idle_waits = 0 # Times the loop blocked waiting for events
+
+    def wait_events(self, active, timeout_ms=IDLE_TIMEOUT_MS):
+        """
+        Returns the events to process in the next frame.
+        active: something is animating, so run at the full frame rate (pygame.time.Clock.tick).
+        Otherwise block until an event arrives or timeout_ms passes, using no CPU while waiting.
+        """
+        if active:
+            self.active_frames += 1
+            self.clock.tick(self.fps)
+            return pygame.event.get()
+        self.idle_waits += 1
+        first = pygame.event.wait(timeout_ms)
+        events = [] if first.type == pygame.NOEVENT else [first]
+        events.extend(pygame.event.get())
+        self.clock.tick() # Keep the clock's frame timing in step after the wait
+        return events
@@ -0,0 +1,282 @@
+"""
+This module provides a local Connect 4 engine that needs no network access. It is a drop-in AI backend with the same
+get_ai_move(gameplay_matrix, valid_moves) signature as the LLM backend in ai.py.
+
+The engine runs iterative-deepening negamax with alpha-beta pruning on the bitboard encoding from bitboard.py:
+    - centre-first move ordering (plus the best move remembered in the transposition table),
+    - a fixed-size transposition table keyed by Zobrist hashes and stored in compact arrays,
+    - immediate win / forced block detection with winning_cells so obvious tactics cost no search,
+    - a time budget and/or a depth budget; the best move of the last fully searched depth is returned.
+"""
+import random
+import time
+from array import array
+
+from .constants import ROWS, COLS
+from .bitboard import BitBoard, COLUMN_BITS, BOTTOM_MASKS, COLUMN_MASKS, BOARD_MASK, ALL_BOTTOMS, winning_cells
+
+WIN_SCORE = 1_000_000
+# Scores above this threshold are forced wins (WIN_SCORE minus the number of plies needed to win)
+MATE_THRESHOLD = WIN_SCORE - ROWS * COLS - 1
+DEFAULT_MAX_DEPTH = ROWS * COLS
+DEFAULT_TIME_BUDGET = 0.1 # seconds per move
+TT_BITS = 18 # 2^18 entries, roughly 4 MB
+
+# Transposition table entry flags
+EXACT, LOWER, UPPER = 0, 1, 2
+
+CENTRE_ORDER = tuple(sorted(range(COLS), key=lambda c: abs(c - COLS // 2)))
+CENTRE_MASK = COLUMN_MASKS[COLS // 2]
+THREAT_WEIGHT = 8
+CENTRE_WEIGHT = 3
+
+# One random 64-bit key per (side, cell). A fixed seed keeps keys identical across runs and processes.
+_rng = random.Random(20251120)
+ZOBRIST = tuple(tuple(_rng.getrandbits(64) for _ in range(COLS * COLUMN_BITS)) for _ in range(2))
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out; the current iteration is discarded."""
+
+
+def zobrist_key(board: BitBoard) -> int:
+    """Computes the Zobrist key of a BitBoard from scratch. The search then updates it incrementally."""
+    key = 0
+    for side, bits in enumerate(board.pieces[1:]):
+        while bits:
+            low = bits & -bits
+            key ^= ZOBRIST[side][low.bit_length() - 1]
+            bits ^= low
+    return key
+
+
+def evaluate(position: int, mask: int) -> int:
+    """Static evaluation from the point of view of the side to move: open winning cells and centre control."""
+    opponent = position ^ mask
+    score = (winning_cells(position, mask).bit_count() - winning_cells(opponent, mask).bit_count()) * THREAT_WEIGHT
+    score += ((position & CENTRE_MASK).bit_count() - (opponent & CENTRE_MASK).bit_count()) * CENTRE_WEIGHT
+    return score
+
+
+def root_candidates(board: BitBoard, valid_moves=None) -> list:
+    """Playable root moves in centre-first order, restricted to valid_moves if given."""
+    return [c for c in CENTRE_ORDER if board.can_play(c) and (valid_moves is None or c in valid_moves)]
+
+
+def immediate_win(board: BitBoard, candidates: list):
+    """Returns a candidate column that wins on the spot for the side to move, or None."""
+    position, mask = board.position_and_mask()
+    wins = winning_cells(position, mask) & (mask + ALL_BOTTOMS) & BOARD_MASK
+    for col in candidates:
+        if wins & COLUMN_MASKS[col]:
+            return col
+    return None
+
+
+class TranspositionTable:
+    """Fixed-size, always-replace table indexed by the low bits of the Zobrist key."""
+
+    def __init__(self, bits: int = TT_BITS):
+        self.size = 1 << bits
+        self.index_mask = self.size - 1
+        self.keys = array('Q', bytes(8 * self.size))
+        self.scores = array('i', bytes(4 * self.size))
+        self.depths = array('b', bytes(self.size))
+        self.flags = array('b', bytes(self.size))
+        self.moves = array('b', bytes(self.size))
+
+    def clear(self):
+        self.keys = array('Q', bytes(8 * self.size))
+
+    def store(self, key: int, depth: int, score: int, flag: int, move: int):
+        index = key & self.index_mask
+        self.keys[index] = key
+        self.depths[index] = depth
+        self.scores[index] = score
+        self.flags[index] = flag
+        self.moves[index] = move
+
+
+class NegamaxSolver:
+    """
+    Iterative-deepening negamax search. The transposition table is kept between moves,
+    so positions analysed on earlier turns speed up later searches.
+    """
+
+    def __init__(self, tt_bits: int = TT_BITS, max_depth: int = DEFAULT_MAX_DEPTH, time_budget: float = DEFAULT_TIME_BUDGET,
+                 stop_event=None):
+        self.table = TranspositionTable(tt_bits)
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.deadline = None
+        self.stop_requested = False
+        # Optional multiprocessing.Event checked together with stop_requested, so another process can stop the search
+        self.stop_event = stop_event
+        self.nodes = 0
+        # Statistics of the last call to best_move
+        self.last_depth = 0
+        self.last_score = 0
+
+    def best_move(self, board: BitBoard, valid_moves=None, max_depth=None, time_budget=None) -> int:
+        """
+        Returns the best column for the side to move, -1 if no move is possible, or None if the search was cancelled
+        with stop() (a cut-short search is not a validated answer, so it must not be cached).
+        max_depth limits the search depth in plies and time_budget the wall-clock time in seconds (None = no limit).
+        A stop() stays in force until clear_stop(), so a stop that arrives before the search starts is not lost.
+        """
+        max_depth = self.max_depth if max_depth is None else max_depth
+        time_budget = self.time_budget if time_budget is None else time_budget
+        candidates = root_candidates(board, valid_moves)
+        if not candidates:
+            return -1
+        col = immediate_win(board, candidates)
+        if col is not None:
+            self.last_depth, self.last_score = 1, WIN_SCORE - 1
+            return col
+
+        if self.stop_requested:
+            return None
+        position, mask = board.position_and_mask()
+        self.nodes = 0
+        self.deadline = None if time_budget is None else time.perf_counter() + time_budget
+        key = zobrist_key(board)
+        side = board.moves % 2
+        best = candidates[0]
+        self.last_depth, self.last_score = 0, 0
+        for depth in range(1, min(max_depth, ROWS * COLS - board.moves) + 1):
+            try:
+                score, move = self._search_root(position, mask, key, side, depth, candidates, best)
+            except SearchTimeout:
+                if self.stop_requested:
+                    return None
+                break
+            best = move
+            self.last_depth, self.last_score = depth, score
+            if abs(score) > MATE_THRESHOLD:
+                break # The result is proven, deeper iterations cannot change it
+        return best
+
+    def stop(self):
+        """Asks a search running on another thread to return None as soon as possible (checked every 1024 nodes)."""
+        self.stop_requested = True
+
+    def clear_stop(self):
+        """Re-enables searching after stop(). Called when a new move is requested, never by the search itself."""
+        self.stop_requested = False
+
+    def _search_root(self, position, mask, key, side, depth, candidates, previous_best):
+        # Search the previous iteration's best move first: it gives the tightest alpha bound
+        order = [previous_best] + [c for c in candidates if c != previous_best]
+        alpha, beta = -WIN_SCORE, WIN_SCORE
+        best_score, best_move = -WIN_SCORE - 1, previous_best
+        opponent = position ^ mask
+        for col in order:
+            move_bit = (mask + BOTTOM_MASKS[col]) & COLUMN_MASKS[col]
+            child_key = key ^ ZOBRIST[side][move_bit.bit_length() - 1]
+            score = -self._negamax(opponent, mask | move_bit, child_key, side ^ 1, depth - 1, -beta, -alpha, 1)
+            if score > best_score:
+                best_score, best_move = score, col
+            if score > alpha:
+                alpha = score
+        return best_score, best_move
+
+    def _negamax(self, position, mask, key, side, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 1023 and (self.stop_requested or (self.deadline is not None and time.perf_counter() > self.deadline)
+                                      or (self.stop_event is not None and self.stop_event.is_set())):
+            raise SearchTimeout
+
+        possible = (mask + ALL_BOTTOMS) & BOARD_MASK
+        if winning_cells(position, mask) & possible:
+            return WIN_SCORE - ply - 1 # The side to move wins with its next piece
+        if not possible:
+            return 0 # Board full: draw
+
+        # Never play directly below a cell where the opponent would complete four
+        opponent = position ^ mask
+        opponent_wins = winning_cells(opponent, mask)
+        forced = possible & opponent_wins
+        if forced:
+            if forced & (forced - 1):
+                return -(WIN_SCORE - ply - 2) # Two threats at once cannot both be blocked
+            possible = forced
+        possible &= ~(opponent_wins >> 1)
+        if not possible:
+            return -(WIN_SCORE - ply - 2) # Every move hands the opponent a win
+
+        if depth <= 0:
+            return evaluate(position, mask)
+
+        table = self.table
+        index = key & table.index_mask
+        tt_move = -1
+        if table.keys[index] == key:
+            tt_move = table.moves[index]
+            if table.depths[index] >= depth:
+                score = table.scores[index]
+                # Mate scores are stored relative to the node, convert back to the distance from the root
+                if score > MATE_THRESHOLD:
+                    score -= ply
+                elif score < -MATE_THRESHOLD:
+                    score += ply
+                flag = table.flags[index]
+                if flag == EXACT:
+                    return score
+                if flag == LOWER and score >= beta:
+                    return score
+                if flag == UPPER and score <= alpha:
+                    return score
+
+        original_alpha = alpha
+        best_score, best_move = -WIN_SCORE - 1, -1
+        order = CENTRE_ORDER if tt_move < 0 else (tt_move,) + CENTRE_ORDER
+        for col in order:
+            move_bit = possible & COLUMN_MASKS[col]
+            if not move_bit:
+                continue
+            child_key = key ^ ZOBRIST[side][move_bit.bit_length() - 1]
+            score = -self._negamax(opponent, mask | move_bit, child_key, side ^ 1, depth - 1, -beta, -alpha, ply + 1)
+            if score > best_score:
+                best_score, best_move = score, col
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+            possible &= ~move_bit # Skip the tt move when the centre order reaches it again
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        stored = best_score
+        if stored > MATE_THRESHOLD:
+            stored += ply
+        elif stored < -MATE_THRESHOLD:
+            stored -= ply
+        table.store(key, depth, stored, flag, best_move)
+        return best_score
+
+
+_solver = None
+
+def get_solver() -> NegamaxSolver:
+    """Returns the shared solver, created on first use so importing the module stays cheap."""
+    global _solver
+    if _solver is None:
+        _solver = NegamaxSolver()
+    return _solver
+
+
+def get_ai_move(gameplay_matrix, valid_moves: list, max_depth=None, time_budget=None) -> int:
+    """
+    Local-engine counterpart of ai.get_ai_move: returns the best column for the side to move in gameplay_matrix.
+    Args:
+        gameplay_matrix: The current board state (0 = empty, 1 = Red, 2 = Yellow).
+        valid_moves: A list of column indices that are not full.
+        max_depth: Optional depth budget in plies.
+        time_budget: Optional time budget in seconds.
+    """
+    board = BitBoard.from_matrix(gameplay_matrix)
+    return get_solver().best_move(board, valid_moves, max_depth, time_budget)
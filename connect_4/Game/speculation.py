@@ -0,0 +1,217 @@
+"""
+This module provides speculative AI pre-computation. While the human is thinking there are at most COLS possible human
+moves, so the AI reply to every one of them is computed in parallel and stored in the move cache. When the human commits
+a move, the speculations for the other columns are cancelled and the AI reply is usually an instant cache hit.
+
+    - The remote backend runs speculations on a thread pool (the work is waiting on the network),
+      the local engine on a process pool (the work is CPU-bound).
+    - max_workers caps the number of speculations running at once; the rest wait in the executor queue.
+    - Cancelling a speculation also stops it while it runs: every speculation checks a token in shared memory (one slot
+      per human column) and gives up, without storing anything, once its token has been revoked.
+    - Speculator.get_ai_move is a drop-in move provider for AIWorker: if the reply for the current board is still
+      being speculated, it waits for that result instead of sending a duplicate request.
+
+Set CONNECT4_SPECULATE=0 to turn speculation off (e.g. to save API calls), and CONNECT4_SPECULATION_WAIT to bound (in
+seconds) how long get_ai_move waits for a running speculation before computing the move itself.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError, TimeoutError as FutureTimeoutError
+
+from .constants import COLS, PLAYER_RED
+from .bitboard import BitBoard, position_key
+from .b_algorithm import tracking_matrices_from_bitboards
+from .move_cache import get_move_cache
+from .opening_book import get_opening_book
+from . import ai, mcts, solver
+
+DEFAULT_MAX_WORKERS = 4
+# Longest wait for a running speculation before get_ai_move computes the move itself
+DEFAULT_WAIT = float(os.environ.get('CONNECT4_SPECULATION_WAIT') or 10.0)
+SPECULATION_ENABLED = os.environ.get('CONNECT4_SPECULATE', '1') != '0'
+
+# Shared engines of the local backends, which take a stop_event
+_ENGINES = {"negamax": solver.get_solver, "mcts": mcts.get_engine}
+
+_worker_tokens = None # The Speculator's token array, in a pool worker process
+
+
+def _init_worker(tokens):
+    global _worker_tokens
+    _worker_tokens = tokens
+
+
+class _Revoked:
+    """Stop event of one speculation: set once the token of its slot has changed (cancelled or replaced)."""
+
+    def __init__(self, tokens, slot: int, token: int):
+        self.tokens, self.slot, self.token = tokens, slot, token
+
+    def is_set(self) -> bool:
+        return self.tokens[self.slot] != self.token
+
+
+def compute_move(backend: str, gameplay_matrix, valid_moves: list, slot: int = 0, token: int = 0, tokens=None):
+    """
+    Runs one speculation (possibly in a worker process). Returns a validated column, or None if it failed or was
+    cancelled while running. tokens defaults to the array handed to the worker process.
+    """
+    tokens = _worker_tokens if tokens is None else tokens
+    stop = _Revoked(tokens, slot, token) if tokens is not None else None
+    if stop is not None and stop.is_set():
+        return None
+    if backend in _ENGINES:
+        engine = _ENGINES[backend]()
+        engine.stop_event = stop
+        try:
+            col = ai.CACHEABLE_BACKENDS[backend](gameplay_matrix, valid_moves)
+        finally:
+            engine.stop_event = None
+    elif backend == "llm":
+        col = ai.CACHEABLE_BACKENDS[backend](gameplay_matrix, valid_moves, stop_event=stop)
+    else:
+        col = ai.CACHEABLE_BACKENDS[backend](gameplay_matrix, valid_moves)
+    # A search stopped early returns its best guess so far, which is not the engine's answer
+    if col is None or col not in valid_moves or (stop is not None and stop.is_set()):
+        return None
+    return int(col)
+
+
+def _exact_key(board: BitBoard) -> int:
+    # Exact (not mirror-folded) key: a speculated column is only valid for the very board it was computed for
+    return position_key(*board.position_and_mask())
+
+
+class Speculator:
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, enabled: bool = SPECULATION_ENABLED,
+                 wait: float = DEFAULT_WAIT):
+        self.max_workers = max_workers
+        self.enabled = enabled
+        self.wait = wait
+        self._thread_pool = None
+        self._process_pool = None
+        self._lock = threading.Lock()
+        self._futures = {} # exact board key -> (human column, token, future) for the current human turn
+        # Live token of the speculation in each human-column slot, 0 when there is none. Shared with the pool processes.
+        self._tokens = multiprocessing.RawArray('q', COLS)
+        self._next_token = 0
+        self._awaited = None # (column, token) of the speculation get_ai_move is waiting for
+        self.started = 0
+        self.cancelled = 0
+
+    def _executor(self, backend: str):
+        """Thread pool for the remote backend, process pool for the CPU-bound local engine. Both are created lazily."""
+        if backend == "llm":
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="speculate")
+            return self._thread_pool
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                                     initargs=(self._tokens,))
+        return self._process_pool
+
+    def start(self, gameplay_matrix, human_player: int = PLAYER_RED):
+        """
+        Starts computing the AI reply to every legal move of the human player on the given board.
+        Any speculations from an earlier turn are cancelled first.
+        """
+        self.cancel()
+        # Backends sharing a cache namespace are speculated as that backend: the 'parallel' engine's replies are computed
+        # by the serial engine, one reply per pool process, which already keeps every core busy
+        backend = ai.cache_namespace(ai.AI_BACKEND)
+        if not self.enabled or backend not in ai.CACHEABLE_BACKENDS or (backend == "llm" and ai.client is None):
+            return
+        cache = get_move_cache()
+        book = get_opening_book()
+        board = BitBoard.from_matrix(gameplay_matrix)
+        executor = self._executor(backend)
+        for col in board.valid_moves():
+            child = board.copy()
+            child.play(col, human_player)
+            valid_moves = child.valid_moves()
+            if child.is_win(human_player) or not valid_moves:
+                continue # The game is over after this move, no reply needed
+            if (book is not None and book.lookup(child) is not None) or (cache is not None and cache.get(backend, child) is not None):
+                continue # Already instant
+            matrix = tracking_matrices_from_bitboards(child.pieces[1], child.pieces[2])[0]
+            with self._lock:
+                self._next_token += 1
+                token = self._tokens[col] = self._next_token
+            # Worker processes already hold the token array, threads are handed it
+            tokens = self._tokens if backend == "llm" else None
+            future = executor.submit(compute_move, backend, matrix, valid_moves, col, token, tokens)
+            future.add_done_callback(lambda f, backend=backend, child=child: self._store(f, backend, child))
+            with self._lock:
+                self._futures[_exact_key(child)] = (col, token, future)
+            self.started += 1
+
+    def _store(self, future, backend: str, board: BitBoard):
+        """Done callback: puts a finished speculation into the move cache."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        col = future.result()
+        cache = get_move_cache()
+        if col is not None and cache is not None:
+            cache.put(backend, board, col)
+
+    def _revoke(self, col: int, token: int, future):
+        """Cancels one speculation: a queued one never starts, a running one stops at its next check. Lock held."""
+        if self._tokens[col] == token:
+            self._tokens[col] = 0
+        if future.cancel() or not future.done():
+            self.cancelled += 1
+
+    def commit(self, col: int):
+        """The human played col: cancels the speculations for every other column, including the running ones."""
+        with self._lock:
+            for key, (human_col, token, future) in list(self._futures.items()):
+                if human_col != col:
+                    self._revoke(human_col, token, future)
+                    del self._futures[key]
+
+    def cancel(self):
+        """Cancels every speculation, including the running ones and the one get_ai_move may be waiting for."""
+        with self._lock:
+            for human_col, token, future in self._futures.values():
+                self._revoke(human_col, token, future)
+            self._futures.clear()
+            if self._awaited is not None and self._tokens[self._awaited[0]] == self._awaited[1]:
+                self._tokens[self._awaited[0]] = 0
+
+    def get_ai_move(self, gameplay_matrix, valid_moves: list) -> int:
+        """
+        Move provider for AIWorker. Waits (up to self.wait seconds) for the speculation of this exact board if there is
+        one, otherwise (or if it failed or timed out) falls back to ai.get_ai_move, which will usually hit the cache.
+        Returns None if cancel() is called during the wait: the move is no longer wanted.
+        """
+        key = _exact_key(BitBoard.from_matrix(gameplay_matrix))
+        with self._lock:
+            entry = self._futures.pop(key, None)
+            if entry is not None:
+                self._awaited = entry[:2]
+        if entry is not None:
+            human_col, token, future = entry
+            try:
+                col = future.result(timeout=self.wait)
+                if col is not None and col in valid_moves:
+                    return col
+            except FutureTimeoutError:
+                print(f"Speculative AI move still running after {self.wait:g}s, computing it directly.")
+            except CancelledError:
+                pass
+            except Exception as e:
+                print(f"Speculative AI move failed: {e}")
+            with self._lock:
+                self._awaited = None
+                if self._tokens[human_col] != token:
+                    return None # Cancelled while waiting
+                self._tokens[human_col] = 0 # Stops a speculation that timed out
+        return ai.get_ai_move(gameplay_matrix, valid_moves)
+
+    def shutdown(self):
+        self.cancel()
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
@@ -2,6 +2,8 @@
 This module provides a vectorized win-checking algorithm for Connect 4.
 The algorithm leverages NumPy for highly efficient, vectorized checks
 with early-exit logic.
+check_win_batch extends it to a whole stack of boards at once, for simulations and dataset validation jobs
+that need to check many boards at array speed.
 """
 import numpy as np
 
@@ -57,4 +59,47 @@ def check_win_vectorized(scorecard: np.ndarray, row: int, col: int) -> bool:
     ):
         return True
 
-    return False
\ No newline at end of file
+    return False
+
+
+# Line directions as (row step, column step): horizontal, vertical, main diagonal (\) and anti-diagonal (/)
+WIN_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+def check_win_batch(scorecards: np.ndarray, win_length: int = 4) -> np.ndarray:
+    """
+    Checks a stack of scorecards for four-in-a-row in a few array operations.
+    Each direction is a sliding-window AND of win_length shifted views over the whole stack, so the cost does not depend
+    on a Python loop over boards.
+
+    Args:
+        scorecards: An (N, ROWS, COLS) stack of scorecard matrices (non-zero = the player's piece).
+        win_length: Number of connected pieces needed to win.
+    Returns:
+        A boolean array of length N. Entry i is True exactly when check_win_vectorized(scorecards[i], row, col)
+        is True for some occupied (row, col).
+    """
+    pieces = np.asarray(scorecards) != 0
+    n, rows, cols = pieces.shape
+    won = np.zeros(n, dtype=bool)
+    span = win_length - 1
+    for d_row, d_col in WIN_DIRECTIONS:
+        out_rows, out_cols = rows - d_row * span, cols - abs(d_col) * span
+        if out_rows <= 0 or out_cols <= 0:
+            continue
+        start_col = span if d_col < 0 else 0 # Anti-diagonal windows start at the right-hand end
+        window = pieces[:, :out_rows, start_col:start_col + out_cols].copy()
+        for step in range(1, win_length):
+            r, c = d_row * step, start_col + d_col * step
+            window &= pieces[:, r:r + out_rows, c:c + out_cols]
+        won |= window.reshape(n, -1).any(axis=1)
+    return won
+
+def winners_batch(gameplays: np.ndarray, win_length: int = 4) -> np.ndarray:
+    """
+    Returns an int8 winner vector for an (N, ROWS, COLS) stack of gameplay matrices:
+    1 where Red has four in a row, 2 where Yellow has, 0 otherwise (Red takes precedence if both somehow do).
+    """
+    gameplays = np.asarray(gameplays)
+    winners = np.where(check_win_batch(gameplays == 2, win_length), 2, 0).astype(np.int8)
+    winners[check_win_batch(gameplays == 1, win_length)] = 1
+    return winners
@@ -0,0 +1,129 @@
+"""
+Benchmark suite runner (the benchmarks themselves live in Game/benchmarks.py).
+
+Usage:
+    python benchmark.py run                                  # run everything and print per-operation times
+    python benchmark.py run --out results.json --filter render. check_win
+    python benchmark.py run --compare benchmarks/baseline.json  # run, then fail if a hot path regressed
+    python benchmark.py compare benchmarks/baseline.json results.json --threshold 0.25
+    python benchmark.py run --out benchmarks/baseline.json   # record a new baseline
+    python benchmark.py run --filter mcts. --add-to benchmarks/baseline.json  # add baselines for new benchmarks only
+    python benchmark.py scaling --workers 1 2 4 8 --budget 1.0 # parallel search speedup curve
+
+compare exits with status 1 when any benchmark's best time per operation is more than threshold (and more than
+NOISE_FLOOR_US) slower than the baseline, or when a baseline benchmark did not run, so it can gate CI. With --filter,
+only the selected baseline entries are expected. Baselines are only comparable on the same machine.
+--add-to never overwrites an existing baseline entry: re-recording an entry would hide a regression of that benchmark.
+"""
+import argparse
+import json
+import os
+import sys
+
+from Game.benchmarks import (BENCHMARKS, DEFAULT_SEED, DEFAULT_REPEATS, DEFAULT_THRESHOLD, NOISE_FLOOR_US,
+                             run_benchmarks, compare, measure_scaling)
+
+
+def print_result(name, result):
+    print(f"{name:<44} {result['min_us']:12.3f} us/op  (median {result['median_us']:.3f}, {result['ops']} ops)")
+
+
+def print_comparison(baseline, current, threshold) -> int:
+    rows, regressions, missing = compare(baseline, current, threshold)
+    print(f"{'benchmark':<44} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, base_us, current_us, ratio in rows:
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<44} {base_us:12.3f} {current_us:12.3f} {100 * (ratio - 1):+7.1f}%{flag}")
+    for name in missing:
+        print(f"{name:<44} {baseline['results'][name]['min_us']:12.3f} {'-':>12} {'':>8}  MISSING")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {100 * threshold:.0f}% "
+              f"and {NOISE_FLOOR_US} us/op: {', '.join(regressions)}")
+    if missing:
+        print(f"{len(missing)} baseline benchmark(s) did not run: {', '.join(missing)}")
+    if regressions or missing:
+        return 1
+    print(f"No regressions beyond {100 * threshold:.0f}%.")
+    return 0
+
+
+def print_scaling_row(row):
+    print(f"{row['workers']:>7} {row['mean_depth']:>10.1f} {row['seconds_to_depth']:>14.3f} {row['speedup']:>8.2f}x "
+          f"{row['nodes_per_sec']:>12.0f}{'  (serial)' if row['serial'] else ''}")
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect 4 micro- and macro-benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks")
+    run.add_argument("--filter", nargs="*", help="Only run benchmarks whose name starts with one of these prefixes")
+    run.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the board corpora")
+    run.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    run.add_argument("--out", help="Write the results as JSON to this path")
+    run.add_argument("--compare", metavar="BASELINE", help="Compare the results with this baseline JSON file")
+    run.add_argument("--add-to", metavar="BASELINE",
+                     help="Add the benchmarks missing from this baseline JSON file to it, keeping its existing entries")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.25 = 25%%)")
+    run.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+
+    cmp = commands.add_parser("compare", help="Compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown (0.25 = 25%%)")
+    scaling = commands.add_parser("scaling", help="Speedup curve of the parallel search from 1 to N workers")
+    scaling.add_argument("--workers", type=int, nargs="+",
+                         default=sorted({1, 2, 4, os.cpu_count() or 1}), help="Worker counts to measure")
+    scaling.add_argument("--budget", type=float, default=1.0, help="Move time for the depth-reached measurement (s)")
+    scaling.add_argument("--depth", type=int, default=10, help="Fixed depth for the time-to-depth measurement")
+    scaling.add_argument("--positions", type=int, default=6, help="Number of seeded early-game positions")
+    scaling.add_argument("--out", help="Write the curve as JSON to this path")
+    args = parser.parse_args()
+
+    if args.command == "scaling":
+        print(f"{'workers':>7} {'mean depth':>10} {'s to depth ' + str(args.depth):>14} {'speedup':>9} {'nodes/sec':>12}")
+        rows = measure_scaling(args.workers, args.budget, args.depth, args.positions, progress=print_scaling_row)
+        if (os.cpu_count() or 1) == 1:
+            print("Note: single-CPU machine, every worker count ran the serial search. Measure scaling on a multi-core machine.")
+        elif max(args.workers) > os.cpu_count():
+            print(f"Note: only {os.cpu_count()} CPU(s) available, worker counts above that cannot speed up.")
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(rows, f, indent=2)
+        return 0
+
+    if args.command == "compare":
+        return print_comparison(load(args.baseline), load(args.current), args.threshold)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+    results = run_benchmarks(args.filter, args.seed, args.repeats, progress=print_result)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.out}")
+    if args.add_to:
+        baseline = load(args.add_to)
+        added = [name for name in results["results"] if name not in baseline["results"]]
+        for name in added:
+            baseline["results"][name] = results["results"][name]
+        with open(args.add_to, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Added {len(added)} benchmark(s) to {args.add_to}: {', '.join(added) or 'none'}")
+    if args.compare:
+        baseline = load(args.compare)
+        if args.filter:
+            baseline["results"] = {name: result for name, result in baseline["results"].items()
+                                   if any(name.startswith(prefix) for prefix in args.filter)}
+        return print_comparison(baseline, results, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Build step for the opening book used by the AI (see Game/opening_book.py).
+Enumerates every position up to --plies plies, solves each with the local negamax engine at a fixed --depth and
+writes the sorted binary book file that get_ai_move memory-maps at startup.
+
+Usage:
+    python build_opening_book.py --plies 4 --depth 12 --workers 4
+"""
+import argparse
+import os
+import time
+
+from Game.opening_book import build_book, DEFAULT_BOOK_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Connect 4 opening book.")
+    parser.add_argument("--plies", type=int, default=4, help="Include every position with at most this many pieces")
+    parser.add_argument("--depth", type=int, default=12, help="Negamax search depth used for each position")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Size of the process pool")
+    parser.add_argument("--output", default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+
+    def progress(done, total):
+        if done % 500 == 0 or done == total:
+            print(f"\r{done}/{total} positions solved", end="", flush=True)
+
+    start = time.perf_counter()
+    count = build_book(args.output, args.plies, args.depth, args.workers, progress)
+    print(f"\nWrote {count} positions to {args.output} in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Connect-K on a large board: a pygame hot-seat game on a configurable rows x cols board with K in a row to win.
+The board is shown through a scrolling viewport at the normal piece size.
+
+Controls: click a column to drop a piece, arrow keys (or the mouse wheel, shift + wheel for sideways) to scroll,
+PageUp/PageDown to scroll a whole screen sideways, U to undo the last move, N for a new game, Esc to quit.
+
+Usage:
+    python connect_k.py --rows 40 --cols 300 --k 5
+"""
+import argparse
+import pygame
+from Game.constants import WIDTH, HEIGHT, RED, YELLOW, SKY_BLUE, PLAYER_RED
+from Game.connect_k import ConnectKState
+from Game.connect_k_view import ConnectKView
+from Game.buttons import render_text
+from Game.scheduler import FrameScheduler, IDLE_TIMEOUT_MS
+
+BOARD_RECT = pygame.Rect(0, 0, 600, HEIGHT)
+INFO_RECT = pygame.Rect(600, 0, WIDTH - 600, HEIGHT)
+SCROLL_KEYS = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+
+
+def draw_info(win, font, state, view, winner_text):
+    """Draws the info panel: board size, whose turn it is, the visible range and the result."""
+    pygame.draw.rect(win, SKY_BLUE, INFO_RECT)
+    lines = [
+        f"Connect-{state.k}",
+        f"{state.rows} rows x {state.cols} cols",
+        f"Moves: {state.moves}",
+        f"Turn: {'RED' if state.current_player() == PLAYER_RED else 'YELLOW'}",
+        "View:",
+        view.describe(),
+        winner_text,
+        "",
+        "Arrows/wheel: scroll",
+        "PgUp/PgDn: page",
+        "U: undo  N: new game",
+    ]
+    for i, line in enumerate(lines):
+        if line:
+            win.blit(render_text(font, line, (0, 0, 0)), (INFO_RECT.x + 10, 20 + i * 22))
+    return INFO_RECT
+
+
+def main(rows: int, cols: int, k: int):
+    pygame.init()
+    win = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(f"Connect-{k} ({rows} x {cols})")
+    font = pygame.font.SysFont('monospace', 15, bold=True)
+
+    state = ConnectKState(rows, cols, k)
+    view = ConnectKView(state, BOARD_RECT)
+    scheduler = FrameScheduler()
+    winner_text = ""
+    full_redraw = True
+    run = True
+    try:
+        while run:
+            dirty_rects = []
+            info_changed = False
+            for event in scheduler.wait_events(False, IDLE_TIMEOUT_MS):
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    run = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key in SCROLL_KEYS:
+                        full_redraw |= view.scroll(*SCROLL_KEYS[event.key])
+                    elif event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                        page = view.visible_cols if event.key == pygame.K_PAGEDOWN else -view.visible_cols
+                        full_redraw |= view.scroll(page, 0)
+                    elif event.key == pygame.K_u:
+                        move = state.undo_move()
+                        if move:
+                            winner_text = ""
+                            full_redraw |= view.follow(*move)
+                            dirty_rects.append(view.draw_cell(win, *move))
+                            info_changed = True
+                    elif event.key == pygame.K_n:
+                        state = ConnectKState(rows, cols, k)
+                        view = ConnectKView(state, BOARD_RECT)
+                        winner_text = ""
+                        full_redraw = True
+                elif event.type == pygame.MOUSEWHEEL:
+                    sideways = event.x or (event.y if pygame.key.get_mods() & pygame.KMOD_SHIFT else 0)
+                    full_redraw |= view.scroll(sideways, 0) if sideways else view.scroll(0, -event.y)
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not winner_text:
+                    col = view.column_at(event.pos[0]) if BOARD_RECT.collidepoint(event.pos) else None
+                    if col is not None:
+                        player = state.current_player()
+                        move = state.drop_piece(col, RED if player == PLAYER_RED else YELLOW)
+                        if move:
+                            full_redraw |= view.follow(*move)
+                            dirty_rects.append(view.draw_cell(win, *move))
+                            if state.check_win(*move):
+                                winner_text = f"{'RED' if player == PLAYER_RED else 'YELLOW'} WINS!"
+                            elif state.is_full():
+                                winner_text = "DRAW!"
+                            info_changed = True
+
+            if full_redraw:
+                dirty_rects = [view.draw(win)]
+                info_changed = True
+                full_redraw = False
+            if info_changed:
+                dirty_rects.append(draw_info(win, font, state, view, winner_text))
+            dirty_rects = [rect for rect in dirty_rects if rect is not None]
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Connect-K on a large, scrollable board.")
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--cols", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5, help="Pieces in a row needed to win")
+    args = parser.parse_args()
+    main(args.rows, args.cols, args.k)
@@ -0,0 +1,69 @@
+"""
+Reports on and exports the binary game records written by main.py and selfplay.py (see Game/game_records.py).
+
+Usage:
+    python game_records.py summary [PATH]
+    python game_records.py export [PATH] --out games.npz [--plies 12]
+
+PATH is a .c4rec file or a directory of them (default: CONNECT4_RECORDS_DIR or ~/.connect4_games).
+The export holds the final (or --plies) positions as (N, 6, 7) int8 boards, the (N, 42) move arrays (-1 padded), the
+results and their flags (FORFEIT), the player codes and the per-move latencies, ready for np.load.
+"""
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+from Game.constants import PLAYER_RED, PLAYER_YELLOW
+from Game.game_records import (load_records, to_boards, move_sequences, latency_summary, player_name, DRAW,
+                               ABANDONED, FORFEIT)
+
+RESULT_NAMES = {PLAYER_RED: "Red wins", PLAYER_YELLOW: "Yellow wins", DRAW: "draws", ABANDONED: "abandoned"}
+
+
+def print_summary(records):
+    if not len(records):
+        print("No game records found")
+        return
+    print(f"Games: {len(records)}, moves: {int(records['length'].sum())}, "
+          f"from {time.strftime('%Y-%m-%d %H:%M', time.localtime(records['started'].min()))} "
+          f"to {time.strftime('%Y-%m-%d %H:%M', time.localtime(records['started'].max()))}")
+    matchups = Counter(zip(records["red"].tolist(), records["yellow"].tolist()))
+    for (red, yellow), games in matchups.most_common():
+        selected = records[(records["red"] == red) & (records["yellow"] == yellow)]
+        results = Counter(selected["result"].tolist())
+        outcome = ", ".join(f"{results[code]} {name}" for code, name in RESULT_NAMES.items() if results[code])
+        forfeits = int(np.count_nonzero(selected["flags"] & FORFEIT))
+        if forfeits:
+            outcome += f"; {forfeits} won by forfeit"
+        print(f"  {player_name(red)} vs {player_name(yellow)}: {games} games ({outcome})")
+    print("Move latency (ms):")
+    for name, stats in sorted(latency_summary(records).items()):
+        print(f"  {name:<10} {stats['count']:>8} moves  p50 {stats['p50']:>8.1f}  p95 {stats['p95']:>8.1f}"
+              f"  p99 {stats['p99']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect 4 game record reports and exports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary = commands.add_parser("summary", help="Print game counts, results and move latency percentiles")
+    summary.add_argument("path", nargs="?")
+    export = commands.add_parser("export", help="Write boards, moves, results and latencies to an .npz file")
+    export.add_argument("path", nargs="?")
+    export.add_argument("--out", required=True)
+    export.add_argument("--plies", type=int, help="Export the position after this many moves instead of the final one")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = load_records(args.path)
+    if args.command == "summary":
+        print_summary(records)
+    else:
+        np.savez_compressed(args.out, boards=to_boards(records, args.plies), moves=move_sequences(records),
+                            results=records["result"], flags=records["flags"], red=records["red"],
+                            yellow=records["yellow"], latency_ms=records["latency_ms"], started=records["started"])
+        print(f"Exported {len(records)} games to {args.out} in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Load generator for the game server (server.py). Opens many client connections at once; each plays a number of games
+against the server's AI with random moves, tracking the board locally with GameState. Reports games/sec, moves/sec and
+the reply latency of the server, followed by the server's own statistics.
+
+Usage:
+    python load_test.py --port 4040 --clients 500 --games 4
+    python load_test.py --serve --clients 200    # starts a server in the same process on a free port
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from Game.game_state import GameState, PLAYER_COLORS
+from Game.instrumentation import Histogram
+from Game.game_server import GameServer, MoveBatcher, SERVER_BACKENDS, DEFAULT_BACKEND
+from Game.move_cache import set_move_cache
+
+
+async def request(reader, writer, line: str) -> list:
+    writer.write(line.encode("ascii") + b"\n")
+    await writer.drain()
+    reply = (await reader.readline()).decode("ascii").split()
+    if not reply or reply[0] == "ERR":
+        raise RuntimeError(f"Server replied {' '.join(reply) or 'nothing'} to '{line}'")
+    return reply
+
+
+async def run_client(connect, games: int, opponent: str, rng: random.Random, latency: Histogram, totals: dict):
+    reader, writer = await connect()
+    try:
+        for game_index in range(games):
+            state = GameState()
+            order = "second" if game_index % 2 else "first" # Alternate colours
+            reply = await request(reader, writer, f"NEW {opponent} {order}")
+            game_id = reply[1]
+            if len(reply) > 2:
+                state.drop_piece(int(reply[2]), PLAYER_COLORS[state.current_player()])
+            status = "ONGOING"
+            while status == "ONGOING":
+                col = rng.choice(state.valid_moves())
+                start = time.perf_counter()
+                reply = await request(reader, writer, f"PLAY {game_id} {col}")
+                latency.record(time.perf_counter() - start)
+                state.drop_piece(col, PLAYER_COLORS[state.current_player()])
+                totals["moves"] += 1
+                if reply[5] != "-":
+                    state.drop_piece(int(reply[5]), PLAYER_COLORS[state.current_player()])
+                    totals["moves"] += 1
+                status = reply[6]
+            totals[status] = totals.get(status, 0) + 1
+            totals["games"] += 1 # Counted as each game finishes, so a client failing mid-way keeps its finished games
+            await request(reader, writer, f"END {game_id}")
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def run_load(args):
+    server = listener = None
+    host, port = args.host, args.port
+    if args.serve:
+        server = GameServer(args.backend, MoveBatcher())
+        listener = await server.start(args.host, 0, args.unix)
+        if not args.unix:
+            port = listener.sockets[0].getsockname()[1]
+    if args.unix:
+        connect = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        connect = lambda: asyncio.open_connection(host, port)
+
+    rng = random.Random(args.seed)
+    latency = Histogram("reply")
+    totals = {"games": 0, "moves": 0}
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_client(connect, args.games, args.opponent or args.backend,
+                                                random.Random(rng.random()), latency, totals)
+                                     for _ in range(args.clients)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    errors = [result for result in results if isinstance(result, Exception)]
+
+    games = totals["games"]
+    print(f"{args.clients} clients, {games} games, {totals['moves']} moves in {elapsed:.2f} s "
+          f"({games / elapsed:.1f} games/s, {totals['moves'] / elapsed:.1f} moves/s)")
+    print("Results: " + ", ".join(f"{status} {count}" for status, count in totals.items() if status not in ("games", "moves")))
+    summary = latency.summary()
+    print(f"Reply latency (ms): p50 {summary['p50_ms']:.1f}  p95 {summary['p95_ms']:.1f}  p99 {summary['p99_ms']:.1f}"
+          f"  max {summary['max_ms']:.1f}")
+    if errors:
+        print(f"{len(errors)} clients failed, first error: {errors[0]}")
+
+    reader, writer = await connect()
+    print("Server: " + " ".join((await request(reader, writer, "STATS"))[1:]))
+    await request(reader, writer, "QUIT")
+    writer.close()
+    if server is not None:
+        listener.close()
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the Connect 4 game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4040)
+    parser.add_argument("--unix", help="Connect to this Unix socket path instead of TCP")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent connections")
+    parser.add_argument("--games", type=int, default=2, help="Games played by each client")
+    parser.add_argument("--opponent", choices=SERVER_BACKENDS + ("human",), help="AI to play against (default: --backend)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--serve", action="store_true", help="Run the server in this process")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=SERVER_BACKENDS,
+                        help="AI backend of the in-process server")
+    parser.add_argument("--no-cache", action="store_true", help="In-process server: do not use the move cache")
+    args = parser.parse_args()
+    if args.no_cache:
+        set_move_cache(None)
+    asyncio.run(run_load(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,31 @@
 """
 Main module to run the Connect 4 game using Pygame. It initializes the game window, handles user input, updates the game state, 
 and displays the game board along with tracking matrices for gameplay and scorecards.
+Press F3 to toggle the performance overlay. Run with --metrics out.json (or .csv) to export the timers on exit,
+and with --profile out.pstats to write a cProfile pstats file.
+Every game is appended to the binary game records (Game/game_records.py) unless --no-records is given.
 """
 
+import argparse
+import cProfile
+import os
+import time
 import pygame
 import numpy as np
-from Game.constants import WIDTH, HEIGHT, FPS, RED, YELLOW, COLUMN_SIZE, BUTTON_X, BUTTON_HEIGHT, BUTTON_PADDING, COLS
+from Game.constants import WIDTH, HEIGHT, RED, YELLOW, COLUMN_SIZE, BUTTON_X, BUTTON_HEIGHT, BUTTON_PADDING, COLS
 from Game.board import Board 
-from Game.buttons import Button, draw_matrix_info
-from Game.ai import get_ai_move 
-from Game.ai import get_ai_move
+from Game.buttons import Button, draw_matrix_info, draw_status, draw_metrics_overlay
+from Game.ai_worker import AIWorker
+from Game.speculation import Speculator
+from Game.scheduler import FrameScheduler, post_ai_move_ready, ACTIVE_FRAMES, IDLE_TIMEOUT_MS, PENDING_TIMEOUT_MS
+from Game.instrumentation import metrics, FrameTimer
+from Game.game_records import RecordWriter, GameRecorder, DRAW
+from Game import ai
 
+# Timers shown in the overlay, in this order
+OVERLAY_TIMERS = ["frame.total", "frame.events", "frame.ai", "frame.draw", "frame.present", "ai.reply", "ai.get_ai_move",
+                  "board.drop_piece", "board.check_win", "draw_board", "draw_matrix_info"]
+OVERLAY_REFRESH = 0.5 # seconds between overlay updates while it is shown
 
 
 def reset_game():
@@ -21,7 +36,21 @@ def reset_game():
     winner_text = ""
     return board, turn, game_over, winner_text
 
-def main():
+def record_move(recorder, board, col, winner):
+    """Adds a move to the game record, and ends the record when the move finished the game."""
+    if recorder is None:
+        return
+    recorder.record_move(col)
+    if winner:
+        recorder.finish(winner)
+    elif board.is_draw():
+        recorder.finish(DRAW)
+
+def start_record(recorder, ai_opponent):
+    if recorder is not None:
+        recorder.start("human", ai.AI_BACKEND if ai_opponent else "human")
+
+def main(metrics_path=None, records_dir=None, record_games=True):
     pygame.init()
     WIN = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Connect 4")
@@ -30,10 +59,22 @@ def main():
     winner_font = pygame.font.SysFont('comicsansms', 50, bold=True)
     
     run = True
-    clock = pygame.time.Clock()
+    scheduler = FrameScheduler() # Runs at full FPS only while the screen is changing, otherwise sleeps on events
+    quiet_frames = 0 # Consecutive frames in which nothing was redrawn
     board = Board() # Initialize the game board by instantiating the Board class
     ai_opponent = False # Default to Player vs. Player mode
+    speculator = Speculator() # Pre-computes the AI reply to every possible human move while the human is thinking
+    ai_worker = AIWorker(speculator.get_ai_move, on_ready=post_ai_move_ready) # Computes AI moves in the background so the window stays responsive
+    thinking_shown = False # Whether the "AI is thinking" status is currently drawn
+    banner_shown = False # Whether the game-over banner is currently drawn
+    matrix_rows = {} # Text of every matrix row on screen, so only rows that changed are redrawn
+    frame_timer = FrameTimer() # Per-frame time breakdown (events, ai, draw, present)
+    overlay_shown = False # Performance overlay, toggled with F3
+    overlay_drawn = 0.0 # When the overlay was last drawn
     board, turn, game_over, winner_text = reset_game() # winner_text is initialized here
+    # Appends every game to the binary game records; the file is written on a background thread
+    recorder = GameRecorder(RecordWriter(records_dir)) if record_games else None
+    start_record(recorder, ai_opponent)
     
     button_y = 500
     refresh_button = Button(BUTTON_X, button_y, "New Game")
@@ -47,28 +88,46 @@ def main():
 
     try:
         while run:
-            clock.tick(FPS) 
-            
+            timeout = PENDING_TIMEOUT_MS if ai_worker.pending else IDLE_TIMEOUT_MS
+            events = scheduler.wait_events(quiet_frames < ACTIVE_FRAMES, timeout)
+            frame_timer.start() # Time spent waiting for events is idle time, not part of the frame
+
             mouse_pos = pygame.mouse.get_pos()
             for button in buttons:
                 button.check_hover(mouse_pos)
 
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     run = False
 
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    overlay_shown = not overlay_shown
+                    overlay_drawn = 0.0
+                    if not overlay_shown:
+                        board.chk = True # Repaint the area the overlay covered
+
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     # Handle button clicks
                     if refresh_button.is_clicked(event):
+                        ai_worker.cancel() # Never apply a move computed for the previous board
+                        speculator.cancel()
                         board, turn, game_over, winner_text = reset_game()
-                        continue 
+                        start_record(recorder, ai_opponent)
+                        if ai_opponent:
+                            speculator.start(board.gameplay) # The human moves first in the new game
+                        continue
 
                     if ai_button.is_clicked(event):                
                         if ai_opponent == True:
                             ai_opponent = False
                         else:
                             ai_opponent = True
+                        ai_worker.cancel()
+                        speculator.cancel()
                         board, turn, game_over, winner_text = reset_game()
+                        start_record(recorder, ai_opponent)
+                        if ai_opponent:
+                            speculator.start(board.gameplay)
                         pygame.display.set_caption(f"Connect 4 - {'Player vs AI' if ai_opponent else 'Player vs Player'}")
                         continue
 
@@ -83,50 +142,109 @@ def main():
                             move = board.drop_piece(col, turn)
                             if move:
                                 row, col = move
+                                if ai_opponent:
+                                    speculator.commit(col) # Drop the speculations for the columns not played
                                 winner = board.check_win(row, col)
+                                record_move(recorder, board, col, winner)
                                 if winner:
                                     game_over = True
                                     winner_text = f"{'RED' if winner == 1 else 'YELLOW'} WINS!"
                                 turn = YELLOW if turn == RED else RED # Switch turns
 
-            
+            frame_timer.mark("events")
+
             # Handle AI turn automatically after player has moved
             if not game_over and turn == YELLOW and ai_opponent: # AI's turn
-                # Determines which columns are not full.
-                valid_moves = [c for c in range(COLS) if board.gameplay[0][c] == 0]
-                col = get_ai_move(board.gameplay, valid_moves)
-                if col != -1:
+                if not ai_worker.pending:
+                    # Determines which columns are not full and starts computing the move in the background.
+                    ai_worker.request(board.gameplay, board.valid_moves())
+                col = ai_worker.poll() # None while the move is still being computed
+                if col is not None and col != -1:
                     move = board.drop_piece(col, YELLOW)
                     if move:
                         row, col = move
                         winner = board.check_win(row, col)
+                        record_move(recorder, board, col, winner)
                         if winner:
                             game_over = True
                             winner_text = "AI WINS!"
                         turn = RED
-                
-            
+                        if not game_over:
+                            speculator.start(board.gameplay) # The human is now thinking
+            frame_timer.mark("ai")
+
             # --- Drawing ---
-            if board.chk:  # Only redraw if the board has changed
-                board.draw_board(WIN)
-                draw_matrix_info(WIN, board, font)
-                board.chk = False  # Reset the flag after drawing
+            # Only regions that changed are redrawn, and only those rects are sent to the display.
+            dirty_rects = []
+            if board.chk:  # Full repaint, e.g. for a new game. draw_board resets the flag.
+                dirty_rects += board.draw_board(WIN)
+                matrix_rows.clear()
+                draw_matrix_info(WIN, board, font, matrix_rows)
+                thinking_shown = False # The info section background was repainted
+                banner_shown = False
                 for button in buttons:
-                    button.draw(WIN, button_font)
-                
+                    button.needs_redraw = True
+            elif board.dirty_cells:  # A piece was dropped: redraw its cell and the matrix rows that changed
+                dirty_rects += board.draw_dirty_cells(WIN)
+                dirty_rects += draw_matrix_info(WIN, board, font, matrix_rows)
 
-            if game_over:
+            for button in buttons:
+                if button.needs_redraw:
+                    dirty_rects.append(button.draw(WIN, button_font))
+
+            if ai_worker.pending != thinking_shown:
+                thinking_shown = ai_worker.pending
+                dirty_rects.append(draw_status(WIN, font, "AI is thinking..." if thinking_shown else ""))
+
+            if game_over and not banner_shown:
+                banner_shown = True
                 text_surface = winner_font.render(winner_text, True, (0, 0, 0))
                 text_rect = text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-                WIN.blit(text_surface, text_rect)
-
-            pygame.display.update()
+                dirty_rects.append(WIN.blit(text_surface, text_rect))
+
+            # The overlay is drawn last so it stays on top, and refreshed when something under it changed or it is stale
+            now = time.perf_counter()
+            if overlay_shown and (dirty_rects or now - overlay_drawn >= OVERLAY_REFRESH):
+                overlay_drawn = now
+                dirty_rects.append(draw_metrics_overlay(WIN, font, metrics.report_lines(OVERLAY_TIMERS)))
+            frame_timer.mark("draw")
+
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+                quiet_frames = 0
+            else:
+                quiet_frames += 1
+            frame_timer.mark("present")
+            frame_timer.end()
 
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
     finally:
+        ai_worker.shutdown()
+        speculator.shutdown()
+        if recorder is not None:
+            recorder.abandon() # Records a game left unfinished, a no-op otherwise
+            recorder.writer.close()
         pygame.quit()
+        if metrics_path:
+            metrics.export(metrics_path)
+            print(f"Performance metrics written to {metrics_path}")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Connect 4")
+    parser.add_argument("--metrics", default=os.environ.get('CONNECT4_METRICS_PATH'),
+                        help="Export the performance timers to this file on exit (.json or .csv)")
+    parser.add_argument("--profile", help="Run under cProfile and write a pstats file to this path")
+    parser.add_argument("--records", help="Directory of the game records (default: CONNECT4_RECORDS_DIR or ~/.connect4_games)")
+    parser.add_argument("--no-records", action="store_true", help="Do not record the games played")
+    args = parser.parse_args()
+    if args.profile:
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(main, args.metrics, args.records, not args.no_records)
+        finally:
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to {args.profile} (view with: python -m pstats {args.profile})")
+    else:
+        main(args.metrics, args.records, not args.no_records)
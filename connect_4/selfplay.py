@@ -0,0 +1,152 @@
+"""
+Headless self-play runner. Pits two AI backends (move providers from Game.ai.BACKENDS) against each other for N games,
+spread across a process pool, using only the pure GameState rules so no pygame window (or pygame import) is needed.
+Reports games/sec, moves/sec and win rates, and the playout throughput (rollouts/sec) of the 'mcts' backend.
+The persistent move cache is off by default so engine changes are measured rather than replayed from old answers.
+With --records the games are also appended to the binary game records (Game/game_records.py).
+
+Usage:
+    python selfplay.py --red negamax --yellow random --games 200 --workers 4
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from Game.game_state import GameState, PLAYER_COLORS
+from Game.constants import PLAYER_RED, PLAYER_YELLOW
+from Game.ai import BACKENDS
+from Game import mcts
+from Game.move_cache import set_move_cache
+from Game.game_records import RecordWriter, encode_record, DRAW, FORFEIT
+
+
+def play_game(red: str, yellow: str, seed: int, use_cache: bool = False):
+    """
+    Plays one game between the red and yellow backends.
+    Returns (winner, moves, record, rollouts, search_seconds) where winner is PLAYER_RED, PLAYER_YELLOW or 0 for a draw,
+    record is the encoded game record and the last two are the MCTS playouts run during the game and their search time. A backend that returns an invalid column forfeits the game (recorded with the FORFEIT flag).
+    """
+    if not use_cache:
+        set_move_cache(None)
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    providers = {PLAYER_RED: BACKENDS[red], PLAYER_YELLOW: BACKENDS[yellow]}
+    game = GameState()
+    started = time.time()
+    moves, latencies = [], []
+    engine = mcts.get_engine()
+    rollouts, search_seconds = engine.total_rollouts, engine.search_seconds
+    def result(winner, flags=0):
+        return (winner, len(moves), encode_record(red, yellow, moves, latencies, winner, started, flags),
+                engine.total_rollouts - rollouts, engine.search_seconds - search_seconds)
+    while True:
+        valid_moves = game.valid_moves()
+        if not valid_moves:
+            return result(DRAW)
+        player = game.current_player()
+        opponent = PLAYER_YELLOW if player == PLAYER_RED else PLAYER_RED
+        start = time.perf_counter()
+        col = providers[player](game.gameplay, valid_moves)
+        if col not in valid_moves:
+            return result(opponent, FORFEIT)
+        latencies.append(time.perf_counter() - start)
+        row, col = game.drop_piece(col, PLAYER_COLORS[player])
+        moves.append(col)
+        if game.check_win(row, col):
+            return result(player)
+
+
+def _play_game_task(task):
+    return play_game(*task)
+
+
+def run_selfplay(red: str, yellow: str, games: int, workers: int = 1, seed: int = 0, alternate: bool = False,
+                 use_cache: bool = False, records_dir: str = None):
+    """
+    Plays the requested number of games and returns a summary dict with throughput and win counts.
+    summary["wins"] is keyed by entrant: "red" is the backend given as red, "yellow" the one given as yellow, so the two
+    are counted apart even when they are the same backend. With alternate=True the entrants swap colours every other
+    game. With records_dir the games are recorded there.
+    """
+    tasks, swapped = [], []
+    for i in range(games):
+        swap = alternate and i % 2 == 1
+        pair = (yellow, red) if swap else (red, yellow)
+        tasks.append(pair + (seed + i, use_cache))
+        swapped.append(swap)
+
+    start = time.perf_counter()
+    if workers <= 1:
+        results = [_play_game_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_play_game_task, tasks, chunksize=max(1, games // (workers * 4))))
+    elapsed = time.perf_counter() - start
+    if records_dir:
+        writer = RecordWriter(records_dir)
+        for _, _, record, _, _ in results:
+            writer.write(record)
+        writer.close()
+
+    summary = {
+        "games": games,
+        "seconds": elapsed,
+        "moves": sum(result[1] for result in results),
+        "mcts_rollouts": sum(result[3] for result in results),
+        "mcts_seconds": sum(result[4] for result in results),
+        "players": {"red": red, "yellow": yellow},
+        "wins": {"red": 0, "yellow": 0},
+        "red_wins": 0,
+        "yellow_wins": 0,
+        "draws": 0,
+    }
+    for swap, (winner, *_) in zip(swapped, results):
+        if winner == PLAYER_RED:
+            summary["red_wins"] += 1
+            summary["wins"]["yellow" if swap else "red"] += 1
+        elif winner == PLAYER_YELLOW:
+            summary["yellow_wins"] += 1
+            summary["wins"]["red" if swap else "yellow"] += 1
+        else:
+            summary["draws"] += 1
+    summary["games_per_sec"] = games / elapsed if elapsed else float("inf")
+    summary["moves_per_sec"] = summary["moves"] / elapsed if elapsed else float("inf")
+    return summary
+
+
+def print_summary(summary):
+    games = summary["games"]
+    print(f"Games: {games} in {summary['seconds']:.2f} s "
+          f"({summary['games_per_sec']:.1f} games/sec, {summary['moves_per_sec']:.1f} moves/sec)")
+    if not games:
+        return
+    for entrant, wins in summary["wins"].items():
+        print(f"  {summary['players'][entrant]} ({entrant}): {wins} wins ({100 * wins / games:.1f}%)")
+    print(f"  draws: {summary['draws']} ({100 * summary['draws'] / games:.1f}%)")
+    print(f"  Red wins: {summary['red_wins']}, Yellow wins: {summary['yellow_wins']}")
+    if summary["mcts_rollouts"]:
+        rate = summary["mcts_rollouts"] / summary["mcts_seconds"] if summary["mcts_seconds"] else float("inf")
+        print(f"  mcts: {summary['mcts_rollouts']} rollouts in {summary['mcts_seconds']:.2f} s of search "
+              f"({rate:,.0f} rollouts/sec)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Connect 4 self-play between two AI backends.")
+    parser.add_argument("--red", default="negamax", choices=sorted(BACKENDS), help="Backend playing Red (moves first)")
+    parser.add_argument("--yellow", default="random", choices=sorted(BACKENDS), help="Backend playing Yellow")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Size of the process pool")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed; game i uses seed + i")
+    parser.add_argument("--alternate", action="store_true", help="Swap colours every other game")
+    parser.add_argument("--cache", action="store_true", help="Use the persistent move cache")
+    parser.add_argument("--records", help="Append the games to the game records in this directory")
+    args = parser.parse_args()
+    print_summary(run_selfplay(args.red, args.yellow, args.games, args.workers, args.seed, args.alternate, args.cache,
+                               args.records))
+
+
+if __name__ == "__main__":
+    main()
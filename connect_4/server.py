@@ -0,0 +1,66 @@
+"""
+Headless multi-game server (see Game/game_server.py for the line protocol). Many games are played at once over a local
+TCP port or Unix socket, sharing one move cache, with the AI moves of all games computed together in batches.
+Prints the number of sessions, games, the AI queue depth and the batch latency every --report seconds.
+
+Usage:
+    python server.py --port 4040 --backend batch
+    python server.py --unix /tmp/connect4.sock
+Try it with:  python load_test.py --port 4040 --clients 500 --games 4
+"""
+import argparse
+import asyncio
+
+from Game.game_server import GameServer, MoveBatcher, SERVER_BACKENDS, DEFAULT_BACKEND, BATCH_WINDOW, MAX_BATCH
+from Game.move_cache import set_move_cache
+
+
+async def report_stats(server: GameServer, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        stats = server.stats()
+        print(f"sessions {stats['sessions']:>5}  games {stats['games']:>5}  queue {stats['queue']:>4}  "
+              f"batches {stats['batches']:>6} (avg {stats['avg_batch']:>6}, max {stats['max_batch']:>4})  "
+              f"batch p50/p95 {stats['batch_p50_ms']:.1f}/{stats['batch_p95_ms']:.1f} ms  "
+              f"reply p95 {stats['reply_p95_ms']:.1f} ms  {stats['moves_per_sec']} moves/s", flush=True)
+
+
+async def serve(args):
+    server = GameServer(args.backend, MoveBatcher(args.window / 1000, args.max_batch, args.seed))
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in listener.sockets)
+    print(f"Connect 4 server listening on {where} (AI backend: {args.backend})")
+    reporter = asyncio.ensure_future(report_stats(server, args.report)) if args.report > 0 else None
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        if reporter is not None:
+            reporter.cancel()
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Connect 4 game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4040)
+    parser.add_argument("--unix", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=SERVER_BACKENDS,
+                        help="AI opponent of games that do not name one")
+    parser.add_argument("--window", type=float, default=BATCH_WINDOW * 1000,
+                        help="Milliseconds to wait for AI requests to batch together")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--report", type=float, default=5.0, help="Seconds between stats lines (0 = off)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--no-cache", action="store_true", help="Do not use the persistent move cache")
+    args = parser.parse_args()
+    if args.no_cache:
+        set_move_cache(None)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
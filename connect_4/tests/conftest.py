@@ -0,0 +1,87 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+# The game is run from the connect_4 directory and imports the Game package from there
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubCompletions(ThreadingHTTPServer):
+    """
+    Local stand-in for an OpenAI-compatible chat completions API that streams its answer as SSE chunks.
+    delay: seconds before each chunk. status: HTTP status to fail with instead of answering.
+    answer: the text to stream, by default the middle column of the prompt's available columns.
+    """
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0, status: int = 200, answer: str = None):
+        super().__init__(("127.0.0.1", 0), _CompletionsHandler)
+        self.delay, self.status, self.answer = delay, status, answer
+        self.requests = 0
+        self.finished = 0 # Streams written to the end
+        self.closed = 0 # Streams the client hung up on
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def chunks(self, prompt: str) -> list:
+        if self.answer is not None:
+            return [self.answer, " because"]
+        match = re.search(r"available columns are: \[([^\]]*)\]", prompt)
+        columns = [int(c) for c in match.group(1).split(",")] if match else [0]
+        return [str(columns[len(columns) // 2]), " because"]
+
+
+class _CompletionsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.requests += 1
+        if server.status != 200:
+            self.send_response(server.status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            for token in server.chunks(body["messages"][-1]["content"]):
+                time.sleep(server.delay)
+                chunk = {"choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            time.sleep(server.delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            server.finished += 1
+        except OSError:
+            server.closed += 1
+        self.close_connection = True
+
+
+@pytest.fixture
+def completions_server():
+    """Factory of StubCompletions servers, each serving on its own thread until the test ends."""
+    servers = []
+
+    def start(**options) -> StubCompletions:
+        server = StubCompletions(**options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
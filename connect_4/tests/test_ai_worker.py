@@ -0,0 +1,68 @@
+import time
+
+import numpy as np
+import pytest
+
+from Game import ai, mcts
+from Game.ai_worker import AIWorker
+from Game.constants import ROWS, COLS, PLAYER_RED
+from Game.move_cache import get_move_cache, set_move_cache
+from Game.providers import Provider, RemoteAI
+
+
+@pytest.fixture
+def no_book_or_cache(monkeypatch):
+    monkeypatch.setattr(ai, "get_opening_book", lambda: None)
+    previous = get_move_cache()
+    set_move_cache(None)
+    yield
+    set_move_cache(previous)
+
+
+def board():
+    matrix = np.zeros((ROWS, COLS), dtype=np.int8)
+    matrix[ROWS - 1, 0] = PLAYER_RED # Off the centre, so the AI has to think
+    return matrix
+
+
+def assert_cancel_frees_the_worker(worker):
+    worker.request(board(), list(range(COLS)))
+    time.sleep(0.3) # The move is being computed
+    start = time.perf_counter()
+    worker.cancel()
+    # The worker has one thread: a probe submitted now only runs once the cancelled move has returned
+    worker._executor.submit(lambda: None).result(timeout=5)
+    assert time.perf_counter() - start < 1.0
+    assert worker.poll() is None
+
+
+def test_cancel_stops_an_llm_move(completions_server, no_book_or_cache, monkeypatch):
+    server = completions_server(delay=3.0)
+    client = RemoteAI([Provider("stub", server.url, "key", "stub-model")], deadline=10.0)
+    monkeypatch.setattr(ai, "client", client)
+    monkeypatch.setattr(ai, "AI_BACKEND", "llm")
+    worker = AIWorker()
+    try:
+        assert_cancel_frees_the_worker(worker)
+        assert server.requests == 1
+    finally:
+        worker.shutdown()
+        client.close()
+
+
+def test_cancel_stops_an_mcts_move(no_book_or_cache, monkeypatch):
+    engine = mcts.MCTSEngine(time_budget=10.0, seed=1)
+    monkeypatch.setattr(mcts, "_engine", engine)
+    monkeypatch.setattr(ai, "AI_BACKEND", "mcts")
+    worker = AIWorker()
+    try:
+        assert_cancel_frees_the_worker(worker)
+        engine.time_budget = 0.1
+        worker.request(board(), list(range(COLS))) # The stop is lifted for the next move
+        col, deadline = None, time.perf_counter() + 5
+        while col is None and time.perf_counter() < deadline:
+            col = worker.poll()
+            time.sleep(0.01)
+        assert col in range(COLS)
+    finally:
+        worker.shutdown()
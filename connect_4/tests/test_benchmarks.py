@@ -0,0 +1,20 @@
+from Game.benchmarks import compare
+
+
+def results(**min_us):
+    return {"results": {name: {"median_us": us, "min_us": us, "ops": 1} for name, us in min_us.items()}}
+
+
+def test_compare_ignores_slowdowns_under_the_noise_floor():
+    baseline = results(fast=0.3, slow=10.0)
+    rows, regressions, missing = compare(baseline, results(fast=0.45, slow=13.0), threshold=0.25, noise_floor=0.2)
+    assert [name for name, *_ in rows] == ["fast", "slow"]
+    assert regressions == ["slow"] # fast is 50% slower, but by only 0.15 us
+    assert missing == []
+
+
+def test_compare_reports_benchmarks_that_did_not_run():
+    rows, regressions, missing = compare(results(kept=1.0, dropped=1.0), results(kept=1.0, added=1.0))
+    assert [name for name, *_ in rows] == ["kept"]
+    assert regressions == []
+    assert missing == ["dropped"]
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from Game.bitboard import BitBoard
+from Game.b_algorithm import tracking_matrices_from_bitboards
+
+
+def random_board(rng, plies):
+    board = BitBoard()
+    for _ in range(plies):
+        valid = board.valid_moves()
+        if not valid or any(board.is_win(player) for player in (1, 2)):
+            break
+        board.play(rng.choice(valid), board.player_to_move())
+    return board
+
+
+def test_from_matrix_round_trip():
+    rng = random.Random(7)
+    for plies in range(0, 43, 3):
+        board = random_board(rng, plies)
+        matrix = tracking_matrices_from_bitboards(board.pieces[1], board.pieces[2])[0]
+        copy = BitBoard.from_matrix(matrix)
+        assert (copy.pieces, copy.heights, copy.moves) == (board.pieces, board.heights, board.moves)
+
+
+def test_undo_retraces_played_moves():
+    board = BitBoard.from_moves([3, 3, 2, 4, 1])
+    assert [board.undo()[1] for _ in range(5)] == [1, 4, 2, 3, 3]
+    assert board.undo() is None
+    assert board.pieces == [0, 0, 0] and board.moves == 0
+
+
+def test_undo_of_a_board_from_a_matrix_fails_clearly():
+    played = BitBoard.from_moves([3, 3, 2])
+    board = BitBoard.from_matrix(tracking_matrices_from_bitboards(played.pieces[1], played.pieces[2])[0])
+    assert board.stack == []
+    board.play(4, board.player_to_move())
+    assert board.undo()[1] == 4 # Moves played after the conversion can be taken back
+    with pytest.raises(ValueError):
+        board.undo()
+    assert board.pieces == played.pieces # A failed undo changes nothing
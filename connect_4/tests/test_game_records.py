@@ -0,0 +1,20 @@
+import numpy as np
+
+from Game.constants import PLAYER_RED, PLAYER_YELLOW
+from Game.game_records import encode_record, load_records, move_sequences, RECORD_DTYPE, FORFEIT, DRAW
+
+
+def test_missing_path_loads_no_records(tmp_path):
+    records = load_records(str(tmp_path / "never-written"))
+    assert records.dtype == RECORD_DTYPE and len(records) == 0
+
+
+def test_round_trip_with_forfeit_flag(tmp_path):
+    path = tmp_path / "games.c4rec"
+    path.write_bytes(encode_record("negamax", "random", [3, 3, 4], [0.1, 0.2, 0.3], PLAYER_YELLOW, 0.0, FORFEIT)
+                     + encode_record("human", "mcts", [0, 1], [1.0, 0.05], DRAW, 0.0))
+    records = load_records(str(path))
+    assert records["result"].tolist() == [PLAYER_YELLOW, DRAW]
+    assert (records["flags"] & FORFEIT).tolist() == [FORFEIT, 0]
+    assert move_sequences(records)[0, :4].tolist() == [3, 3, 4, -1]
+    assert records["latency_ms"][1, :2].tolist() == [1000, 50]
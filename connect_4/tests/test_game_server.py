@@ -0,0 +1,103 @@
+import asyncio
+
+from Game.game_server import GameServer, MoveBatcher
+
+
+async def start_server(window=0.05):
+    server = GameServer("batch", MoveBatcher(window=window, seed=1))
+    listener = await server.start("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    return server, listener, port
+
+
+async def stop_server(server, listener):
+    listener.close()
+    await listener.wait_closed()
+    server.stop()
+
+
+class Client:
+
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(*await asyncio.open_connection("127.0.0.1", port))
+
+    async def send(self, line) -> list:
+        self.writer.write((line if isinstance(line, bytes) else line.encode("ascii")) + b"\n")
+        await self.writer.drain()
+        return (await asyncio.wait_for(self.reader.readline(), 10)).decode("ascii").split()
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def run(test):
+    asyncio.run(asyncio.wait_for(test(), 60))
+
+
+def test_concurrent_games_are_batched():
+    async def test():
+        server, listener, port = await start_server()
+        try:
+            clients = [await Client.connect(port) for _ in range(6)]
+            games = [(await client.send("NEW batch first"))[1] for client in clients]
+            # A column off the book's centre line, so the replies are computed rather than looked up
+            replies = await asyncio.gather(*(client.send(f"PLAY {game} 0") for client, game in zip(clients, games)))
+            assert all(reply[0] == "MOVE" and reply[4] != "-" for reply in replies)
+            stats = dict(item.split("=") for item in (await clients[0].send("STATS"))[1:])
+            assert int(stats["max_batch"]) > 1
+            assert int(stats["games"]) == 6
+            for client in clients:
+                await client.close()
+        finally:
+            await stop_server(server, listener)
+    run(test)
+
+
+def test_bad_commands_get_errors():
+    async def test():
+        server, listener, port = await start_server(window=0.001)
+        try:
+            client, other = await Client.connect(port), await Client.connect(port)
+            game = (await client.send("NEW human"))[1]
+            assert (await client.send(f"PLAY {game} 7"))[:2] == ["ERR", "invalid"]
+            assert (await client.send(f"PLAY {game} x"))[:2] == ["ERR", "invalid"]
+            for _ in range(3): # Two moves each in column 3, which then holds 6 pieces
+                await client.send(f"PLAY {game} 3")
+                await client.send(f"PLAY {game} 3")
+            assert (await client.send(f"PLAY {game} 3"))[:2] == ["ERR", "invalid"]
+            assert (await other.send(f"PLAY {game} 0"))[:3] == ["ERR", "no", "game"] # Not the other client's game
+            assert (await client.send("JUMP"))[0] == "ERR"
+            # Not ASCII, and longer than the stream limit: errors, and the connection stays usable
+            assert (await client.send("PLAY é 1".encode("utf-8")))[0] == "ERR"
+            assert (await client.send(b"PLAY " + b"9" * 100_000)) == ["ERR", "line", "too", "long"]
+            assert (await client.send(f"BOARD {game}"))[:2] == ["BOARD", game]
+            await client.close()
+            await other.close()
+        finally:
+            await stop_server(server, listener)
+    run(test)
+
+
+def test_games_are_dropped_on_disconnect():
+    async def test():
+        server, listener, port = await start_server(window=0.001)
+        try:
+            client = await Client.connect(port)
+            await client.send("NEW batch first")
+            await client.send("NEW random second")
+            assert len(server.games) == 2
+            await client.close()
+            for _ in range(100):
+                if not server.games and server.sessions == 0:
+                    break
+                await asyncio.sleep(0.01)
+            assert server.games == {}
+            assert server.sessions == 0
+        finally:
+            await stop_server(server, listener)
+    run(test)
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from Game.bitboard import BitBoard
+from Game.parallel_search import ParallelSolver
+from Game.solver import WIN_SCORE
+
+
+def pool_solver(workers=2):
+    """A solver that uses its process pool even on a single-CPU machine."""
+    solver = ParallelSolver(workers=workers, time_budget=None)
+    solver.serial = False
+    return solver
+
+
+def test_choose_breaks_ties_in_group_order_and_reports_the_winning_depth():
+    solver = ParallelSolver(workers=3)
+    reports = [[(1, 4, 3), (2, 5, 3)], [(1, 6, 2), (2, 5, 4), (3, 7, 4)], [(1, 1, 1), (2, 0, 1)]]
+    assert solver._choose(reports, 0) == 3 # Compared at depth 2, where groups 0 and 1 tie on 5
+    assert (solver.last_depth, solver.last_score) == (2, 5)
+    win = WIN_SCORE - 3
+    assert solver._choose([[(1, 0, 3), (2, 0, 3), (3, 1, 3)], [(1, 2, 2), (2, win, 2)]], 0) == 2
+    assert (solver.last_depth, solver.last_score) == (2, win)
+
+
+def test_a_new_search_is_not_slowed_by_a_stopped_one():
+    solver = pool_solver()
+    board = BitBoard.from_moves([3, 3])
+    result = []
+    try:
+        solver.best_move(board.copy(), max_depth=2) # Start the pool
+        search = threading.Thread(target=lambda: result.append(solver.best_move(board.copy(), max_depth=42)))
+        search.start()
+        time.sleep(0.5)
+        solver.stop()
+        solver.clear_stop() # Straight away, before the workers of the stopped search have noticed
+        start = time.perf_counter()
+        assert solver.best_move(board.copy(), max_depth=4, time_budget=5.0) in board.valid_moves()
+        assert time.perf_counter() - start < 2.0 # The stopped search's tasks did not keep the workers busy
+        search.join(timeout=5)
+        assert result == [None]
+    finally:
+        solver.shutdown()
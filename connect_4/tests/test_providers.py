@@ -0,0 +1,132 @@
+import time
+
+import pytest
+
+from Game.providers import Provider, RemoteAI, first_column, MIN_LATENCY_SAMPLES
+
+COLUMNS = list(range(7))
+PROMPT = "The available columns are: [0, 1, 2, 3, 4, 5, 6]."
+
+
+def provider(server, name="stub", latency=None):
+    """A Provider for the stub server, optionally with a history of latencies (which sets its hedge delay)."""
+    p = Provider(name, server.url, "key", "stub-model")
+    if latency is not None:
+        p.latencies.extend([latency] * MIN_LATENCY_SAMPLES)
+    return p
+
+
+def wait_for(condition, timeout=3.0):
+    end = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < end:
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.mark.parametrize("text, finished, expected", [
+    ("3", False, 3),
+    ("3 because", False, 3),
+    ("Column 5", True, 5),
+    ("", False, None),
+    ("9", True, None), # Not a valid column
+    ("I pick 2, not 4", False, 2),
+])
+def test_first_column(text, finished, expected):
+    assert first_column(text, COLUMNS, finished) == expected
+
+
+def test_first_column_waits_for_more_digits_on_wide_boards():
+    wide = list(range(12))
+    assert first_column("1", wide, finished=False) is None # Could still become 10 or 11
+    assert first_column("11", wide, finished=False) == 11
+    assert first_column("1", wide, finished=True) == 1
+
+
+def test_answer_is_taken_from_the_first_token(completions_server):
+    server = completions_server(delay=0.3)
+    ai = RemoteAI([provider(server)], deadline=5.0)
+    try:
+        start = time.perf_counter()
+        assert ai.get_move(PROMPT, COLUMNS) == 3
+        assert time.perf_counter() - start < 0.9 # The whole stream takes three delays
+        assert wait_for(lambda: server.closed == 1)
+        assert server.finished == 0
+    finally:
+        ai.close()
+
+
+def test_hedge_is_sent_after_the_p90_delay(completions_server):
+    slow = completions_server(delay=1.0)
+    fast = completions_server(delay=0.0, answer="5")
+    ai = RemoteAI([provider(slow, "slow", latency=0.2), provider(fast, "fast")], deadline=5.0)
+    try:
+        start = time.perf_counter()
+        assert ai.get_move(PROMPT, COLUMNS) == 5
+        elapsed = time.perf_counter() - start
+        assert 0.2 <= elapsed < 0.8
+        assert ai.hedged == 1
+        assert (slow.requests, fast.requests) == (1, 1)
+        # The losing stream is closed rather than read to the end
+        assert wait_for(lambda: slow.closed == 1)
+        assert slow.finished == 0
+    finally:
+        ai.close()
+
+
+def test_no_hedge_when_the_primary_is_on_time(completions_server):
+    primary = completions_server(delay=0.0)
+    backup = completions_server(delay=0.0)
+    ai = RemoteAI([provider(primary, "primary", latency=1.0), provider(backup, "backup")], deadline=5.0)
+    try:
+        assert ai.get_move(PROMPT, COLUMNS) == 3
+        assert ai.hedged == 0
+        assert backup.requests == 0
+    finally:
+        ai.close()
+
+
+def test_failover_on_http_error(completions_server):
+    failing = completions_server(status=503)
+    backup = completions_server(delay=0.0, answer="1 ")
+    primary = provider(failing, "failing")
+    ai = RemoteAI([primary, provider(backup, "backup")], deadline=5.0)
+    try:
+        start = time.perf_counter()
+        assert ai.get_move(PROMPT, COLUMNS) == 1
+        assert time.perf_counter() - start < 1.0 # Well before the default hedge delay
+        assert primary.failures == 1
+        assert ai.hedged == 0 # A failover, not a hedge
+        assert backup.requests == 1
+    finally:
+        ai.close()
+
+
+def test_deadline_expiry(completions_server):
+    server = completions_server(delay=1.0)
+    ai = RemoteAI([provider(server)], deadline=0.3)
+    try:
+        start = time.perf_counter()
+        assert ai.get_move(PROMPT, COLUMNS) is None
+        assert time.perf_counter() - start < 0.6
+        assert wait_for(lambda: server.closed == 1)
+    finally:
+        ai.close()
+
+
+def test_stop_event_abandons_the_move(completions_server):
+    server = completions_server(delay=1.0)
+    ai = RemoteAI([provider(server)], deadline=5.0)
+
+    class StopAfter:
+        def __init__(self, seconds):
+            self.at = time.perf_counter() + seconds
+
+        def is_set(self):
+            return time.perf_counter() >= self.at
+
+    try:
+        start = time.perf_counter()
+        assert ai.get_move(PROMPT, COLUMNS, stop_event=StopAfter(0.2)) is None
+        assert time.perf_counter() - start < 0.6
+    finally:
+        ai.close()
@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import wait
+
+import numpy as np
+import pytest
+
+from Game import ai, speculation
+from Game.bitboard import BitBoard
+from Game.constants import ROWS, COLS, PLAYER_RED
+from Game.move_cache import MoveCache, get_move_cache, set_move_cache
+from Game.providers import Provider, RemoteAI
+from Game.speculation import Speculator
+
+
+@pytest.fixture
+def llm(completions_server, tmp_path, monkeypatch):
+    """Points the 'llm' backend at a stub server and gives it an empty move cache. Yields the server."""
+    server = completions_server(delay=0.05)
+    client = RemoteAI([Provider("stub", server.url, "key", "stub-model")], deadline=5.0)
+    monkeypatch.setattr(ai, "client", client)
+    monkeypatch.setattr(ai, "AI_BACKEND", "llm")
+    monkeypatch.setattr(speculation, "get_opening_book", lambda: None)
+    monkeypatch.setattr(ai, "get_opening_book", lambda: None)
+    previous = get_move_cache()
+    set_move_cache(MoveCache(str(tmp_path / "cache.sqlite3")))
+    yield server
+    get_move_cache().close()
+    set_move_cache(previous)
+    client.close()
+
+
+def empty_board():
+    return np.zeros((ROWS, COLS), dtype=np.int8)
+
+
+def after(col):
+    """Gameplay matrix after Red plays col on the empty board."""
+    board = empty_board()
+    board[ROWS - 1, col] = PLAYER_RED
+    return board
+
+
+def futures(speculator):
+    return {human_col: future for human_col, _, future in speculator._futures.values()}
+
+
+def wait_for_cache(entries, timeout=2.0):
+    """Speculated answers are stored by a done callback, which may run just after the waiters wake up."""
+    end = time.perf_counter() + timeout
+    while len(get_move_cache()) < entries and time.perf_counter() < end:
+        time.sleep(0.01)
+    return len(get_move_cache())
+
+
+def test_speculation_fills_the_cache(llm):
+    speculator = Speculator(max_workers=COLS)
+    try:
+        speculator.start(empty_board())
+        assert speculator.started == COLS
+        wait(list(futures(speculator).values()), timeout=5)
+        assert wait_for_cache(COLS) == COLS
+        cache = get_move_cache()
+        for col in range(COLS):
+            assert cache.get("llm", BitBoard.from_matrix(after(col))) == COLS // 2
+        requests = llm.requests
+        assert speculator.get_ai_move(after(2), list(range(COLS))) == COLS // 2
+        assert llm.requests == requests # Answered from the speculation, not a new request
+    finally:
+        speculator.shutdown()
+
+
+def test_commit_stops_running_speculations(llm):
+    llm.delay = 1.0
+    speculator = Speculator(max_workers=COLS)
+    try:
+        speculator.start(empty_board())
+        others = [future for col, future in futures(speculator).items() if col != 3]
+        time.sleep(0.3) # Every speculation is running, waiting on its stream
+        assert all(future.running() for future in others)
+        speculator.commit(3)
+        done, running = wait(others, timeout=0.5) # Well before the stub's first chunk
+        assert not running
+        assert all(future.result() is None for future in done)
+        assert len(get_move_cache()) == 0
+        assert speculator.get_ai_move(after(3), list(range(COLS))) == COLS // 2
+        assert wait_for_cache(1) == 1
+    finally:
+        speculator.shutdown()
+
+
+def test_get_ai_move_wait_is_bounded(llm, monkeypatch):
+    llm.delay = 2.0
+    monkeypatch.setattr(ai, "get_ai_move", lambda matrix, valid_moves: valid_moves[0])
+    speculator = Speculator(max_workers=COLS, wait=0.2)
+    try:
+        speculator.start(empty_board())
+        start = time.perf_counter()
+        assert speculator.get_ai_move(after(0), list(range(COLS))) == 0 # The fallback
+        assert time.perf_counter() - start < 1.0
+    finally:
+        speculator.shutdown()
+
+
+def test_cancel_interrupts_get_ai_move(llm):
+    llm.delay = 2.0
+    speculator = Speculator(max_workers=COLS)
+    result = []
+    try:
+        speculator.start(empty_board())
+        waiter = threading.Thread(target=lambda: result.append(speculator.get_ai_move(after(0), list(range(COLS)))))
+        start = time.perf_counter()
+        waiter.start()
+        time.sleep(0.2)
+        speculator.cancel()
+        waiter.join(timeout=5)
+        assert result == [None]
+        assert time.perf_counter() - start < 1.0
+        assert len(get_move_cache()) == 0
+    finally:
+        speculator.shutdown()
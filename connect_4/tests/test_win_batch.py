@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from Game.constants import ROWS, COLS
+from Game.test import check_win_vectorized, check_win_batch, winners_batch, WIN_DIRECTIONS
+
+
+def reference(scorecard):
+    """check_win_vectorized at every occupied cell of the scorecard."""
+    return any(check_win_vectorized(scorecard, row, col) for row, col in zip(*np.nonzero(scorecard)))
+
+
+def board_with_line(rng, d_row, d_col):
+    """Sparse random scorecard plus one line of four in the given direction, at a random valid place."""
+    scorecard = (rng.random((ROWS, COLS)) < 0.2).astype(np.int8)
+    starts = [(r, c) for r in range(ROWS) for c in range(COLS)
+              if 0 <= r + 3 * d_row < ROWS and 0 <= c + 3 * d_col < COLS]
+    row, col = starts[rng.integers(len(starts))]
+    for i in range(4):
+        scorecard[row + i * d_row, col + i * d_col] = 1
+    return scorecard
+
+
+def random_full_boards(rng, count):
+    """Full gameplay matrices with 21 pieces of each player in random cells."""
+    cells = np.array([1, 2] * (ROWS * COLS // 2), dtype=np.int8)
+    return np.stack([rng.permutation(cells).reshape(ROWS, COLS) for _ in range(count)])
+
+
+@pytest.mark.parametrize("direction", WIN_DIRECTIONS)
+def test_every_direction_matches_reference(direction):
+    rng = np.random.default_rng(WIN_DIRECTIONS.index(direction))
+    scorecards = np.stack([board_with_line(rng, *direction) for _ in range(300)])
+    batch = check_win_batch(scorecards)
+    assert batch.all()
+    assert list(batch) == [reference(s) for s in scorecards]
+
+
+def test_random_scorecards_match_reference():
+    rng = np.random.default_rng(3)
+    scorecards = np.concatenate([(rng.random((500, ROWS, COLS)) < density).astype(np.int8)
+                                 for density in (0.1, 0.3, 0.5, 0.7)])
+    batch = check_win_batch(scorecards)
+    assert 0 < batch.sum() < len(batch) # Both outcomes are covered
+    assert list(batch) == [reference(s) for s in scorecards]
+
+
+def test_full_board_draws():
+    rng = np.random.default_rng(4)
+    boards = random_full_boards(rng, 5000)
+    expected = np.array([[reference((b == player).astype(np.int8)) for player in (1, 2)] for b in boards])
+    draws = boards[~expected.any(axis=1)]
+    assert len(draws) > 0
+    assert not check_win_batch(draws == 1).any()
+    assert not check_win_batch(draws == 2).any()
+    assert (winners_batch(draws) == 0).all()
+    for player in (1, 2):
+        assert list(check_win_batch(boards == player)) == list(expected[:, player - 1])
+
+
+def test_winners_batch_on_played_games():
+    rng = np.random.default_rng(5)
+    boards, expected = [], []
+    for _ in range(300):
+        board, heights, winner = np.zeros((ROWS, COLS), dtype=np.int8), [0] * COLS, 0
+        for ply in range(ROWS * COLS):
+            col = rng.choice([c for c in range(COLS) if heights[c] < ROWS])
+            row = ROWS - 1 - heights[col]
+            heights[col] += 1
+            board[row, col] = 1 + ply % 2
+            if check_win_vectorized((board == board[row, col]).astype(np.int8), row, col):
+                winner = board[row, col]
+                break
+        boards.append(board)
+        expected.append(winner)
+    assert list(winners_batch(np.stack(boards))) == expected